@@ -0,0 +1,170 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark for the generated DataObject codecs.
+
+Parses a machine-token like dict with from_dict, serializes it back with
+to_dict and compares the result, once with the codecs generated for each
+DataObject subclass and once with the generic DataObject implementations
+that walk `fields` on every call.
+
+    python3 benchmarks/data_objects.py [--resources 50]
+
+Exits non-zero when the generated codecs are slower than the generic
+ones.
+"""
+
+import argparse
+import sys
+import timeit
+
+from eaclient.data_types import (
+    DataObject,
+    Field,
+    IntDataValue,
+    StringDataValue,
+    data_list,
+)
+
+
+def build_classes(generic: bool):
+    """Define the benchmark schema, optionally with the generic codecs."""
+    overrides = {}
+    if generic:
+        overrides = {
+            # Instances of classes without __slots__ get a __dict__
+            "__slots__": ("__dict__",),
+            "from_dict": DataObject.__dict__["from_dict"],
+            "to_dict": DataObject.__dict__["to_dict"],
+            "__eq__": DataObject.__dict__["__eq__"],
+        }
+
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    resource = type(
+        "Resource",
+        (DataObject,),
+        dict(
+            overrides,
+            __init__=__init__,
+            fields=[
+                Field("type", StringDataValue),
+                Field("uri", StringDataValue),
+                Field("login", StringDataValue),
+                Field("password", StringDataValue),
+                Field("suites", data_list(StringDataValue)),
+                Field("components", data_list(StringDataValue)),
+                Field("architectures", data_list(StringDataValue)),
+                Field("priority", IntDataValue, required=False),
+                Field("expires", StringDataValue, required=False),
+            ],
+        ),
+    )
+    token = type(
+        "MachineToken",
+        (DataObject,),
+        dict(
+            overrides,
+            __init__=__init__,
+            fields=[
+                Field("machine_id", StringDataValue, dict_key="machineId"),
+                Field("token", StringDataValue),
+                Field("message", StringDataValue, required=False),
+                Field("resources", data_list(resource)),
+            ],
+        ),
+    )
+    return token
+
+
+def build_document(resources: int = 50) -> dict:
+    return {
+        "machineId": "0123456789abcdef0123456789abcdef",
+        "token": "aBcDeFgHiJkLmNoPqRsTuVwXyZ0123456789",
+        "message": "Join successful",
+        "resources": [
+            {
+                "type": "elxr-pro-{}".format(i),
+                "uri": "https://packages.elxr.pro/elxr-pro-{}".format(i),
+                "login": "login-{}".format(i),
+                "password": "password-{}".format(i),
+                "suites": ["aria", "aria-updates"],
+                "components": ["main"],
+                "architectures": ["amd64", "arm64"],
+                "priority": 500,
+                "expires": "2026-12-31T23:59:59Z",
+            }
+            for i in range(resources)
+        ],
+    }
+
+
+def best_time(func, number: int, repeat: int = 5) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def instance_size(obj) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def main(sys_argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--resources", type=int, default=50)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args(sys_argv)
+
+    document = build_document(args.resources)
+    results = {}
+    for name, generic in (("generic", True), ("generated", False)):
+        token_cls = build_classes(generic)
+        token = token_cls.from_dict(document)
+        assert document == token.to_dict(keep_none=False)
+        copy = token_cls.from_dict(document)
+        results[name] = (
+            best_time(lambda: token_cls.from_dict(document), args.number),
+            best_time(lambda: token.to_dict(), args.number),
+            best_time(lambda: token == copy, args.number),
+            instance_size(token.resources[0]),
+        )
+
+    print("resources: {}".format(args.resources))
+    for name, (parse, dump, eq, size) in results.items():
+        print(
+            "{:10} from_dict {:7.1f} us  to_dict {:7.1f} us  "
+            "__eq__ {:6.1f} us  resource {} bytes".format(
+                name + ":", parse * 1e6, dump * 1e6, eq * 1e6, size
+            )
+        )
+    generic, generated = results["generic"], results["generated"]
+    print(
+        "speedup:   from_dict {:.1f}x  to_dict {:.1f}x  __eq__ {:.1f}x".format(
+            generic[0] / generated[0],
+            generic[1] / generated[1],
+            generic[2] / generated[2],
+        )
+    )
+    if any(new > old for old, new in zip(generic[:3], generated[:3])):
+        print("generated codecs are slower", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark for util.DatetimeAwareJSONDecoder.
+
+Decodes a machine-token like document with the current decoder and with
+the previous implementation, which tried parse_rfc3339_date on every
+string, and reports the cost per decoded string value.
+
+    python3 benchmarks/json_decoder.py [--budget-ns 1500]
+
+Exits non-zero when the current decoder costs more than the budget per
+string value.
+"""
+
+import argparse
+import json
+import sys
+import timeit
+
+from eaclient import util
+
+
+def legacy_object_hook(o):
+    for key, value in o.items():
+        if isinstance(value, str):
+            try:
+                o[key] = util.parse_rfc3339_date(value)
+            except ValueError:
+                pass
+    return o
+
+
+def build_document(resources: int = 50) -> str:
+    return json.dumps(
+        {
+            "machineId": "0123456789abcdef0123456789abcdef",
+            "token": "aBcDeFgHiJkLmNoPqRsTuVwXyZ0123456789",
+            "message": "Join successful",
+            "resources": [
+                {
+                    "type": "elxr-pro-{}".format(i),
+                    "uri": "https://packages.elxr.pro/elxr-pro-{}".format(i),
+                    "login": "login-{}".format(i),
+                    "password": "2024-password-{}".format(i),
+                    "suites": ["aria", "aria-updates"],
+                    "components": ["main"],
+                    "architectures": ["amd64", "arm64"],
+                    "expires": "2026-12-31T23:59:59.123456Z",
+                    "createdAt": "2024-01-02T03:04:05+09:00",
+                }
+                for i in range(resources)
+            ],
+        }
+    )
+
+
+def count_strings(document: str) -> int:
+    count = 0
+
+    def _hook(o):
+        nonlocal count
+        count += sum(1 for v in o.values() if isinstance(v, str))
+        return o
+
+    json.loads(document, object_hook=_hook)
+    return count
+
+
+def best_time(func, number: int, repeat: int = 5) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def main(sys_argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--resources", type=int, default=50)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument(
+        "--budget-ns",
+        type=float,
+        default=1500.0,
+        help="maximum cost per string value, in nanoseconds",
+    )
+    args = parser.parse_args(sys_argv)
+
+    document = build_document(args.resources)
+    strings = count_strings(document)
+    assert json.loads(
+        document, cls=util.DatetimeAwareJSONDecoder
+    ) == json.loads(document, object_hook=legacy_object_hook)
+
+    plain = best_time(lambda: json.loads(document), args.number)
+    legacy = best_time(
+        lambda: json.loads(document, object_hook=legacy_object_hook),
+        args.number,
+    )
+    current = best_time(
+        lambda: json.loads(document, cls=util.DatetimeAwareJSONDecoder),
+        args.number,
+    )
+
+    def _per_string(seconds: float) -> float:
+        return (seconds - plain) / strings * 1e9
+
+    print("string values:  {}".format(strings))
+    print("json.loads:     {:.1f} us".format(plain * 1e6))
+    print(
+        "legacy decoder: {:.1f} us ({:.0f} ns/string)".format(
+            legacy * 1e6, _per_string(legacy)
+        )
+    )
+    print(
+        "decoder:        {:.1f} us ({:.0f} ns/string, budget {:.0f})".format(
+            current * 1e6, _per_string(current), args.budget_ns
+        )
+    )
+    if _per_string(current) > args.budget_ns:
+        print("over budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,7 +28,7 @@ from eaclient import (
     util,
 )
 
-from eaclient.files import machine_token, state_files
+from eaclient.files import machine_token, state_files, state_store
 from eaclient.http import is_https_url
 
 from eaclient.files.state_files import (
@@ -67,8 +67,9 @@ def action_to_request(
 
         if force:
             remove_apt_config(machine_token_file)
-            machine_token_file.delete()
-            state_files.delete_state_files()
+            with system.write_batch(), state_store.transaction(cfg):
+                machine_token_file.delete()
+                state_files.delete_state_files(cfg.data_dir)
             apt.restore_elxr_and_debian_repo()
 
             return
@@ -96,22 +97,27 @@ def action_to_request(
             attached_at,
         )
 
-        machine_token_file.write(response_json)
+        # Commit the token and the state derived from it together
+        with system.write_batch(), state_store.transaction(cfg):
+            machine_token_file.write(response_json)
 
-        machine_id = response_json.get(
-            "machineId", system.get_machine_id(cfg)
-        )
-        system.get_machine_id.cache_clear()
-        machine_id_file.write(machine_id)
-        attachment_data_file.write(AttachmentData(attached_at=attached_at))
+            machine_id = response_json.get(
+                "machineId", system.get_machine_id(cfg)
+            )
+            system.get_machine_id.cache_clear()
+            machine_id_file.write(machine_id)
+            attachment_data_file.write(
+                AttachmentData(attached_at=attached_at)
+            )
         if pro_only_enable:
             apt.remove_elxr_and_debian_repo()
     elif cmd == 'leave':
         resp_msg = response_json.get("message")
         if resp_msg == "Leave successful":
             remove_apt_config(machine_token_file)
-            machine_token_file.delete()
-            state_files.delete_state_files()
+            with system.write_batch(), state_store.transaction(cfg):
+                machine_token_file.delete()
+                state_files.delete_state_files(cfg.data_dir)
             apt.restore_elxr_and_debian_repo()
     elif cmd == 'test':
         if token:
@@ -130,9 +136,9 @@ def remove_apt_config(machine_token_file):
     Cleanup the apt setting for eLxr Pro entitlements
     """
     repo_file_tmpl = "/etc/apt/sources.list.d/{name}.sources"
-    entitlements = machine_token_file.entitlements()
-    for entitlement_name, ent_value in entitlements.items():
-        repo_url = ent_value.get("entitlement").get("uri")
+    index = machine_token_file.entitlement_index
+    for entitlement_name, entitlement in index.by_type.items():
+        repo_url = entitlement.get("uri")
         repo_file = repo_file_tmpl.format(name=entitlement_name)
         system.ensure_file_absent(repo_file)
         apt.remove_repo_from_apt_auth_file(repo_url)
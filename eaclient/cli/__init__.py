@@ -28,13 +28,17 @@ from eaclient import (
     version
 )
 
+from eaclient.cli.collect_logs import collect_logs_command
 from eaclient.cli.config import config_command
 from eaclient.cli.help import help_command
 from eaclient.cli.join import join_command
 from eaclient.cli.leave import leave_command
+from eaclient.cli.logs import logs_command
 from eaclient.cli.parser import HelpCategory, ProArgumentParser
+from eaclient.cli.status import status_command
 from eaclient.cli.validate import test_command
 from eaclient.config import EAConfig
+from eaclient.files import state_store
 from eaclient.log import get_user_or_root_log_file_path
 
 event = event_logger.get_event_logger()
@@ -47,6 +51,9 @@ COMMANDS = [
     config_command,
     leave_command,
     test_command,
+    status_command,
+    logs_command,
+    collect_logs_command,
     help_command,
 ]
 
@@ -115,8 +122,14 @@ def set_event_mode(cmd_args):
 
 def main_error_handler(func):
     def wrapper(*args, **kwargs):
+        failed = True
         try:
-            return func(*args, **kwargs)
+            return_value = func(*args, **kwargs)
+            failed = bool(return_value)
+            return return_value
+        except SystemExit as exc:
+            failed = exc.code not in (None, 0)
+            raise
         except KeyboardInterrupt:
             LOG.error("KeyboardInterrupt")
             sys.exit(1)
@@ -160,10 +173,49 @@ def main_error_handler(func):
 
             event.process_events()
             sys.exit(1)
+        finally:
+            if failed:
+                # Leave the debug records that led to the failure in the log
+                log.dump_flight_recorder()
+            # Records logged asynchronously are written before we exit
+            log.flush_logging()
 
     return wrapper
 
 
+def setup(cfg: EAConfig):
+    """Apply cfg to logging and the state backend."""
+    log.setup_logging(cfg)
+    state_store.configure(cfg)
+
+
+def run_action(args, cfg: EAConfig, sys_argv, extra_args=None):
+    """Run the command parsed into args, with the checks and logging every
+    invocation gets, from the CLI or through the daemon."""
+    if args.debug:
+        console_handler = logging.StreamHandler(sys.stderr)
+        console_handler.setFormatter(log.RedactingFormatter())
+        console_handler.setLevel(logging.DEBUG)
+        logging.getLogger("elxr-pro").addHandler(console_handler)
+
+    set_event_mode(args)
+
+    LOG.debug("Executed with sys.argv: %r" % sys_argv)
+
+    warn_about_non_elxr_distro()
+
+    cfg.warn_about_invalid_keys()
+
+    pro_environment = [
+        "{}={}".format(k, v)
+        for k, v in sorted(util.get_pro_environment().items())
+    ]
+    if pro_environment:
+        LOG.debug("Executed with environment variables: %r" % pro_environment)
+
+    return args.action(args, cfg=cfg, extra_args=extra_args or [])
+
+
 @main_error_handler
 def main(sys_argv=None):
     log.setup_cli_logging(
@@ -172,7 +224,7 @@ def main(sys_argv=None):
     )
 
     cfg = EAConfig()
-    log.setup_cli_logging(cfg.log_level, cfg.log_file)
+    setup(cfg)
 
     if not sys_argv:
         sys_argv = sys.argv
@@ -197,29 +249,7 @@ def main(sys_argv=None):
         extra_args = []
 
     args = parser.parse_args(args=pro_cli_args)
-    if args.debug:
-        console_handler = logging.StreamHandler(sys.stderr)
-        console_handler.setLevel(logging.DEBUG)
-        logging.getLogger("elxr-pro").addHandler(console_handler)
-
-    set_event_mode(args)
-
-    LOG.debug("Executed with sys.argv: %r" % sys_argv)
-
-    warn_about_non_elxr_distro()
-
-    cfg.warn_about_invalid_keys()
-
-    pro_environment = [
-        "{}={}".format(k, v)
-        for k, v in sorted(util.get_pro_environment().items())
-    ]
-    if pro_environment:
-        LOG.debug("Executed with environment variables: %r" % pro_environment)
-
-    return_value = args.action(args, cfg=cfg, extra_args=extra_args)
-
-    return return_value
+    return run_action(args, cfg, sys_argv, extra_args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import sys
+
+from eaclient import event_logger, messages, support_bundle
+from eaclient.cli.commands import ProArgument, ProArgumentGroup, ProCommand
+from eaclient.cli.parser import HelpCategory
+
+event = event_logger.get_event_logger()
+
+DEFAULT_OUTPUT = "elxr-pro-logs.tar.gz"
+DEFAULT_MAX_SIZE = 100
+
+
+def _max_size(value: str) -> int:
+    try:
+        max_size = int(value)
+    except ValueError:
+        max_size = 0
+    if max_size <= 0:
+        raise argparse.ArgumentTypeError(
+            messages.CLI_COLLECT_LOGS_INVALID_MAX_SIZE.format(value=value)
+        )
+    return max_size
+
+
+def action_collect_logs(args, *, cfg, **kwargs) -> int:
+    """Write the redacted support bundle to args.output.
+
+    @return: 0
+    """
+    support_bundle.add_known_secrets(cfg)
+    manifest = support_bundle.collect(
+        support_bundle.default_sources(cfg),
+        args.output,
+        args.max_size * 1024 * 1024,
+    )
+    for entry in manifest:
+        if "error" in entry:
+            event.info(
+                messages.COLLECT_LOGS_FAILED.format(
+                    path=entry["path"], error=entry["error"]
+                ),
+                file_type=sys.stderr,
+            )
+    for key, msg in (
+        ("skipped", messages.COLLECT_LOGS_LEFT_OUT),
+        ("truncated", messages.COLLECT_LOGS_TRUNCATED),
+    ):
+        paths = [entry["path"] for entry in manifest if entry.get(key)]
+        if paths:
+            event.info(
+                msg.format(max_size=args.max_size, paths=", ".join(paths))
+            )
+    event.info(messages.COLLECT_LOGS_SUCCESS.format(path=args.output))
+    return 0
+
+
+collect_logs_command = ProCommand(
+    "collect-logs",
+    help=messages.CLI_ROOT_COLLECT_LOGS,
+    description=messages.CLI_COLLECT_LOGS_DESC,
+    action=action_collect_logs,
+    preserve_description=True,
+    help_category=HelpCategory.OTHER,
+    argument_groups=[
+        ProArgumentGroup(
+            arguments=[
+                ProArgument(
+                    "--output",
+                    short_name="-o",
+                    help=messages.CLI_COLLECT_LOGS_OUTPUT.format(
+                        default=DEFAULT_OUTPUT
+                    ),
+                    default=DEFAULT_OUTPUT,
+                ),
+                ProArgument(
+                    "--max-size",
+                    help=messages.CLI_COLLECT_LOGS_MAX_SIZE.format(
+                        default=DEFAULT_MAX_SIZE
+                    ),
+                    type=_max_size,
+                    metavar="MIB",
+                    default=DEFAULT_MAX_SIZE,
+                ),
+            ]
+        )
+    ],
+)
@@ -18,6 +18,7 @@ from eaclient import (
     exceptions,
     http,
     messages,
+    status,
 )
 
 from eaclient.apt import AptProxyScope
@@ -106,6 +107,8 @@ def action_config_set(args, *, cfg, **kwargs):
         validate_url = http.PROXY_VALIDATION_APT_HTTPS_URL
     http.validate_proxy(protocol_type, set_value, validate_url)
 
+    # The proxies of the other scope are cleared in the same write
+    changes = {set_key: set_value}
     if set_key in cfg.ea_scoped_proxy_options:
         unset_current = bool(
             cfg.global_apt_http_proxy or cfg.global_apt_https_proxy
@@ -119,8 +122,7 @@ def action_config_set(args, *, cfg, **kwargs):
         cli_util.configure_apt_proxy(
             cfg, AptProxyScope.EACLIENT, set_key, set_value
         )
-        cfg.global_apt_http_proxy = None
-        cfg.global_apt_https_proxy = None
+        changes.update(global_apt_http_proxy=None, global_apt_https_proxy=None)
     elif set_key in cfg.global_scoped_proxy_options:
         unset_current = bool(cfg.ea_apt_http_proxy or cfg.ea_apt_https_proxy)
         if unset_current:
@@ -132,10 +134,10 @@ def action_config_set(args, *, cfg, **kwargs):
         cli_util.configure_apt_proxy(
             cfg, AptProxyScope.GLOBAL, set_key, set_value
         )
-        cfg.ea_apt_http_proxy = None
-        cfg.ea_apt_https_proxy = None
+        changes.update(ea_apt_http_proxy=None, ea_apt_https_proxy=None)
 
-    setattr(cfg, set_key, set_value)
+    cfg.update_user_config(**changes)
+    status.update_status(cfg)
 
 
 @cli_util.assert_root
@@ -162,6 +164,7 @@ def action_config_unset(args, *, cfg, **kwargs):
         )
 
     setattr(cfg, args.key, None)
+    status.update_status(cfg)
     return 0
 
 
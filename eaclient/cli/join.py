@@ -23,6 +23,7 @@ from eaclient import (
     exceptions,
     messages,
     secret_manager,
+    status,
     util,
 )
 from eaclient.cli import cli_util
@@ -84,6 +85,7 @@ def action_attach(args, *, cfg, **kwargs):
     else:
         ret = 0
         '''do some post actions here.'''
+        status.update_status(cfg)
         event.process_events()
         event.info(
             messages.PROMPT_MOTD_JOIN.format(
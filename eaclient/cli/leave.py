@@ -21,6 +21,7 @@ from eaclient import (
     event_logger,
     exceptions,
     messages,
+    status,
     util,
 )
 from eaclient.cli import cli_util
@@ -80,6 +81,7 @@ def _detach(cfg: config.EAConfig, assume_yes: bool, force: False) -> int:
         event.info(info_msg=msg.msg, file_type=sys.stderr)
         sys.exit(1)
 
+    status.update_status(cfg)
     if force:
         event.info(messages.FORCE_DETACH_PROMPT)
     else:
@@ -0,0 +1,159 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sys
+from typing import Iterable, Optional
+
+from eaclient import exceptions, log, log_query, messages, system, util
+from eaclient.cli.commands import ProArgument, ProArgumentGroup, ProCommand
+from eaclient.cli.parser import HelpCategory
+
+LEVELS = ["debug", "info", "warning", "error", "critical"]
+
+
+def _parse_time(arg: str, value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    try:
+        return log_query.parse_time(value)
+    except ValueError:
+        raise exceptions.GenericInvalidFormat(
+            expected="an ISO 8601 date or time for {}".format(arg),
+            actual=value,
+        )
+
+
+def _print_table(entries: Iterable[log_query.LogEntry]):
+    for entry in entries:
+        print(
+            "{time}  {level: <8} {logger}: {message}".format(
+                time=entry.time,
+                level=entry.level,
+                logger=entry.logger,
+                message=entry.message,
+            )
+        )
+
+
+def _print_json(entries: Iterable[log_query.LogEntry]):
+    # Written as it goes, so the whole array is never held in memory
+    separator = "["
+    for entry in entries:
+        print(separator)
+        print(json.dumps(entry._asdict()), end="")
+        separator = ","
+    print("[]" if separator == "[" else "\n]")
+
+
+def _print_ndjson(entries: Iterable[log_query.LogEntry]):
+    for entry in entries:
+        print(json.dumps(entry._asdict()))
+
+
+_PRINTERS = {
+    "table": _print_table,
+    "json": _print_json,
+    "ndjson": _print_ndjson,
+}
+
+
+def action_logs(args, *, cfg, **kwargs) -> int:
+    """Print the log records matching the filters given in args.
+
+    @return: 0
+    """
+    since = _parse_time("--since", args.since)
+    until = _parse_time("--until", args.until)
+    if util.we_are_currently_root():
+        log_file = cfg.log_file
+    else:
+        log_file = log.get_user_log_file()
+    index = log_query.LogIndex(
+        os.path.join(system.get_user_cache_dir(), log_query.LOG_INDEX_FILE)
+    )
+    entries = log_query.query(
+        log_file,
+        index=index,
+        level=args.level,
+        logger=args.logger,
+        function=args.function,
+        text=args.grep,
+        since=since,
+        until=until,
+    )
+    try:
+        _PRINTERS[args.format](entries)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Whatever reads our output, e.g. head, has all it wants
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    finally:
+        index.save(log_file)
+    return 0
+
+
+logs_command = ProCommand(
+    "logs",
+    help=messages.CLI_ROOT_LOGS,
+    description=messages.CLI_LOGS_DESC,
+    action=action_logs,
+    preserve_description=True,
+    help_category=HelpCategory.OTHER,
+    argument_groups=[
+        ProArgumentGroup(
+            arguments=[
+                ProArgument(
+                    "--level",
+                    help=messages.CLI_LOGS_LEVEL,
+                    choices=LEVELS,
+                ),
+                ProArgument(
+                    "--logger",
+                    help=messages.CLI_LOGS_LOGGER,
+                    metavar="NAME",
+                ),
+                ProArgument(
+                    "--function",
+                    help=messages.CLI_LOGS_FUNCTION,
+                    metavar="NAME",
+                ),
+                ProArgument(
+                    "--grep",
+                    help=messages.CLI_LOGS_GREP,
+                    metavar="TEXT",
+                ),
+                ProArgument(
+                    "--since",
+                    help=messages.CLI_LOGS_SINCE,
+                    metavar="TIME",
+                ),
+                ProArgument(
+                    "--until",
+                    help=messages.CLI_LOGS_UNTIL,
+                    metavar="TIME",
+                ),
+                ProArgument(
+                    "--format",
+                    help=messages.CLI_STATUS_FORMAT.format(default="table"),
+                    action="store",
+                    choices=sorted(_PRINTERS),
+                    default="table",
+                ),
+            ]
+        )
+    ],
+)
@@ -0,0 +1,53 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Refresh the contract test result for test --max-age.
+
+Started in its own session by validate._refresh_in_background, with the
+refresh lock inherited and the token, if any, on stdin:
+
+    python3 -m eaclient.cli.refresher
+"""
+
+import logging
+import sys
+
+from eaclient import defaults, log, util
+from eaclient.cli import setup, validate
+from eaclient.config import EAConfig
+
+LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
+
+
+def main() -> int:
+    log.setup_cli_logging(
+        defaults.CONFIG_DEFAULTS["log_level"],
+        defaults.CONFIG_DEFAULTS["log_file"],
+    )
+    cfg = EAConfig()
+    setup(cfg)
+
+    token = sys.stdin.read().strip() or None
+    try:
+        validate._run_test(cfg, token)
+    except Exception as e:
+        LOG.debug("Background contract test failed: %r", e)
+    finally:
+        log.flush_logging()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import json
+
+from eaclient import defaults, messages, status, util
+from eaclient.cli.commands import ProArgument, ProArgumentGroup, ProCommand
+from eaclient.cli.parser import HelpCategory
+
+
+def _format_value(value) -> str:
+    if value is None:
+        return messages.STATUS_NONE
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _format_last_test(last_test) -> str:
+    if not last_test:
+        return messages.STATUS_NEVER
+    tested_at = _format_value(last_test.get("tested_at"))
+    if last_test.get("success"):
+        return messages.STATUS_TEST_SUCCESS.format(tested_at=tested_at)
+    return messages.STATUS_TEST_FAILURE.format(
+        tested_at=tested_at,
+        error=last_test.get("error_code") or last_test.get("http_code"),
+    )
+
+
+def _print_tabular(current_status):
+    rows = [
+        (
+            messages.STATUS_ATTACHED,
+            messages.STATUS_YES
+            if current_status.get("attached")
+            else messages.STATUS_NO,
+        ),
+        (
+            messages.STATUS_MACHINE_ID,
+            _format_value(current_status.get("machine_id")),
+        ),
+        (
+            messages.STATUS_EXPIRES,
+            _format_value(current_status.get("expires")),
+        ),
+        (
+            messages.STATUS_PROXY,
+            _format_value((current_status.get("proxy") or {}).get("scope")),
+        ),
+        (
+            messages.STATUS_LAST_TEST,
+            _format_last_test(current_status.get("last_test")),
+        ),
+        (
+            messages.STATUS_GENERATED_AT,
+            _format_value(current_status.get("generated_at")),
+        ),
+    ]
+    col_width = str(max(len(key) for key, _ in rows) + 1)
+    row_tmpl = "{key: <" + col_width + "} {value}"
+    for key, value in rows:
+        print(row_tmpl.format(key=key + ":", value=value))
+
+    entitlements = current_status.get("entitlements") or []
+    if not entitlements:
+        return
+    table = [
+        (
+            messages.STATUS_ENTITLEMENT_HEADER,
+            messages.STATUS_URI_HEADER,
+            messages.STATUS_EXPIRES_HEADER,
+        )
+    ] + [
+        (
+            _format_value(ent.get("name")),
+            _format_value(ent.get("uri")),
+            _format_value(ent.get("expires")),
+        )
+        for ent in entitlements
+    ]
+    name_width = max(len(row[0]) for row in table)
+    uri_width = max(len(row[1]) for row in table)
+    print()
+    for name, uri, expires in table:
+        print(
+            "{name: <{name_width}}  {uri: <{uri_width}}  {expires}".format(
+                name=name,
+                uri=uri,
+                expires=expires,
+                name_width=name_width,
+                uri_width=uri_width,
+            )
+        )
+
+
+def action_status(args, *, cfg, **kwargs) -> int:
+    """Print the last recorded status without recomputing it.
+
+    @return: 0
+    """
+    current_status = status.read_status(cfg)
+    if args.format == "json":
+        print(
+            json.dumps(
+                current_status,
+                cls=util.DatetimeAwareJSONEncoder,
+                sort_keys=True,
+            )
+        )
+    else:
+        _print_tabular(current_status)
+    return 0
+
+
+status_command = ProCommand(
+    "status",
+    help=messages.CLI_ROOT_STATUS,
+    description=messages.CLI_STATUS_DESC.format(
+        path="{}/{}/status.json".format(
+            defaults.DEFAULT_DATA_DIR, defaults.INTERFACE_FILES_SUBDIR
+        )
+    ),
+    action=action_status,
+    preserve_description=True,
+    help_category=HelpCategory.QUICKSTART,
+    help_position=3,
+    argument_groups=[
+        ProArgumentGroup(
+            arguments=[
+                ProArgument(
+                    "--format",
+                    help=messages.CLI_STATUS_FORMAT.format(
+                        default="tabular"
+                    ),
+                    action="store",
+                    choices=["tabular", "json"],
+                    default="tabular",
+                ),
+            ]
+        )
+    ],
+)
@@ -242,6 +242,35 @@ class TestMain:
         assert "EA_ENV=YES" in log
         assert "EA_FEATURES_WOW=XYZ" in log
 
+    @pytest.mark.parametrize(
+        "action_kwargs,dumped",
+        (
+            ({"return_value": 0}, False),
+            ({"return_value": 1}, True),
+            ({"side_effect": SystemExit(0)}, False),
+            ({"side_effect": SystemExit(2)}, True),
+            ({"side_effect": UnattachedError()}, True),
+        ),
+    )
+    @mock.patch("eaclient.log.dump_flight_recorder")
+    @mock.patch("eaclient.log.setup_cli_logging")
+    @mock.patch("eaclient.cli.get_parser")
+    def test_flight_recorder_dumped_on_failure(
+        self,
+        m_get_parser,
+        _m_setup_logging,
+        m_dump,
+        action_kwargs,
+        dumped,
+    ):
+        m_args = m_get_parser.return_value.parse_args.return_value
+        m_args.action.configure_mock(**action_kwargs)
+
+        with contextlib.suppress(SystemExit):
+            main(["some", "args"])
+
+        assert dumped is m_dump.called
+
     @mock.patch("eaclient.log.setup_cli_logging")
     @mock.patch("eaclient.cli.get_parser")
     @mock.patch("eaclient.cli.EAConfig")
@@ -274,7 +303,16 @@ class TestMain:
 
         if not config_error:
             expected_setup_logging_calls.append(
-                mock.call(mock.ANY, cfg.log_file),
+                mock.call(
+                    mock.ANY,
+                    cfg.log_file,
+                    log_async=False,
+                    queue_size=defaults.DEFAULT_LOG_QUEUE_SIZE,
+                    max_bytes=defaults.DEFAULT_LOG_MAX_BYTES,
+                    backup_count=defaults.DEFAULT_LOG_BACKUP_COUNT,
+                    disk_level=None,
+                    buffer_size=defaults.DEFAULT_LOG_BUFFER_SIZE,
+                ),
             )
 
         assert expected_setup_logging_calls == m_setup_logging.call_args_list
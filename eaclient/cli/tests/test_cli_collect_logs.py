@@ -0,0 +1,73 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+
+import mock
+import pytest
+
+from eaclient.cli.collect_logs import _max_size, collect_logs_command
+
+M_PATH = "eaclient.cli.collect_logs."
+
+
+@mock.patch(M_PATH + "support_bundle.add_known_secrets")
+@mock.patch(M_PATH + "support_bundle.default_sources")
+@mock.patch(M_PATH + "support_bundle.collect")
+class TestActionCollectLogs:
+    def test_reports_outcome(
+        self,
+        m_collect,
+        m_default_sources,
+        m_add_known_secrets,
+        FakeConfig,
+        capsys,
+    ):
+        m_collect.return_value = [
+            {"path": "/etc/elxr-advantage/eaclient.conf", "size": 10},
+            {"path": "/etc/apt/auth.conf", "error": "Permission denied"},
+            {"path": "/var/log/elxr-advantage.log", "truncated": True},
+            {"path": "/var/log/elxr-advantage.log.1", "skipped": True},
+        ]
+        args = mock.MagicMock(output="out.tar.gz", max_size=2)
+        cfg = FakeConfig()
+
+        assert 0 == collect_logs_command.action(args, cfg=cfg)
+
+        assert [
+            mock.call(m_default_sources.return_value, "out.tar.gz", 2097152)
+        ] == m_collect.call_args_list
+        assert [mock.call(cfg)] == m_default_sources.call_args_list
+        assert [mock.call(cfg)] == m_add_known_secrets.call_args_list
+        out, err = capsys.readouterr()
+        assert (
+            "Unable to read /etc/apt/auth.conf: Permission denied\n" == err
+        )
+        assert (
+            "Left out to stay under 2 MiB: /var/log/elxr-advantage.log.1\n"
+            "Only the end of these was kept to stay under 2 MiB: "
+            "/var/log/elxr-advantage.log\n"
+            "Wrote out.tar.gz\n"
+        ) == out
+
+
+class TestMaxSize:
+    def test_valid(self):
+        assert 5 == _max_size("5")
+
+    @pytest.mark.parametrize("value", ("0", "-1", "1.5", "lots"))
+    def test_invalid(self, value):
+        with pytest.raises(argparse.ArgumentTypeError) as excinfo:
+            _max_size(value)
+        assert value in str(excinfo.value)
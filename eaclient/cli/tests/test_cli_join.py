@@ -226,7 +226,11 @@ class TestActionAttach:
     @mock.patch("eaclient.lock.check_lock_info", return_value=(-1, ""))
     @mock.patch("eaclient.actions.action_to_request")
     def test_attach_with_attach_config_success(
-        self, mock_action_to_request, mock_write_file, FakeConfig
+        self,
+        mock_action_to_request,
+        mock_check_lock_info,
+        mock_write_file,
+        FakeConfig,
     ):
         """Test successful attachment when attach_config is provided"""
         fake_config_content = '{"token": "config-token"}'
@@ -255,7 +259,11 @@ class TestActionAttach:
     @mock.patch("eaclient.lock.check_lock_info", return_value=(-1, ""))
     @mock.patch("eaclient.actions.action_to_request")
     def test_attach_fails_on_connectivity_error(
-        self, mock_action_to_request, mock_write_file, FakeConfig
+        self,
+        mock_action_to_request,
+        mock_check_lock_info,
+        mock_write_file,
+        FakeConfig,
     ):
         """Test failure due to network connectivity error"""
         cause = Exception("Simulated connectivity issue")
@@ -162,6 +162,7 @@ class TestActionDetach:
     @mock.patch("eaclient.actions.action_to_request")
     def test_returns_zero(
         self,
+        m_action_to_request,
         m_check_lock_info,
         m_prompt,
         FakeConfig,
@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import mock
+import pytest
+
+from eaclient import exceptions
+from eaclient.cli.logs import logs_command
+
+LINES = [
+    [
+        "2025-03-21T10:00:00.000",
+        "DEBUG",
+        "elxr-pro.cli",
+        "main",
+        10,
+        "Executed with sys.argv: ['elxr-pro', 'test']",
+        {},
+    ],
+    [
+        "2025-03-21T10:00:01.000",
+        "ERROR",
+        "elxr-pro.actions",
+        "action_to_request",
+        42,
+        "Invalid token",
+        {"exc_info": "Traceback"},
+    ],
+]
+
+
+def _args(**kwargs):
+    args = dict(
+        level=None,
+        logger=None,
+        function=None,
+        grep=None,
+        since=None,
+        until=None,
+        format="table",
+    )
+    args.update(kwargs)
+    return mock.MagicMock(**args)
+
+
+@mock.patch("eaclient.util.we_are_currently_root", return_value=True)
+class TestActionLogs:
+    @pytest.fixture
+    def cfg(self, FakeConfig, tmpdir):
+        cfg = FakeConfig()
+        with open(cfg.log_file, "w") as stream:
+            for line in LINES:
+                stream.write(json.dumps(line) + "\n")
+        with mock.patch(
+            "eaclient.system.get_user_cache_dir",
+            return_value=tmpdir.join("cache").strpath,
+        ):
+            yield cfg
+
+    def test_table(self, _m_root, cfg, capsys):
+        assert 0 == logs_command.action(_args(), cfg=cfg)
+
+        out, _ = capsys.readouterr()
+        assert [
+            "2025-03-21T10:00:00.000  DEBUG    elxr-pro.cli: "
+            "Executed with sys.argv: ['elxr-pro', 'test']",
+            "2025-03-21T10:00:01.000  ERROR    elxr-pro.actions: "
+            "Invalid token",
+        ] == out.splitlines()
+
+    @pytest.mark.parametrize("output_format", ("json", "ndjson"))
+    def test_json(self, _m_root, output_format, cfg, capsys):
+        args = _args(format=output_format, level="warning")
+
+        assert 0 == logs_command.action(args, cfg=cfg)
+
+        out, _ = capsys.readouterr()
+        expected = {
+            "time": "2025-03-21T10:00:01.000",
+            "level": "ERROR",
+            "logger": "elxr-pro.actions",
+            "function": "action_to_request",
+            "line": 42,
+            "message": "Invalid token",
+            "extra": {"exc_info": "Traceback"},
+        }
+        if output_format == "json":
+            assert [expected] == json.loads(out)
+        else:
+            assert [expected] == [
+                json.loads(line) for line in out.splitlines()
+            ]
+
+    def test_empty_json_array(self, _m_root, cfg, capsys):
+        args = _args(format="json", since="2026-01-01")
+
+        assert 0 == logs_command.action(args, cfg=cfg)
+
+        out, _ = capsys.readouterr()
+        assert [] == json.loads(out)
+
+    def test_invalid_time(self, _m_root, cfg):
+        with pytest.raises(exceptions.GenericInvalidFormat):
+            logs_command.action(_args(until="tomorrow"), cfg=cfg)
@@ -0,0 +1,51 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+
+import mock
+import pytest
+
+from eaclient.cli import refresher
+
+M_PATH = "eaclient.cli.refresher."
+
+
+@mock.patch(M_PATH + "setup")
+@mock.patch(M_PATH + "log")
+@mock.patch(M_PATH + "EAConfig")
+@mock.patch(M_PATH + "validate._run_test")
+class TestMain:
+    @pytest.mark.parametrize(
+        "stdin, token", (("valid-token\n", "valid-token"), ("", None))
+    )
+    def test_runs_test_with_token_from_stdin(
+        self, m_run_test, m_config, m_log, _m_setup, stdin, token
+    ):
+        with mock.patch("sys.stdin", io.StringIO(stdin)):
+            assert 0 == refresher.main()
+
+        assert [
+            mock.call(m_config.return_value, token)
+        ] == m_run_test.call_args_list
+        assert 1 == m_log.flush_logging.call_count
+
+    def test_failures_are_only_logged(
+        self, m_run_test, _m_config, m_log, _m_setup
+    ):
+        m_run_test.side_effect = Exception("no network")
+
+        with mock.patch("sys.stdin", io.StringIO("")):
+            assert 0 == refresher.main()
+        assert 1 == m_log.flush_logging.call_count
@@ -0,0 +1,90 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import mock
+
+from eaclient.cli.status import status_command
+from eaclient.files.state_files import status_file
+
+STATUS = {
+    "_schema_version": "0.1",
+    "generated_at": "2026-10-01T00:00:00+00:00",
+    "attached": True,
+    "machine_id": "machine-id",
+    "expires": "2026-12-01T00:00:00+00:00",
+    "entitlements": [
+        {
+            "name": "elxr-pro",
+            "uri": "https://packages.elxr.pro/elxr",
+            "suites": ["aria"],
+            "components": ["main"],
+            "architectures": ["amd64"],
+            "expires": "2026-12-01T00:00:00+00:00",
+        }
+    ],
+    "proxy": {"scope": "global", "http": True, "https": False},
+    "last_test": {
+        "tested_at": "2026-10-01T00:00:00+00:00",
+        "success": True,
+        "http_code": 200,
+        "latency": 0.1,
+        "machine_id_match": True,
+        "error_code": None,
+        "error_msg": None,
+    },
+}
+
+
+@mock.patch("eaclient.status.get_status")
+class TestActionStatus:
+    def test_tabular(self, m_get_status, FakeConfig, capsys):
+        cfg = FakeConfig()
+        status_file(cfg.data_dir).write(STATUS)
+        args = mock.MagicMock(format="tabular")
+
+        assert 0 == status_command.action(args, cfg=cfg)
+
+        out, _ = capsys.readouterr()
+        assert "attached:   yes" in out
+        assert "apt proxy:  global" in out
+        assert "last test:  success at 2026-10-01T00:00:00+00:00" in out
+        assert (
+            "elxr-pro     https://packages.elxr.pro/elxr  "
+            "2026-12-01T00:00:00+00:00"
+        ) in out
+        assert [] == m_get_status.call_args_list
+
+    def test_json(self, m_get_status, FakeConfig, capsys):
+        cfg = FakeConfig()
+        status_file(cfg.data_dir).write(STATUS)
+        args = mock.MagicMock(format="json")
+
+        assert 0 == status_command.action(args, cfg=cfg)
+
+        out, _ = capsys.readouterr()
+        assert STATUS == json.loads(out)
+        assert [] == m_get_status.call_args_list
+
+    def test_unattached_without_status_file(
+        self, _m_get_status, FakeConfig, capsys
+    ):
+        args = mock.MagicMock(format="tabular")
+
+        assert 0 == status_command.action(args, cfg=FakeConfig())
+
+        out, _ = capsys.readouterr()
+        assert "attached:   no" in out
+        assert "last test:  never" in out
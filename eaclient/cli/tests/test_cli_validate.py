@@ -12,23 +12,36 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import fcntl
+import hashlib
+import os
+import subprocess
+import sys
+
 import mock
 import pytest
 
-from eaclient.cli.validate import test_command
-
+from eaclient import exceptions
+from eaclient.cli.validate import _refresh_in_background, test_command
 from eaclient.exceptions import ConnectivityError
+from eaclient.files.state_files import (
+    ContractTestResultData,
+    contract_test_result_file,
+)
+
+M_PATH = "eaclient.cli.validate."
 
 
 class TestAction:
     @mock.patch("eaclient.lock.check_lock_info", return_value=(-1, ""))
     @mock.patch("eaclient.actions.action_to_request")
     def test_validate_with_token_success(
-        self, mock_action_to_request, FakeConfig
+        self, mock_action_to_request, _m_check_lock_info, FakeConfig
     ):
         """Test successful connection with token to API Server"""
         args = mock.MagicMock(
-            token="valid-token", attach_config=None
+            token="valid-token", attach_config=None, max_age=None
         )
         cfg = FakeConfig()
         ret = test_command.action(args, cfg=cfg)
@@ -41,11 +54,11 @@ class TestAction:
     @mock.patch("eaclient.lock.check_lock_info", return_value=(-1, ""))
     @mock.patch("eaclient.actions.action_to_request")
     def test_validate_without_token_success(
-        self, mock_action_to_request, FakeConfig
+        self, mock_action_to_request, _m_check_lock_info, FakeConfig
     ):
         """Test successful connection with token to API Server"""
         args = mock.MagicMock(
-            token=None, attach_config=None
+            token=None, attach_config=None, max_age=None
         )
         cfg = FakeConfig()
         ret = test_command.action(args, cfg=cfg)
@@ -58,7 +71,7 @@ class TestAction:
     @mock.patch("eaclient.lock.check_lock_info", return_value=(-1, ""))
     @mock.patch("eaclient.actions.action_to_request")
     def test_validate_fails_on_connectivity_error(
-        self, mock_action_to_request, FakeConfig
+        self, mock_action_to_request, _m_check_lock_info, FakeConfig
     ):
         """Test failure due to network connectivity error"""
         cause = Exception("Simulated connectivity issue")
@@ -67,10 +80,193 @@ class TestAction:
         )
         mock_action_to_request.side_effect = side_effect
 
-        args = mock.MagicMock(token="valid-token", attach_config=None)
+        args = mock.MagicMock(
+            token="valid-token", attach_config=None, max_age=None
+        )
         cfg = FakeConfig()
 
         with pytest.raises(SystemExit) as e:
             test_command.action(args, cfg=cfg)
 
         assert e.value.code == 1
+
+
+def _write_result(cfg, age, token="valid-token", **kwargs):
+    tested_at = datetime.datetime.now(
+        datetime.timezone.utc
+    ) - datetime.timedelta(seconds=age)
+    token_hash = None
+    if token:
+        token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    result = ContractTestResultData(
+        tested_at=tested_at,
+        success=kwargs.pop("success", True),
+        machine_id="machine-id",
+        latency=0.1,
+        exit_code=kwargs.pop("exit_code", 0),
+        token_hash=token_hash,
+        **kwargs
+    )
+    contract_test_result_file(cfg.data_dir).write(result)
+
+
+@mock.patch(M_PATH + "system.get_machine_id", return_value="machine-id")
+@mock.patch(M_PATH + "_refresh_in_background")
+@mock.patch("eaclient.actions.action_to_request")
+class TestMaxAge:
+    def test_records_result(
+        self, m_action_to_request, _m_refresh, _m_machine_id, FakeConfig
+    ):
+        cfg = FakeConfig()
+        args = mock.MagicMock(token="valid-token", max_age=None)
+        assert 0 == test_command.action(args, cfg=cfg)
+
+        result = contract_test_result_file(cfg.data_dir).read()
+        assert result.success is True
+        assert "machine-id" == result.machine_id
+        assert 200 == result.http_code
+        assert result.machine_id_match is True
+        assert "valid-token" not in open(
+            contract_test_result_file(cfg.data_dir).path
+        ).read()
+
+    @pytest.mark.parametrize(
+        "error,http_code,machine_id_match",
+        (
+            (exceptions.ServiceUnavailable(), 503, None),
+            (exceptions.AttachInvalidTokenError(), 401, None),
+            (
+                exceptions.MachineIdUnmatchError(
+                    request_machineid="a", response_machineid="b"
+                ),
+                200,
+                False,
+            ),
+        ),
+    )
+    def test_records_failure(
+        self,
+        m_action_to_request,
+        _m_refresh,
+        _m_machine_id,
+        error,
+        http_code,
+        machine_id_match,
+        FakeConfig,
+    ):
+        cfg = FakeConfig()
+        m_action_to_request.side_effect = error
+        args = mock.MagicMock(token="valid-token", max_age=None)
+        with pytest.raises(type(error)):
+            test_command.action(args, cfg=cfg)
+
+        result = contract_test_result_file(cfg.data_dir).read()
+        assert result.success is False
+        assert http_code == result.http_code
+        assert machine_id_match == result.machine_id_match
+        assert error.msg_code == result.error_code
+        assert error.msg == result.error_msg
+
+    def test_fresh_result_is_served_from_cache(
+        self, m_action_to_request, m_refresh, _m_machine_id, FakeConfig
+    ):
+        cfg = FakeConfig()
+        _write_result(cfg, age=5)
+        args = mock.MagicMock(token="valid-token", max_age=60)
+        assert 0 == test_command.action(args, cfg=cfg)
+        assert [] == m_action_to_request.call_args_list
+        assert [] == m_refresh.call_args_list
+
+    def test_cached_failure_is_replayed(
+        self, m_action_to_request, _m_refresh, _m_machine_id, FakeConfig
+    ):
+        cfg = FakeConfig()
+        _write_result(
+            cfg,
+            age=5,
+            success=False,
+            exit_code=1,
+            http_code=503,
+            error_code="service-unavailable",
+            error_msg="Service unavailable.",
+        )
+        args = mock.MagicMock(token="valid-token", max_age=60)
+        with pytest.raises(exceptions.CachedContractTestError) as excinfo:
+            test_command.action(args, cfg=cfg)
+        assert "service-unavailable" == excinfo.value.msg_code
+        assert "Service unavailable." == excinfo.value.msg
+        assert [] == m_action_to_request.call_args_list
+
+    def test_aging_result_is_refreshed_in_background(
+        self, m_action_to_request, m_refresh, _m_machine_id, FakeConfig
+    ):
+        cfg = FakeConfig()
+        _write_result(cfg, age=40)
+        args = mock.MagicMock(token="valid-token", max_age=60)
+        assert 0 == test_command.action(args, cfg=cfg)
+        assert [] == m_action_to_request.call_args_list
+        assert [mock.call(cfg, "valid-token")] == m_refresh.call_args_list
+
+    @pytest.mark.parametrize(
+        "age,token,root",
+        (
+            (120, "valid-token", True),
+            (5, "other-token", True),
+            (5, None, True),
+            (5, "valid-token", False),
+        ),
+    )
+    def test_result_not_served(
+        self,
+        m_action_to_request,
+        _m_refresh,
+        _m_machine_id,
+        age,
+        token,
+        root,
+        FakeConfig,
+    ):
+        cfg = FakeConfig()
+        _write_result(cfg, age=age)
+        args = mock.MagicMock(token=token, max_age=60)
+        with mock.patch(
+            "eaclient.util.we_are_currently_root", return_value=root
+        ):
+            assert 0 == test_command.action(args, cfg=cfg)
+        assert [
+            mock.call(cfg, cmd="test", token=token)
+        ] == m_action_to_request.call_args_list
+
+
+class TestRefreshInBackground:
+    @mock.patch(M_PATH + "subprocess.Popen")
+    def test_single_refresher(self, m_popen, FakeConfig):
+        cfg = FakeConfig()
+        lock_dir = os.path.join(cfg.data_dir, "private")
+        os.makedirs(lock_dir)
+        with open(os.path.join(lock_dir, "contract-test.lock"), "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            _refresh_in_background(cfg, "valid-token")
+        assert [] == m_popen.call_args_list
+
+    @mock.patch(M_PATH + "subprocess.Popen")
+    def test_starts_refresher(self, m_popen, FakeConfig):
+        cfg = FakeConfig()
+        _refresh_in_background(cfg, "valid-token")
+
+        assert [
+            mock.call(
+                [sys.executable, "-m", "eaclient.cli.refresher"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                pass_fds=mock.ANY,
+                start_new_session=True,
+            )
+        ] == m_popen.call_args_list
+        stdin = m_popen.return_value.stdin
+        assert [mock.call(b"valid-token")] == stdin.write.call_args_list
+        # The lock is released once the refresher exits
+        (lock_fd,) = m_popen.call_args[1]["pass_fds"]
+        with pytest.raises(OSError):
+            os.fstat(lock_fd)
@@ -12,36 +12,220 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import fcntl
+import hashlib
 import logging
+import os
+import subprocess  # nosec B404
 import sys
+import time
+from typing import Optional
 
 from eaclient import (
     actions,
     config,
+    defaults,
     event_logger,
     exceptions,
     messages,
+    status,
+    system,
     util,
 )
 
 from eaclient.cli.commands import ProArgument, ProArgumentGroup, ProCommand
 from eaclient.cli.parser import HelpCategory
+from eaclient.files.state_files import (
+    ContractTestResultData,
+    contract_test_result_file,
+)
 
 
 event = event_logger.get_event_logger()
 LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
 
+# HTTP status behind each error add_contract_machine raises
+_ERROR_HTTP_CODES = {
+    exceptions.AttachInvalidTokenError: 401,
+    exceptions.AttachExpiredToken: 401,
+    exceptions.AttachForbiddenFull: 403,
+    exceptions.AttachForbiddenNever: 403,
+    exceptions.ResourceNotFound: 404,
+    exceptions.InternalServerError: 500,
+    exceptions.ServiceUnavailable: 503,
+    exceptions.MachineIdUnmatchError: 200,
+}
+
+REFRESHER_MODULE = "eaclient.cli.refresher"
+
 
 def action_validate(args, *, cfg, **kwargs) -> int:
     """Perform the validation of connection to for this machine.
 
     @return: 0 on success, 1 otherwise
     """
+    if args.max_age is not None and util.we_are_currently_root():
+        cached = _get_cached_result(cfg, args.token, args.max_age)
+        if cached is not None:
+            ret = _replay_result(cached)
+            # Refresh ahead of expiry so frequent callers keep hitting
+            # the cache
+            age = _result_age(cached)
+            if age > args.max_age / 2:
+                _refresh_in_background(cfg, args.token)
+            event.process_events()
+            return ret
+
     ret = _validate(cfg, token=args.token)
     event.process_events()
     return ret
 
 
+def _token_hash(token: Optional[str]) -> Optional[str]:
+    if not token:
+        return None
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _result_age(result: ContractTestResultData) -> float:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return (now - result.tested_at).total_seconds()
+
+
+def _get_cached_result(
+    cfg: config.EAConfig, token: Optional[str], max_age: int
+) -> Optional[ContractTestResultData]:
+    """Return the last test result if it is fresh and for the same test."""
+    try:
+        result = contract_test_result_file(cfg.data_dir).read()
+    except exceptions.ELxrProError as e:
+        LOG.warning("Ignoring unreadable contract test result: %s", e)
+        return None
+    if result is None:
+        return None
+    if result.token_hash != _token_hash(token):
+        return None
+    if result.machine_id != system.get_machine_id(cfg):
+        return None
+    age = _result_age(result)
+    if age < 0 or age > max_age:
+        LOG.debug("Cached contract test result is %.1fs old", age)
+        return None
+    return result
+
+
+def _replay_result(result: ContractTestResultData) -> int:
+    LOG.debug(
+        "Using contract test result from %s", result.tested_at.isoformat()
+    )
+    if result.success:
+        event.info(messages.VALIDATE_SUCCESS)
+        return 0
+    raise exceptions.CachedContractTestError(
+        error_code=result.error_code or "unexpected-error",
+        error_msg=result.error_msg or "",
+        exit_code=result.exit_code,
+    )
+
+
+def _record_result(
+    cfg: config.EAConfig,
+    token: Optional[str],
+    tested_at: datetime.datetime,
+    latency: float,
+    error: Optional[Exception] = None,
+):
+    if not util.we_are_currently_root():
+        return
+
+    result = ContractTestResultData(
+        tested_at=tested_at,
+        success=error is None,
+        machine_id=system.get_machine_id(cfg),
+        latency=round(latency, 6),
+        exit_code=0,
+        token_hash=_token_hash(token),
+    )
+    if error is None:
+        if token:
+            result.machine_id_match = True
+            result.http_code = 200
+    else:
+        result.exit_code = getattr(error, "exit_code", 1)
+        result.error_code = getattr(error, "msg_code", None)
+        result.error_msg = getattr(error, "msg", str(error))
+        result.http_code = _ERROR_HTTP_CODES.get(type(error))
+        if isinstance(error, exceptions.ContractAPIError):
+            result.http_code = error.code
+        if isinstance(error, exceptions.MachineIdUnmatchError):
+            result.machine_id_match = False
+
+    try:
+        contract_test_result_file(cfg.data_dir).write(result)
+    except OSError as e:
+        LOG.warning("Unable to save contract test result: %s", e)
+    status.update_status(cfg)
+
+
+def _run_test(cfg: config.EAConfig, token: Optional[str] = None):
+    """Run the contract test, recording its outcome for --max-age."""
+    tested_at = datetime.datetime.now(datetime.timezone.utc)
+    start = time.monotonic()
+    try:
+        actions.action_to_request(cfg, cmd="test", token=token)
+    except Exception as e:
+        _record_result(cfg, token, tested_at, time.monotonic() - start, e)
+        raise
+    _record_result(cfg, token, tested_at, time.monotonic() - start)
+
+
+def _refresh_in_background(cfg: config.EAConfig, token: Optional[str]):
+    """
+    Run the contract test in a detached process.
+
+    The refresher holds a lock on the result directory for as long as it
+    runs, so at most one refresh happens at a time. It is a new process
+    rather than a fork: the log writer and compressor threads don't
+    survive a fork, and neither would the locks they may hold.
+    """
+    lock_dir = os.path.join(cfg.data_dir, defaults.PRIVATE_SUBDIR)
+    try:
+        os.makedirs(lock_dir, mode=0o700, exist_ok=True)
+        lock_fd = os.open(
+            os.path.join(lock_dir, "contract-test.lock"),
+            os.O_CREAT | os.O_RDWR,
+            0o600,
+        )
+    except OSError as e:
+        LOG.warning("Unable to refresh contract test result: %s", e)
+        return
+    try:
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            LOG.debug("Contract test refresh already in progress")
+            return
+
+        try:
+            refresher = subprocess.Popen(  # nosec B603
+                [sys.executable, "-m", REFRESHER_MODULE],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                pass_fds=(lock_fd,),
+                start_new_session=True,
+            )
+            # Not on the command line, where anyone could read it
+            with refresher.stdin:
+                refresher.stdin.write((token or "").encode("utf-8"))
+        except OSError as e:
+            LOG.warning("Unable to refresh contract test result: %s", e)
+    finally:
+        # The refresher inherited the lock and keeps it until it exits
+        os.close(lock_fd)
+
+
 def _validate(cfg: config.EAConfig, token=None) -> int:
     """Validate the cnonection from the machine to the API server,
 
@@ -51,7 +235,7 @@ def _validate(cfg: config.EAConfig, token=None) -> int:
     """
 
     try:
-        actions.action_to_request(cfg, cmd="test", token=token)
+        _run_test(cfg, token=token)
     except exceptions.ConnectivityError as exc:
         if "CERTIFICATE_VERIFY_FAILED" in str(exc):
             if "unable to get local issuer certificate" in str(exc):
@@ -87,6 +271,12 @@ test_command = ProCommand(
                 ProArgument(
                     "token", help=messages.CLI_ATTACH_TOKEN, nargs="?"
                 ),
+                ProArgument(
+                    "--max-age",
+                    help=messages.CLI_TEST_MAX_AGE,
+                    type=int,
+                    metavar="SECONDS",
+                ),
             ]
         )
     ],
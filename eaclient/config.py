@@ -15,8 +15,16 @@
 import copy
 import logging
 import os
-from functools import lru_cache
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 from eaclient import (
     event_logger,
@@ -30,10 +38,14 @@ from eaclient.defaults import (
     CONFIG_FIELD_ENVVAR_ALLOWLIST,
     DEFAULT_CONFIG_FILE,
     DEFAULT_DATA_DIR,
+    DEFAULT_LOG_BACKUP_COUNT,
+    DEFAULT_LOG_BUFFER_SIZE,
+    DEFAULT_LOG_MAX_BYTES,
+    DEFAULT_LOG_QUEUE_SIZE,
 )
 
-from eaclient.files import user_config_file
-from eaclient.yaml import safe_load
+from eaclient.files import read_cache, state_store, user_config_file
+from eaclient.yaml import safe_load_config
 
 LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
 
@@ -51,12 +63,37 @@ VALID_EA_CONFIG_KEYS = (
     "data_dir",
     "log_file",
     "log_level",
+    "log_async",
+    "log_queue_size",
+    "log_max_bytes",
+    "log_backup_count",
+    "log_disk_level",
+    "log_buffer_size",
+    "state_backend",
 )
 
 event = event_logger.get_event_logger()
 
 
+ConfigSnapshot = NamedTuple(
+    "ConfigSnapshot",
+    [
+        ("cfg", Mapping[str, Any]),
+        ("invalid_keys", Optional[FrozenSet[str]]),
+        ("user_config", user_config_file.UserConfigData),
+    ],
+)
+
+
 class EAConfig:
+    """
+    The configuration of elxr-pro: defaults, eaclient.conf and EA_*
+    environment overrides, plus the user config.
+
+    Everything is held in an immutable ConfigSnapshot. Setters persist
+    the user config once and replace the snapshot instead of changing it.
+    """
+
     ea_scoped_proxy_options = ("ea_apt_http_proxy", "ea_apt_https_proxy")
     global_scoped_proxy_options = (
         "global_apt_http_proxy",
@@ -70,25 +107,55 @@ class EAConfig:
         series: Optional[str] = None,
     ) -> None:
         """"""
+        invalid_keys = None  # type: Optional[FrozenSet[str]]
         if cfg:
             self.cfg_path = None
-            self.cfg = cfg
-            self.invalid_keys = None
         else:
             self.cfg_path = get_config_path()
-            self.cfg, self.invalid_keys = parse_config(self.cfg_path)
+            cfg, invalid_keys = load_config(self.cfg_path)
 
-        if user_config:
-            self.user_config = user_config
-        else:
+        if not user_config:
             try:
-                self.user_config = user_config_file.user_config.read()
+                user_config = user_config_file.user_config.read()
             except Exception as e:
                 LOG.warning("Error loading user config", exc_info=e)
                 LOG.warning("Using default config values")
-                self.user_config = user_config_file.UserConfigData()
+                user_config = user_config_file.UserConfigData()
+        self._snapshot = ConfigSnapshot(cfg, invalid_keys, user_config)
         self.series = series
 
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        return self._snapshot
+
+    @property
+    def cfg(self) -> Mapping[str, Any]:
+        return self._snapshot.cfg
+
+    @property
+    def invalid_keys(self) -> Optional[FrozenSet[str]]:
+        return self._snapshot.invalid_keys
+
+    @property
+    def user_config(self) -> user_config_file.UserConfigData:
+        return self._snapshot.user_config
+
+    @user_config.setter
+    def user_config(self, value: user_config_file.UserConfigData):
+        """Use value from now on, without persisting it."""
+        self._snapshot = self._snapshot._replace(user_config=value)
+
+    def update_user_config(self, **changes: Optional[str]):
+        """
+        Persist the user config with changes applied, writing it once,
+        and use it from now on.
+        """
+        user_config = user_config_file.UserConfigData.from_dict(
+            dict(self.user_config.to_dict(), **changes)
+        )
+        user_config_file.user_config.write(user_config)
+        self._snapshot = self._snapshot._replace(user_config=user_config)
+
     @property
     def contract_url(self) -> str:
         return self.cfg.get("contract_url", BASE_CONTRACT_URL)
@@ -99,8 +166,7 @@ class EAConfig:
 
     @ea_apt_https_proxy.setter
     def ea_apt_https_proxy(self, value: str):
-        self.user_config.ea_apt_https_proxy = value
-        user_config_file.user_config.write(self.user_config)
+        self.update_user_config(ea_apt_https_proxy=value)
 
     @property
     def ea_apt_http_proxy(self) -> Optional[str]:
@@ -108,43 +174,42 @@ class EAConfig:
 
     @ea_apt_http_proxy.setter
     def ea_apt_http_proxy(self, value: str):
-        self.user_config.ea_apt_http_proxy = value
-        user_config_file.user_config.write(self.user_config)
+        self.update_user_config(ea_apt_http_proxy=value)
 
-    @property  # type: ignore
-    @lru_cache(maxsize=None)
+    @property
     def global_apt_http_proxy(self) -> Optional[str]:
-        global_val = self.user_config.global_apt_http_proxy
-        if global_val:
-            return global_val
-
-        return None
+        return self.user_config.global_apt_http_proxy or None
 
     @global_apt_http_proxy.setter
     def global_apt_http_proxy(self, value: str):
-        self.user_config.global_apt_http_proxy = value
-        EAConfig.global_apt_http_proxy.fget.cache_clear()  # type: ignore
-        user_config_file.user_config.write(self.user_config)
+        self.update_user_config(global_apt_http_proxy=value)
 
-    @property  # type: ignore
-    @lru_cache(maxsize=None)
+    @property
     def global_apt_https_proxy(self) -> Optional[str]:
-        global_val = self.user_config.global_apt_https_proxy
-        if global_val:
-            return global_val
-
-        return None
+        return self.user_config.global_apt_https_proxy or None
 
     @global_apt_https_proxy.setter
     def global_apt_https_proxy(self, value: str):
-        self.user_config.global_apt_https_proxy = value
-        EAConfig.global_apt_https_proxy.fget.cache_clear()  # type: ignore
-        user_config_file.user_config.write(self.user_config)
+        self.update_user_config(global_apt_https_proxy=value)
 
     @property
     def data_dir(self):
         return self.cfg.get("data_dir", DEFAULT_DATA_DIR)
 
+    @property
+    def state_backend(self) -> str:
+        backend = self.cfg.get(
+            "state_backend", state_store.STATE_BACKEND_FILES
+        )
+        if backend not in state_store.STATE_BACKENDS:
+            LOG.warning(
+                "Ignoring invalid state_backend %r, using %s",
+                backend,
+                state_store.STATE_BACKEND_FILES,
+            )
+            return state_store.STATE_BACKEND_FILES
+        return backend
+
     @property
     def log_level(self):
         log_level = self.cfg.get("log_level", "DEBUG")
@@ -157,6 +222,56 @@ class EAConfig:
     def log_file(self) -> str:
         return self.cfg.get("log_file", CONFIG_DEFAULTS["log_file"])
 
+    @property
+    def log_async(self) -> bool:
+        return self.cfg.get("log_async", False) is True
+
+    def _int_setting(self, key: str, default: int, minimum: int) -> int:
+        value = self.cfg.get(key, default)
+        if (
+            not isinstance(value, int)
+            or isinstance(value, bool)
+            or value < minimum
+        ):
+            LOG.warning(
+                "Ignoring invalid %s %r, using %d", key, value, default
+            )
+            return default
+        return value
+
+    @property
+    def log_queue_size(self) -> int:
+        return self._int_setting("log_queue_size", DEFAULT_LOG_QUEUE_SIZE, 1)
+
+    @property
+    def log_max_bytes(self) -> int:
+        """0 turns rotation off"""
+        return self._int_setting("log_max_bytes", DEFAULT_LOG_MAX_BYTES, 0)
+
+    @property
+    def log_backup_count(self) -> int:
+        return self._int_setting(
+            "log_backup_count", DEFAULT_LOG_BACKUP_COUNT, 0
+        )
+
+    @property
+    def log_disk_level(self) -> Optional[int]:
+        """None writes every record down to log_level right away"""
+        disk_level = self.cfg.get("log_disk_level")
+        if disk_level is None:
+            return None
+        level = logging.getLevelName(str(disk_level).upper())
+        if not isinstance(level, int):
+            LOG.warning("Ignoring invalid log_disk_level %r", disk_level)
+            return None
+        return level
+
+    @property
+    def log_buffer_size(self) -> int:
+        return self._int_setting(
+            "log_buffer_size", DEFAULT_LOG_BUFFER_SIZE, 1
+        )
+
     def warn_about_invalid_keys(self):
         if self.invalid_keys is not None:
             for invalid_key in sorted(self.invalid_keys):
@@ -174,6 +289,33 @@ def get_config_path() -> str:
     return DEFAULT_CONFIG_FILE
 
 
+def _ea_environment() -> Tuple[Tuple[str, str], ...]:
+    return tuple(
+        sorted(
+            (key, value)
+            for key, value in os.environ.items()
+            if key.lower().startswith("ea_")
+        )
+    )
+
+
+def load_config(
+    config_path: str,
+) -> Tuple[Mapping[str, Any], FrozenSet[str]]:
+    """
+    Like parse_config, but read-only and memoized while config_path and
+    the EA_* environment variables are unchanged.
+    """
+
+    def _load():
+        cfg, invalid_keys = parse_config(config_path)
+        return MappingProxyType(cfg), frozenset(invalid_keys)
+
+    return read_cache.cached(
+        config_path, ("config", _ea_environment()), _load
+    )
+
+
 def parse_config(config_path=None):
     """Parse known Pro config file
 
@@ -194,7 +336,7 @@ def parse_config(config_path=None):
 
     LOG.debug("Using client configuration file at %s", config_path)
     if os.path.exists(config_path):
-        cfg.update(safe_load(system.load_file(config_path)))
+        cfg.update(safe_load_config(system.load_file(config_path)))
     env_keys = {}
     for key, value in os.environ.items():
         key = key.lower()
@@ -163,7 +163,9 @@ class FakeMachineToken(MachineTokenFile):
         self._machine_token = None
         self.token = token
         self._contract_expiry_datetime = None
-        self._entitlements = None
+        self._raw = None
+        self._index = None
+        self._index_token = None
         self.write_calls = 0
         self.delete_calls = 0
 
@@ -176,6 +178,9 @@ class FakeMachineToken(MachineTokenFile):
     def is_present(self):
         return self.attached
 
+    def _read_raw(self):
+        return None
+
     def read(self):
         if self.token:
             return self.token
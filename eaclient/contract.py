@@ -20,6 +20,7 @@ import eaclient.files.machine_token as mtf
 from eaclient import (
     event_logger,
     exceptions,
+    singleflight,
     system,
     util,
     version,
@@ -47,7 +48,7 @@ class EAContractClient(serviceclient.EAServiceClient):
         cfg: Optional[EAConfig] = None,
     ) -> None:
         super().__init__(cfg=cfg)
-        self.machine_token_file = mtf.get_machine_token_file()
+        self.machine_token_file = mtf.get_machine_token_file(self.cfg)
 
     @util.retry(socket.timeout, retry_sleeps=[1, 2, 2])
     def add_contract_machine(
@@ -88,9 +89,21 @@ class EAContractClient(serviceclient.EAServiceClient):
         if contract_token:
             data["token"] = contract_token
 
-        response = self.request_url(
-            req_url, data=data, headers=headers
-        )
+        if cmd == "test":
+            # Concurrent tests of the same machine share one request
+            response = singleflight.do(
+                [
+                    "test",
+                    self.cfg.contract_url,
+                    machine_id,
+                    contract_token or "",
+                ],
+                lambda: self.request_url(req_url, data=data, headers=headers),
+            )
+        else:
+            response = self.request_url(
+                req_url, data=data, headers=headers
+            )
 
         detail = response.json_dict.get("detail")
         if response.code != 200:
@@ -26,15 +26,15 @@ class Resource(DataObject):
     fields = [
         Field("type", StringDataValue, False),
         Field("uri", StringDataValue, False),
-        Field("login", StringDataValue, False),
-        Field("password", StringDataValue, False),
+        Field("login", StringDataValue, False, public=False),
+        Field("password", StringDataValue, False, public=False),
         Field("suites", data_list(StringDataValue), False),
         Field("components", data_list(StringDataValue), False),
         Field("architectures", data_list(StringDataValue), False),
         Field("expires", StringDataValue, False),
     ]
 
-    def _init__(
+    def __init__(
         self,
         type: Optional[str],
         uri: Optional[str],
@@ -56,6 +56,13 @@ class Resource(DataObject):
 
 
 class PublicMachineTokenData(DataObject):
+    """
+    The fields of the machine token that are also written to its
+    world-readable copy: the resources without their login and password,
+    machineId, the machine token itself and message. Any other key only
+    stays in the private copy.
+    """
+
     fields = [
         Field("resources", data_list(Resource), False),
         Field("machineId", StringDataValue, False),
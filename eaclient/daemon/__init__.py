@@ -0,0 +1,92 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Resident elxr-pro service.
+
+The daemon keeps an EAConfig, a shared SSL context and the probed system
+facts warm and answers read-only requests over a root-only Unix socket.
+This package only holds the wire protocol so the thin client can use it
+without importing the rest of eaclient.
+"""
+
+import json
+import socket
+from typing import Any, Dict
+
+from eaclient import defaults
+
+# Commands the daemon runs on behalf of the CLI, as argv prefixes
+DAEMON_CLI_COMMANDS = (
+    ("test",),
+    ("status",),
+    ("config", "show"),
+)
+
+MAX_MESSAGE_SIZE = 4 * 1024 * 1024
+
+
+class DaemonProtocolError(Exception):
+    pass
+
+
+def is_daemon_cli_command(argv) -> bool:
+    """Whether argv is a CLI invocation the daemon can answer."""
+    for prefix in DAEMON_CLI_COMMANDS:
+        if tuple(argv[: len(prefix)]) == prefix:
+            return True
+    return False
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def recv_message(sock: socket.socket) -> Dict[str, Any]:
+    """Read one newline terminated JSON message from sock."""
+    chunks = []
+    size = 0
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > MAX_MESSAGE_SIZE:
+            raise DaemonProtocolError("message too large")
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    data = b"".join(chunks)
+    if not data:
+        raise DaemonProtocolError("connection closed")
+    try:
+        message = json.loads(data.decode("utf-8"))
+    except ValueError:
+        raise DaemonProtocolError("invalid message")
+    if not isinstance(message, dict):
+        raise DaemonProtocolError("invalid message")
+    return message
+
+
+def request(
+    message: Dict[str, Any],
+    socket_path: str = defaults.DAEMON_SOCKET_PATH,
+    timeout: float = 120.0,
+) -> Dict[str, Any]:
+    """Send a single request to the daemon and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        send_message(sock, message)
+        return recv_message(sock)
@@ -0,0 +1,83 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Thin elxr-pro entry point.
+
+When the daemon socket is present, commands the daemon can answer are
+forwarded to it instead of importing and initialising the whole client.
+Anything else, or any problem reaching the daemon, falls back to the
+regular CLI.
+"""
+
+import os
+import sys
+from typing import List, Optional
+
+from eaclient import daemon, defaults
+
+
+def forward_to_daemon(
+    argv: List[str], socket_path: str = defaults.DAEMON_SOCKET_PATH
+) -> Optional[int]:
+    """
+    Run argv through the daemon, replaying its output.
+
+    :return: the command exit code, or None if the daemon can't answer
+        and the regular CLI should be used.
+    """
+    if os.environ.get("EA_NO_DAEMON"):
+        return None
+    # The daemon has its own environment, EA_* overrides of this one
+    # only apply to the regular CLI
+    if any(key.lower().startswith("ea_") for key in os.environ):
+        return None
+    if not daemon.is_daemon_cli_command(argv):
+        return None
+    # The socket is root-only, don't bother trying otherwise
+    if os.geteuid() != 0 or not os.path.exists(socket_path):
+        return None
+
+    try:
+        response = daemon.request(
+            {"command": "run", "argv": argv}, socket_path=socket_path
+        )
+    except (OSError, daemon.DaemonProtocolError):
+        return None
+
+    exit_code = response.get("exit_code")
+    if not isinstance(exit_code, int):
+        return None
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stdout.flush()
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stderr.flush()
+    return exit_code
+
+
+def main(sys_argv=None):
+    if not sys_argv:
+        sys_argv = sys.argv
+
+    exit_code = forward_to_daemon(sys_argv[1:])
+    if exit_code is not None:
+        return exit_code
+
+    from eaclient.cli import main as cli_main
+
+    return cli_main(sys_argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
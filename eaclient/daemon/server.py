@@ -0,0 +1,275 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The resident elxr-pro daemon.
+
+Run with:
+
+    python3 -m eaclient.daemon.server
+"""
+
+import contextlib
+import io
+import logging
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from eaclient import (
+    daemon,
+    defaults,
+    event_logger,
+    http,
+    system,
+    util,
+)
+from eaclient.cli import get_parser, main_error_handler, run_action, setup
+from eaclient.config import EAConfig, get_config_path
+from eaclient.daemon.watcher import FileWatcher
+from eaclient.files import machine_token, state_store
+
+event = event_logger.get_event_logger()
+LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
+
+_PEERCRED = struct.Struct("3i")
+
+# Probed once at startup and kept for the daemon lifetime
+_WARM_FACTS = (
+    system.get_release_info,
+    system.get_kernel_info,
+    system.get_dpkg_arch,
+    system.get_virt_type,
+    system.get_cpu_info,
+    system.is_container,
+)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server  # type: ProDaemon
+        uid = server.peer_uid(self.connection)
+        if uid not in server.allowed_uids:
+            LOG.warning("Rejected daemon request from uid %s", uid)
+            daemon.send_message(
+                self.connection, {"error": "permission denied"}
+            )
+            return
+        try:
+            message = daemon.recv_message(self.connection)
+        except daemon.DaemonProtocolError as e:
+            daemon.send_message(self.connection, {"error": str(e)})
+            return
+        daemon.send_message(self.connection, server.dispatch(message))
+
+
+class ProDaemon(socketserver.UnixStreamServer):
+    """
+    Serve read-only elxr-pro commands over a Unix socket.
+
+    Requests are answered one at a time: commands reuse the process-wide
+    event logger and redirect stdout while they run.
+
+    :param socket_path: where to create the socket.
+    :param cfg: configuration to serve, re-read from disk on changes when
+        not given.
+    """
+
+    def __init__(
+        self,
+        socket_path: str = defaults.DAEMON_SOCKET_PATH,
+        cfg: Optional[EAConfig] = None,
+    ):
+        self.socket_path = socket_path
+        self.started_at = time.time()
+        self.last_reload = self.started_at
+        self.allowed_uids = {0, os.getuid()}
+        self._fixed_cfg = cfg is not None
+        self.cfg = cfg if cfg is not None else EAConfig()
+        state_store.configure(self.cfg)
+        self.parser = get_parser()
+        self.watcher = FileWatcher(self._watched_paths())
+
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
+        os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(socket_path, 0o600)
+
+        http.enable_shared_ssl_context()
+        self.warm()
+
+    def _watched_paths(self) -> List[str]:
+        data_dir = self.cfg.data_dir
+        private_dir = os.path.join(data_dir, defaults.PRIVATE_SUBDIR)
+        paths = [
+            os.path.join(data_dir, defaults.MACHINE_TOKEN_FILE),
+            os.path.join(private_dir, defaults.MACHINE_TOKEN_FILE),
+            os.path.join(data_dir, defaults.USER_CONFIG_FILE),
+            os.path.join(private_dir, defaults.USER_CONFIG_FILE),
+        ]
+        if self.cfg.cfg_path:
+            paths.append(self.cfg.cfg_path)
+        return paths
+
+    def warm(self):
+        """Probe the system facts so requests don't pay for them."""
+        for fact in _WARM_FACTS:
+            try:
+                fact()
+            except Exception as e:
+                LOG.debug("Failed to warm %s: %r", fact.__name__, e)
+        try:
+            system.get_machine_id(self.cfg)
+        except Exception as e:
+            LOG.debug("Failed to warm machine id: %r", e)
+
+    def reload(self):
+        """Drop everything derived from the configuration and state files."""
+        LOG.info("Reloading daemon configuration")
+        if not self._fixed_cfg:
+            self.cfg = EAConfig()
+            setup(self.cfg)
+        machine_token._machine_token_files.clear()
+        system.get_machine_id.cache_clear()
+        self.last_reload = time.time()
+        self.watcher.close()
+        self.watcher = FileWatcher(self._watched_paths())
+        self.warm()
+
+    def service_actions(self):
+        if self.watcher.changed():
+            self.reload()
+
+    @staticmethod
+    def peer_uid(sock: socket.socket) -> Optional[int]:
+        try:
+            creds = sock.getsockopt(
+                socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED.size
+            )
+        except (OSError, AttributeError):
+            return None
+        _pid, uid, _gid = _PEERCRED.unpack(creds)
+        return uid
+
+    def dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        command = message.get("command")
+        if command in ("ping", "status"):
+            return self.status()
+        if command == "run":
+            argv = message.get("argv")
+            if not isinstance(argv, list) or not all(
+                isinstance(arg, str) for arg in argv
+            ):
+                return {"error": "invalid argv"}
+            if not daemon.is_daemon_cli_command(argv):
+                return {"error": "unsupported command"}
+            return self.run_cli(argv)
+        return {"error": "unknown command"}
+
+    def status(self) -> Dict[str, Any]:
+        token_file = machine_token.get_machine_token_file(self.cfg)
+        return {
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started_at, 3),
+            "last_reload": self.last_reload,
+            "config": self.cfg.cfg_path,
+            "attached": token_file.is_attached,
+            "machine_id": token_file.contract_id,
+            "watcher": "inotify" if self.watcher.uses_inotify else "poll",
+        }
+
+    def run_cli(self, argv: List[str]) -> Dict[str, Any]:
+        """Run argv as the CLI would, capturing its output."""
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        exit_code = 0
+
+        @main_error_handler
+        def _run():
+            args = self.parser.parse_args(args=argv)
+            LOG.debug("Daemon executing: %r", argv)
+            return run_action(args, self.cfg, ["elxr-pro"] + argv)
+
+        event.reset()
+        event.set_event_mode(event_logger.EventLoggerMode.CLI)
+        # --debug adds a handler writing to the captured stderr
+        logger = logging.getLogger("elxr-pro")
+        handlers = logger.handlers[:]
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(
+            stderr
+        ):
+            try:
+                exit_code = _run() or 0
+            except SystemExit as e:
+                if e.code is None:
+                    exit_code = 0
+                elif isinstance(e.code, int):
+                    exit_code = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    exit_code = 1
+            finally:
+                logger.handlers = handlers
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+    def server_close(self):
+        super().server_close()
+        self.watcher.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+
+
+def _sigterm_handler(_signum, _frame):
+    sys.exit(0)
+
+
+def main():
+    cfg = EAConfig()
+    setup(cfg)
+    if not util.we_are_currently_root():
+        print("The elxr-pro daemon must run as root", file=sys.stderr)
+        return 1
+
+    signal.signal(signal.SIGTERM, _sigterm_handler)
+    server = ProDaemon()
+    LOG.info(
+        "elxr-pro daemon listening on %s (config %s)",
+        server.socket_path,
+        get_config_path(),
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
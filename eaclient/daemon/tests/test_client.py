@@ -0,0 +1,130 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socket
+import threading
+
+import mock
+import pytest
+
+from eaclient import daemon
+from eaclient.daemon.client import forward_to_daemon
+
+M_PATH = "eaclient.daemon.client."
+
+
+class TestIsDaemonCliCommand:
+    @pytest.mark.parametrize(
+        "argv,expected",
+        (
+            (["test"], True),
+            (["test", "--format", "json"], True),
+            (["config", "show"], True),
+            (["config", "show", "http_proxy"], True),
+            (["config", "set", "http_proxy=http://proxy"], False),
+            (["config"], False),
+            (["join", "TOKEN"], False),
+            ([], False),
+        ),
+    )
+    def test_eligible_commands(self, argv, expected):
+        assert expected is daemon.is_daemon_cli_command(argv)
+
+
+class TestProtocol:
+    def test_roundtrip_over_socket(self):
+        left, right = socket.socketpair()
+        with left, right:
+            daemon.send_message(left, {"command": "run", "argv": ["test"]})
+            assert {
+                "command": "run",
+                "argv": ["test"],
+            } == daemon.recv_message(right)
+
+    @pytest.mark.parametrize("payload", (b"", b"not json\n", b"[1]\n"))
+    def test_invalid_messages(self, payload):
+        left, right = socket.socketpair()
+        with left, right:
+            left.sendall(payload)
+            left.shutdown(socket.SHUT_WR)
+            with pytest.raises(daemon.DaemonProtocolError):
+                daemon.recv_message(right)
+
+
+class TestForwardToDaemon:
+    @pytest.mark.parametrize(
+        "argv,env,euid,socket_exists",
+        (
+            (["join", "TOKEN"], {}, 0, True),
+            (["test"], {"EA_NO_DAEMON": "1"}, 0, True),
+            (["test"], {"EA_LOG_LEVEL": "debug"}, 0, True),
+            (["test"], {}, 1000, True),
+            (["test"], {}, 0, False),
+        ),
+    )
+    @mock.patch("eaclient.daemon.request")
+    def test_falls_back_to_cli(
+        self, m_request, argv, env, euid, socket_exists, tmpdir
+    ):
+        socket_path = tmpdir.join("daemon.sock")
+        if socket_exists:
+            socket_path.write("")
+        with mock.patch.dict(M_PATH + "os.environ", env, clear=True):
+            with mock.patch(M_PATH + "os.geteuid", return_value=euid):
+                assert None is forward_to_daemon(
+                    argv, socket_path=socket_path.strpath
+                )
+        assert [] == m_request.call_args_list
+
+    @mock.patch(M_PATH + "os.geteuid", return_value=0)
+    def test_unreachable_daemon_falls_back(self, _m_geteuid, tmpdir):
+        socket_path = tmpdir.join("daemon.sock")
+        socket_path.write("")
+        assert None is forward_to_daemon(
+            ["test"], socket_path=socket_path.strpath
+        )
+
+    @mock.patch(M_PATH + "os.geteuid", return_value=0)
+    def test_replays_daemon_output(self, _m_geteuid, tmpdir, capsys):
+        socket_path = tmpdir.join("daemon.sock").strpath
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(socket_path)
+        listener.listen(1)
+        received = []
+
+        def _serve():
+            conn, _ = listener.accept()
+            with conn:
+                received.append(daemon.recv_message(conn))
+                daemon.send_message(
+                    conn, {"exit_code": 3, "stdout": "out\n", "stderr": "err"}
+                )
+
+        thread = threading.Thread(target=_serve)
+        thread.start()
+        try:
+            with mock.patch.dict(M_PATH + "os.environ", {}, clear=True):
+                assert 3 == forward_to_daemon(
+                    ["config", "show"], socket_path=socket_path
+                )
+        finally:
+            thread.join()
+            listener.close()
+            os.unlink(socket_path)
+
+        assert [{"command": "run", "argv": ["config", "show"]}] == received
+        out, err = capsys.readouterr()
+        assert "out\n" == out
+        assert "err" == err
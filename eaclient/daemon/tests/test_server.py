@@ -0,0 +1,158 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socket
+import stat
+
+import mock
+import pytest
+
+from eaclient import daemon, defaults
+from eaclient.daemon.server import ProDaemon
+from eaclient.daemon.watcher import FileWatcher
+
+M_PATH = "eaclient.daemon.server."
+
+
+@pytest.fixture
+def pro_daemon(FakeConfig, tmpdir):
+    with mock.patch(M_PATH + "http.enable_shared_ssl_context"):
+        with mock.patch.object(ProDaemon, "warm"):
+            server = ProDaemon(
+                socket_path=tmpdir.join("daemon.sock").strpath,
+                cfg=FakeConfig(),
+            )
+            yield server
+            server.server_close()
+
+
+class TestProDaemon:
+    def test_socket_is_private(self, pro_daemon):
+        mode = os.stat(pro_daemon.socket_path).st_mode
+        assert stat.S_ISSOCK(mode)
+        assert 0o600 == stat.S_IMODE(mode)
+
+    def test_socket_removed_on_close(self, pro_daemon):
+        pro_daemon.server_close()
+        assert not os.path.exists(pro_daemon.socket_path)
+
+    def test_status(self, pro_daemon):
+        response = pro_daemon.dispatch({"command": "status"})
+        assert os.getpid() == response["pid"]
+        assert response["attached"] is False
+
+    @pytest.mark.parametrize(
+        "message,error",
+        (
+            ({"command": "unknown"}, "unknown command"),
+            ({"command": "run", "argv": "test"}, "invalid argv"),
+            (
+                {"command": "run", "argv": ["join", "TOKEN"]},
+                "unsupported command",
+            ),
+        ),
+    )
+    def test_rejects_invalid_requests(self, message, error, pro_daemon):
+        assert {"error": error} == pro_daemon.dispatch(message)
+
+    def test_run_captures_output(self, pro_daemon, capsys):
+        response = pro_daemon.dispatch(
+            {"command": "run", "argv": ["config", "show"]}
+        )
+        assert 0 == response["exit_code"]
+        assert "http_proxy" in response["stdout"]
+        assert ("", "") == capsys.readouterr()
+
+    def test_run_reports_exit_code(self, pro_daemon):
+        response = pro_daemon.dispatch(
+            {"command": "run", "argv": ["config", "show", "invalid"]}
+        )
+        assert 1 == response["exit_code"]
+        assert "invalid" in response["stderr"]
+
+    @mock.patch(M_PATH + "run_action", return_value=0)
+    def test_run_goes_through_cli_setup(self, m_run_action, pro_daemon):
+        pro_daemon.dispatch({"command": "run", "argv": ["status"]})
+
+        assert [
+            mock.call(mock.ANY, pro_daemon.cfg, ["elxr-pro", "status"])
+        ] == m_run_action.call_args_list
+
+    @mock.patch(M_PATH + "state_store.configure")
+    def test_state_backend_configured(self, m_configure, FakeConfig, tmpdir):
+        cfg = FakeConfig()
+        with mock.patch(M_PATH + "http.enable_shared_ssl_context"):
+            with mock.patch.object(ProDaemon, "warm"):
+                server = ProDaemon(
+                    socket_path=tmpdir.join("daemon.sock").strpath, cfg=cfg
+                )
+        server.server_close()
+
+        assert [mock.call(cfg)] == m_configure.call_args_list
+
+    def test_handles_socket_requests(self, pro_daemon):
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        with client:
+            client.connect(pro_daemon.socket_path)
+            daemon.send_message(client, {"command": "ping"})
+            pro_daemon.handle_request()
+            response = daemon.recv_message(client)
+        assert os.getpid() == response["pid"]
+
+    def test_rejects_other_users(self, pro_daemon):
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        with client:
+            client.connect(pro_daemon.socket_path)
+            daemon.send_message(client, {"command": "ping"})
+            with mock.patch.object(ProDaemon, "peer_uid", return_value=1234):
+                pro_daemon.handle_request()
+            response = daemon.recv_message(client)
+        assert {"error": "permission denied"} == response
+
+    def test_reload_on_change(self, pro_daemon):
+        user_config = os.path.join(
+            pro_daemon.cfg.data_dir, defaults.USER_CONFIG_FILE
+        )
+        with mock.patch.object(ProDaemon, "reload") as m_reload:
+            pro_daemon.service_actions()
+            assert [] == m_reload.call_args_list
+            with open(user_config, "w") as f:
+                f.write("{}")
+            pro_daemon.service_actions()
+            assert 1 == m_reload.call_count
+
+
+class TestFileWatcher:
+    @pytest.mark.parametrize("inotify", (True, False))
+    def test_reports_changed_files(self, inotify, tmpdir):
+        watched = tmpdir.join("watched.json")
+        other = tmpdir.join("other.json")
+        if inotify:
+            watcher = FileWatcher([watched.strpath])
+        else:
+            with mock.patch(
+                "eaclient.daemon.watcher._load_libc", return_value=None
+            ):
+                watcher = FileWatcher([watched.strpath])
+        try:
+            assert inotify is watcher.uses_inotify
+            assert set() == watcher.changed()
+            other.write("{}")
+            assert set() == watcher.changed()
+            watched.write("{}")
+            assert {watched.strpath} == watcher.changed()
+            assert set() == watcher.changed()
+        finally:
+            watcher.close()
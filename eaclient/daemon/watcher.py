@@ -0,0 +1,180 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Change notification for the files the daemon keeps cached.
+
+Uses inotify through libc when available and falls back to polling the
+files' stat results otherwise.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+from typing import Iterable, Optional, Set, Tuple
+
+from eaclient import util
+
+LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    libc_name = ctypes.util.find_library("c")
+    if not libc_name:
+        return None
+    try:
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class FileWatcher:
+    """
+    Report whether any of a set of files changed since the last check.
+
+    Files are watched through their parent directory, so files that are
+    replaced via rename, created or deleted are all noticed.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths = set(os.path.abspath(p) for p in paths)
+        self._fd = None  # type: Optional[int]
+        self._watches = {}
+        self._stats = {}
+        libc = _load_libc()
+        if libc is not None:
+            self._setup_inotify(libc)
+        if self._fd is None:
+            LOG.debug("inotify unavailable, polling watched files")
+            self._stats = {p: self._stat(p) for p in self.paths}
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._fd is not None
+
+    def _setup_inotify(self, libc):
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            LOG.debug(
+                "inotify_init1 failed: %s",
+                os.strerror(ctypes.get_errno()),
+            )
+            return
+        directories = set(os.path.dirname(p) for p in self.paths)
+        for directory in sorted(directories):
+            if not os.path.isdir(directory):
+                continue
+            wd = libc.inotify_add_watch(
+                fd, directory.encode("utf-8"), WATCH_MASK
+            )
+            if wd < 0:
+                LOG.debug(
+                    "Unable to watch %s: %s",
+                    directory,
+                    os.strerror(ctypes.get_errno()),
+                )
+                continue
+            self._watches[wd] = directory
+        if not self._watches:
+            os.close(fd)
+            return
+        self._fd = fd
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, ...]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def fileno(self) -> Optional[int]:
+        return self._fd
+
+    def changed(self) -> Set[str]:
+        """Return the watched paths changed since the previous call."""
+        if self._fd is None:
+            return self._poll()
+        return self._read_events()
+
+    def _poll(self) -> Set[str]:
+        changed = set()
+        for path in self.paths:
+            current = self._stat(path)
+            if current != self._stats.get(path):
+                self._stats[path] = current
+                changed.add(path)
+        return changed
+
+    def _read_events(self) -> Set[str]:
+        changed = set()  # type: Set[str]
+        while True:
+            ready, _, _ = select.select([self._fd], [], [], 0)
+            if not ready:
+                return changed
+            try:
+                data = os.read(self._fd, 65536)
+            except OSError as e:
+                if e.errno == errno.EAGAIN:
+                    return changed
+                raise
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(
+                    data, offset
+                )
+                offset += _EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                directory = self._watches.get(wd)
+                if directory is None:
+                    continue
+                path = os.path.join(directory, name.decode("utf-8"))
+                if path in self.paths:
+                    changed.add(path)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
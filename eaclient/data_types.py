@@ -14,9 +14,11 @@
 
 import datetime
 import json
+import keyword
 import logging
 from enum import Enum
-from typing import Any, List, Optional, Type, TypeVar, Union
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Type, TypeVar, Union
 
 from eaclient import exceptions, messages, util
 
@@ -66,6 +68,8 @@ class DataValue:
     that returns the parsed value if appropriate.
     """
 
+    __slots__ = ()
+
     @staticmethod
     def from_value(val: Any) -> Any:
         return val
@@ -180,12 +184,29 @@ class DatetimeDataValue(DataValue):
         return val
 
 
+# from_value implementations that return values of exactly these types
+# unchanged, so callers can skip them for such values
+_EXACT_TYPES = {
+    StringDataValue.from_value: str,
+    IntDataValue.from_value: int,
+    FloatDataValue.from_value: float,
+    BoolDataValue.from_value: bool,
+    DatetimeDataValue.from_value: datetime.datetime,
+}
+
+# Values of these types are copied as is by to_dict
+_PLAIN_TYPES = frozenset(
+    (str, int, float, bool, type(None), datetime.datetime)
+)
+
+
 def data_list(data_cls: Type[DataValue]) -> Type[DataValue]:
     """
     To be used for parsing lists of a certain DataValue type.
     Returns a class that extends DataValue and validates that
     each item in a list is the correct type in its from_value.
     """
+    exact_type = _EXACT_TYPES.get(data_cls.from_value)
 
     class _DataList(DataValue):
         item_cls = data_cls
@@ -196,6 +217,11 @@ def data_list(data_cls: Type[DataValue]) -> Type[DataValue]:
                 raise IncorrectTypeError(
                     expected_type="list", got_type=type(val).__name__
                 )
+            # Lists of a single builtin type are checked in one go
+            if exact_type is not None and set(map(type, val)) <= {
+                exact_type
+            }:
+                return list(val)
             new_val = []
             for i, item in enumerate(val):
                 try:
@@ -211,6 +237,8 @@ def data_list_to_list(
     val: List[Union["DataObject", list, str, int, bool, Enum]],
     keep_none: bool = True,
 ) -> list:
+    if set(map(type, val)) <= _PLAIN_TYPES:
+        return list(val)
     new_val = []  # type: list
     for item in val:
         if isinstance(item, DataObject):
@@ -227,6 +255,10 @@ def data_list_to_list(
 class Field:
     """
     For defining the fields static property of a DataObject.
+
+    public says what the world-readable copy of a state file gets for the
+    field, see eaclient.files.projection: True to copy the value, False to
+    leave it out, or a function returning what to show instead.
     """
 
     def __init__(
@@ -236,6 +268,7 @@ class Field:
         required: bool = True,
         dict_key: Optional[str] = None,
         doc: Optional[str] = None,
+        public: Union[bool, Callable[[Any], Any]] = True,
     ):
         self.key = key
         self.data_cls = data_cls
@@ -245,12 +278,198 @@ class Field:
         else:
             self.dict_key = self.key
         self.doc = doc
+        self.public = public
 
 
 T = TypeVar("T", bound="DataObject")
 
+_MISSING = object()
 
-class DataObject(DataValue):
+
+def _field_slots(bases: tuple, namespace: dict) -> Optional[tuple]:
+    """
+    The __slots__ for a new DataObject class: the keys of its fields that
+    none of its bases has a slot for. None if a key can't be a slot, like
+    when the class body already uses that name.
+    """
+    inherited = set()
+    for base in bases:
+        for klass in base.__mro__:
+            inherited.update(klass.__dict__.get("__slots__", ()))
+    slots = []  # type: List[str]
+    for field in namespace.get("fields", ()):
+        key = field.key
+        if key in inherited or key in slots:
+            continue
+        if (
+            not key.isidentifier()
+            or keyword.iskeyword(key)
+            or key.startswith("__")
+            or key in namespace
+        ):
+            return None
+        slots.append(key)
+    return tuple(slots)
+
+
+class _DataObjectMeta(type):
+    """
+    Gives DataObject classes __slots__ for their fields, unless they
+    declare __slots__ themselves.
+    """
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        if "__slots__" not in namespace:
+            slots = _field_slots(bases, namespace)
+            if slots is not None:
+                namespace["__slots__"] = slots
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+
+def _missing_field_error(field: "Field") -> IncorrectFieldTypeError:
+    return IncorrectFieldTypeError(
+        err=IncorrectTypeError(
+            expected_type=field.data_cls.__name__,
+            got_type="null",
+        ),
+        key=field.dict_key,
+    )
+
+
+def _wrong_type_value(
+    field: "Field",
+    err: IncorrectTypeError,
+    optional_type_errors_become_null: bool,
+) -> None:
+    if not field.required and optional_type_errors_become_null:
+        LOG.warning(
+            "%s is wrong type (expected %s but got %s) but "
+            "considered optional - treating as null",
+            field.key,
+            err.expected_type,
+            err.got_type,
+        )
+        return None
+    raise IncorrectFieldTypeError(err=err, key=field.dict_key)
+
+
+def _to_plain_value(val: Any, keep_none: bool) -> Any:
+    if isinstance(val, DataObject):
+        return val.to_dict(keep_none)
+    elif isinstance(val, list):
+        return data_list_to_list(val, keep_none)
+    elif isinstance(val, Enum):
+        return val.value
+    # simple type, just copy
+    return val
+
+
+def _compile_codecs(cls: Type["DataObject"]) -> dict:
+    """
+    Generate from_dict, to_dict and __eq__ for cls, with the checks for
+    each of its fields spelled out instead of looked up from cls.fields
+    on every call.
+    """
+    namespace = {
+        "_MISSING": _MISSING,
+        "_PLAIN_TYPES": _PLAIN_TYPES,
+        "IncorrectTypeError": IncorrectTypeError,
+        "_missing_field_error": _missing_field_error,
+        "_wrong_type_value": _wrong_type_value,
+        "_to_plain_value": _to_plain_value,
+    }
+    from_dict = [
+        "def from_dict(cls, d, optional_type_errors_become_null=False):"
+    ]
+    to_dict = ["def to_dict(self, keep_none=True):", "    d = {}"]
+    eq = ["def __eq__(self, other):"]
+    kwargs = {}
+
+    for i, field in enumerate(cls.fields):
+        var = "v{}".format(i)
+        namespace["f{}".format(i)] = field
+        namespace["from_value{}".format(i)] = field.data_cls.from_value
+        dict_key = repr(field.dict_key)
+        key = repr(field.key)
+
+        if field.required:
+            from_dict += [
+                "    {} = d.get({}, _MISSING)".format(var, dict_key),
+                "    if {} is _MISSING:".format(var),
+                "        raise _missing_field_error(f{})".format(i),
+            ]
+        else:
+            from_dict.append("    {} = d.get({})".format(var, dict_key))
+        exact_type = _EXACT_TYPES.get(field.data_cls.from_value)
+        if exact_type is not None:
+            namespace["t{}".format(i)] = exact_type
+            from_dict.append(
+                "    if {0} is not None and {0}.__class__ is not t{1}:".format(
+                    var, i
+                )
+            )
+        else:
+            from_dict.append("    if {} is not None:".format(var))
+        from_dict += [
+            "        try:",
+            "            {0} = from_value{1}({0})".format(var, i),
+            "        except IncorrectTypeError as e:",
+            "            {0} = _wrong_type_value(".format(var),
+            "                f{}, e, optional_type_errors_become_null".format(
+                i
+            ),
+            "            )",
+        ]
+        kwargs[field.key] = var
+
+        to_dict += [
+            "    v = getattr(self, {}, None)".format(key),
+            "    if v.__class__ not in _PLAIN_TYPES:",
+            "        v = _to_plain_value(v, keep_none)",
+            "    if v is not None or keep_none:",
+            "        d[{}] = v".format(dict_key),
+        ]
+        eq += [
+            "    if getattr(self, {0}, None) != getattr(other, {0}, None):"
+            "".format(key),
+            "        return False",
+        ]
+
+    arguments = ", ".join(
+        "{}={}".format(key, var)
+        for key, var in kwargs.items()
+        if key.isidentifier() and not keyword.iskeyword(key)
+    )
+    others = ", ".join(
+        "{!r}: {}".format(key, var)
+        for key, var in kwargs.items()
+        if not key.isidentifier() or keyword.iskeyword(key)
+    )
+    if others:
+        arguments += "{}**{{{}}}".format(", " if arguments else "", others)
+    from_dict.append("    return cls({})".format(arguments))
+    to_dict.append("    return d")
+    eq.append("    return True")
+
+    filename = "<{} codecs>".format(cls.__qualname__)
+    source = "\n".join(from_dict + to_dict + eq)
+    exec(compile(source, filename, "exec"), namespace)
+    codecs = {}
+    for name in ("from_dict", "to_dict", "__eq__"):
+        func = namespace[name]
+        func.__qualname__ = "{}.{}".format(cls.__qualname__, name)
+        func.__module__ = cls.__module__
+        func._compiled_codec = True
+        codecs[name] = func
+    codecs["from_dict"] = classmethod(codecs["from_dict"])
+    return codecs
+
+
+def _is_compiled_codec(attr: Any) -> bool:
+    return getattr(getattr(attr, "__func__", attr), "_compiled_codec", False)
+
+
+class DataObject(DataValue, metaclass=_DataObjectMeta):
     """
     For defining a python object that can be parsed from a dict.
     Validates that a set of expected fields are present in the dict
@@ -266,10 +485,32 @@ class DataObject(DataValue):
            a. Example 1: Field("keyname", StringDataValue) -> keyname: str
            b. Example 2: Field("keyname", data_list(IntDataValue), required=False) -> keyname: Optional[List[int]]  # noqa: E501
       4. Use from_value or from_dict to parse a dict into the python object.
+
+    Each subclass gets __slots__ for its fields and its own from_dict,
+    to_dict and __eq__ generated from `fields` when it is created, so
+    `fields` must not change afterwards. The implementations below are the
+    reference the generated ones follow, and subclasses can still override
+    them.
     """
 
+    __slots__ = ()
+
     fields = []  # type: List[Field]
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        codecs = None
+        for name in ("from_dict", "to_dict", "__eq__"):
+            # Find where the class gets name from: keep hand written
+            # versions, replace DataObject's and generated ones
+            owner = next(k for k in cls.__mro__ if name in k.__dict__)
+            if owner is DataObject or _is_compiled_codec(
+                owner.__dict__[name]
+            ):
+                if codecs is None:
+                    codecs = _compile_codecs(cls)
+                setattr(cls, name, codecs[name])
+
     def __init__(self, **_kwargs):
         pass
 
@@ -290,18 +531,7 @@ class DataObject(DataValue):
         d = {}
         for field in self.fields:
             val = getattr(self, field.key, None)
-            new_val = None  # type: Any
-
-            if isinstance(val, DataObject):
-                new_val = val.to_dict(keep_none)
-            elif isinstance(val, list):
-                new_val = data_list_to_list(val, keep_none)
-            elif isinstance(val, Enum):
-                new_val = val.value
-            else:
-                # simple type, just copy
-                new_val = val
-
+            new_val = _to_plain_value(val, keep_none)
             if new_val is not None or keep_none:
                 d[field.dict_key] = new_val
         return d
@@ -323,32 +553,16 @@ class DataObject(DataValue):
                 val = d[field.dict_key]
             except KeyError:
                 if field.required:
-                    raise IncorrectFieldTypeError(
-                        err=IncorrectTypeError(
-                            expected_type=field.data_cls.__name__,
-                            got_type="null",
-                        ),
-                        key=field.dict_key,
-                    )
+                    raise _missing_field_error(field)
                 else:
                     val = None
             if val is not None:
                 try:
                     val = field.data_cls.from_value(val)
                 except IncorrectTypeError as e:
-                    if not field.required and optional_type_errors_become_null:
-                        LOG.warning(
-                            "%s is wrong type (expected %s but got %s) but "
-                            "considered optional - treating as null",
-                            field.key,
-                            e.expected_type,
-                            e.got_type,
-                        )
-                        val = None
-                    else:
-                        raise IncorrectFieldTypeError(
-                            err=e, key=field.dict_key
-                        )
+                    val = _wrong_type_value(
+                        field, e, optional_type_errors_become_null
+                    )
 
             kwargs[field.key] = val
         return cls(**kwargs)
@@ -374,3 +588,57 @@ class AttachActionsConfigFile(DataObject):
 
     def __init__(self, *, token: str):
         self.token = token
+
+
+@lru_cache(maxsize=None)
+def datetime_decode_plan(data_cls: Type[DataValue]) -> Any:
+    """
+    Describe where data_cls expects datetimes in its dict representation.
+
+    The plan is DatetimeDataValue for a datetime value, a one element list
+    holding the plan of the items of a list, or a dict mapping dict keys of
+    a DataObject to the plans of its fields. Parts without any datetimes are
+    left out, and None is returned if there are none at all.
+    """
+    if issubclass(data_cls, DatetimeDataValue):
+        return DatetimeDataValue
+    item_cls = getattr(data_cls, "item_cls", None)
+    if item_cls is not None:
+        item_plan = datetime_decode_plan(item_cls)
+        return None if item_plan is None else [item_plan]
+    if issubclass(data_cls, DataObject):
+        plan = {}
+        for field in data_cls.fields:
+            field_plan = datetime_decode_plan(field.data_cls)
+            if field_plan is not None:
+                plan[field.dict_key] = field_plan
+        return plan or None
+    return None
+
+
+def decode_datetimes(value: Any, plan: Any) -> Any:
+    """
+    Parse the datetime strings that plan points to in value.
+
+    Containers are updated in place. Strings that aren't valid datetimes
+    are kept, so from_value reports them as the wrong type.
+    """
+    if plan is None:
+        return value
+    if plan is DatetimeDataValue:
+        if isinstance(value, str):
+            try:
+                return util.parse_rfc3339_date(value)
+            except ValueError:
+                return value
+        return value
+    if isinstance(plan, list):
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                value[i] = decode_datetimes(item, plan[0])
+        return value
+    if isinstance(value, dict):
+        for key, field_plan in plan.items():
+            if key in value:
+                value[key] = decode_datetimes(value[key], field_plan)
+    return value
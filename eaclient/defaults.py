@@ -45,6 +45,7 @@ DEFAULT_PRIVATE_MACHINE_TOKEN_PATH = os.path.join(
 DEFAULT_PRIVATE_DATA_DIR = os.path.join(DEFAULT_DATA_DIR, PRIVATE_SUBDIR)
 MESSAGES_DIR = os.path.join(DEFAULT_DATA_DIR, MESSAGES_SUBDIR)
 INTERFACE_FILES_DIR = os.path.join(DEFAULT_DATA_DIR, INTERFACE_FILES_SUBDIR)
+DAEMON_SOCKET_PATH = os.path.join(EAC_RUN_PATH, "daemon.sock")
 DEFAULT_CONFIG_FILE = os.path.join(EAC_ETC_PATH, CONFIG_FILE)
 DEFAULT_LOG_PREFIX = os.path.join(DEFAULT_LOG_DIR, DEFAULT_LOG_FILE_BASE_NAME)
 ESM_APT_ROOTDIR = os.path.join(DEFAULT_DATA_DIR, PRIVATE_ELXR_CACHE_SUBDIR)
@@ -64,6 +65,14 @@ CONFIG_DEFAULTS = {
     "log_file": "{}.log".format(DEFAULT_LOG_PREFIX),
 }
 
+# Records waiting for the log writer thread with log_async
+DEFAULT_LOG_QUEUE_SIZE = 10000
+# The log file is rotated at this size, keeping this many archives
+DEFAULT_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_LOG_BACKUP_COUNT = 5
+# Records below log_disk_level kept in memory in case the command fails
+DEFAULT_LOG_BUFFER_SIZE = 5000
+
 CONFIG_FIELD_ENVVAR_ALLOWLIST = [
     "ea_data_dir",
     "ea_log_file",
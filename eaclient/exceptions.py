@@ -299,6 +299,17 @@ class CLIAttachTokenArgORConfigRequired(ELxrProError):
     _msg = messages.E_ATTACH_TOKEN_ARG_OR_CONFIG_REQUIRED
 
 
+class CachedContractTestError(ELxrProError):
+    """Replay of a failure recorded by a previous contract test."""
+
+    def __init__(
+        self, error_code: str, error_msg: str, exit_code: int = 1
+    ) -> None:
+        super().__init__()
+        self.named_msg = messages.NamedMessage(error_code, error_msg)
+        self.exit_code = exit_code
+
+
 ###############################################################################
 #                               MISCELLANEOUS                                 #
 ###############################################################################
@@ -14,13 +14,15 @@
 
 import json
 from enum import Enum
-from typing import Callable, Dict, Generic, Optional, Type, TypeVar
-
-from eaclient import exceptions
-from eaclient.data_types import DataObject
+from typing import Any, Callable, Dict, Generic, Optional, Type, TypeVar
+
+from eaclient import exceptions, yaml
+from eaclient.data_types import (
+    DataObject,
+    datetime_decode_plan,
+    decode_datetimes,
+)
 from eaclient.files.files import EAFile
-from eaclient.util import DatetimeAwareJSONDecoder
-from eaclient.yaml import parser as yaml_parser
 from eaclient.yaml import safe_dump, safe_load
 
 
@@ -48,40 +50,53 @@ class DataObjectFile(Generic[DOFType]):
         self.optional_type_errors_become_null = (
             optional_type_errors_become_null
         )
+        # The last content read and what it parsed to. EAFile.read returns
+        # the same string while the file is unchanged, so this is usually
+        # an identity check
+        self._parsed = (None, None)
 
     def read(self) -> Optional[DOFType]:
         raw_data = self.ea_file.read()
         if raw_data is None:
             return None
 
+        last_raw_data, parsed_data = self._parsed
+        if raw_data != last_raw_data:
+            parsed_data = self._parse(raw_data)
+            self._parsed = (raw_data, parsed_data)
+        if parsed_data is None:
+            return None
+
+        # Build a new object every time, callers are free to modify it
+        return self.data_object_cls.from_dict(
+            parsed_data,
+            optional_type_errors_become_null=self.optional_type_errors_become_null,  # noqa: E501
+        )
+
+    def _parse(self, raw_data: str) -> Any:
         parsed_data = None
         if self.file_format == DataObjectFileFormat.JSON:
             try:
-                parsed_data = json.loads(
-                    raw_data, cls=DatetimeAwareJSONDecoder
-                )
+                parsed_data = json.loads(raw_data)
             except json.JSONDecodeError:
                 raise exceptions.InvalidFileFormatError(
                     file_name=self.ea_file.path, file_format="json"
                 )
+            # Only fields declared as datetimes are parsed as such
+            parsed_data = decode_datetimes(
+                parsed_data, datetime_decode_plan(self.data_object_cls)
+            )
         elif self.file_format == DataObjectFileFormat.YAML:
             try:
                 parsed_data = safe_load(raw_data)
-            except yaml_parser.ParserError:
+            except yaml.parser.ParserError:
                 raise exceptions.InvalidFileFormatError(
                     file_name=self.ea_file.path, file_format="yaml"
                 )
 
-        if parsed_data is None:
-            return None
-
-        if self.preprocess_data:
+        if parsed_data is not None and self.preprocess_data:
             parsed_data = self.preprocess_data(parsed_data)
-
-        return self.data_object_cls.from_dict(
-            parsed_data,
-            optional_type_errors_become_null=self.optional_type_errors_become_null,  # noqa: E501
-        )
+        return parsed_data
 
     def write(self, content: DOFType):
         if self.file_format == DataObjectFileFormat.JSON:
@@ -15,9 +15,15 @@
 import json
 import logging
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Type
 
 from eaclient import defaults, event_logger, exceptions, system, util
+from eaclient.data_types import (
+    DataObject,
+    datetime_decode_plan,
+    decode_datetimes,
+)
+from eaclient.files import read_cache, state_store
 
 event = event_logger.get_event_logger()
 LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
@@ -45,14 +51,30 @@ class EAFile:
 
     @property
     def is_present(self):
-        return os.path.exists(self.path)
+        located = state_store.locate(self.path)
+        if located is not None:
+            store, key = located
+            found, content = store.read(key)
+            if found:
+                return content is not None
+        return system.file_exists(self.path)
 
     def write(self, content: str):
+        located = state_store.locate(self.path)
+        if located is not None:
+            store, key = located
+            store.write(key, self, content)
+        else:
+            self.write_file(content)
+
+    def write_file(self, content: str):
+        """Write content to the file itself, bypassing any state store."""
         file_mode = (
             defaults.ROOT_READABLE_MODE
             if self.is_private
             else defaults.WORLD_READABLE_MODE
         )
+        read_cache.invalidate(self.path)
         # try/except-ing here avoids race conditions the best
         try:
             if os.path.basename(self._directory) == defaults.PRIVATE_SUBDIR:
@@ -65,23 +87,57 @@ class EAFile:
         system.write_file(self.path, content, file_mode)
 
     def read(self) -> Optional[str]:
+        located = state_store.locate(self.path)
+        if located is not None:
+            store, key = located
+            found, content = store.read(key)
+            if found:
+                if content is None:
+                    LOG.debug(
+                        "Tried to load %s but it was deleted", self.path
+                    )
+                return content
+
         content = None
         try:
-            content = system.load_file(self.path)
+            content = read_cache.cached(
+                self.path, "text", lambda: system.load_file(self.path)
+            )
         except FileNotFoundError:
             LOG.debug("Tried to load %s but file does not exist", self.path)
         return content
 
     def delete(self):
+        located = state_store.locate(self.path)
+        if located is not None:
+            store, key = located
+            store.write(key, self, None)
+        else:
+            self.delete_file()
+
+    def delete_file(self):
+        """Remove the file itself, bypassing any state store."""
+        read_cache.invalidate(self.path)
         system.ensure_file_absent(self.path)
 
 
 class ProJSONFile:
+    """
+    A json file read into plain dicts and lists.
+
+    :param pro_file: the underlying file.
+    :param schema: optional DataObject describing the content. When given,
+        only the fields it declares as datetimes are parsed as datetimes,
+        otherwise any string that looks like a datetime is.
+    """
+
     def __init__(
         self,
         pro_file: EAFile,
+        schema: Optional[Type[DataObject]] = None,
     ):
         self.pro_file = pro_file
+        self.schema = schema
 
     def write(self, content: Dict[str, Any]):
         self.pro_file.write(
@@ -93,6 +149,10 @@ class ProJSONFile:
 
         if content:
             try:
+                if self.schema is not None:
+                    return decode_datetimes(
+                        json.loads(content), datetime_decode_plan(self.schema)
+                    )
                 return json.loads(content, cls=util.DatetimeAwareJSONDecoder)
             except json.JSONDecodeError as e:
                 raise exceptions.InvalidJson(
@@ -13,13 +13,51 @@
 # limitations under the License.
 
 import json
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional
 
-from eaclient import defaults, exceptions, util
+from eaclient import defaults, exceptions, system, util
 from eaclient.contract_data_types import PublicMachineTokenData
+from eaclient.files import projection
 from eaclient.files.files import EAFile
 
-_machine_token_file = None
+_machine_token_files = {}  # type: Dict[str, MachineTokenFile]
+
+# PublicMachineTokenData only declares the public fields, anything else
+# in the token stays in the private file
+_PROJECTION = projection.Projection(PublicMachineTokenData, keep_none=False)
+
+
+class EntitlementIndex:
+    """
+    Read-only view of the resources of a machine token, indexed by
+    entitlement type.
+
+    As in get_entitlements_from_token, the last resource of a type wins.
+    """
+
+    def __init__(self, resources: Optional[Iterable[Any]] = None):
+        by_type = {}  # type: Dict[str, Mapping[str, Any]]
+        for resource in resources or ():
+            if isinstance(resource, dict):
+                by_type[resource.get("type")] = MappingProxyType(
+                    dict(resource)
+                )
+
+        self.by_type = MappingProxyType(by_type)
+        # The shape entitlements() has always returned
+        self.entitlements = MappingProxyType(
+            {
+                name: MappingProxyType({"entitlement": entitlement})
+                for name, entitlement in by_type.items()
+            }
+        )
+
+    def __len__(self):
+        return len(self.by_type)
+
+    def get(self, name: str) -> Optional[Mapping[str, Any]]:
+        return self.by_type.get(name)
 
 
 class MachineTokenFile:
@@ -33,51 +71,53 @@ class MachineTokenFile:
         )
         self.public_file = EAFile(file_name, directory, False)
         self._machine_token = None  # type: Optional[Dict[str, Any]]
-        self._entitlements = None
+        self._raw = None  # type: Optional[str]
+        self._index = None  # type: Optional[EntitlementIndex]
+        self._index_token = None  # type: Optional[Dict[str, Any]]
         self._contract_expiry_datetime = None
 
     def write(self, private_content: dict):
         """Update the machine_token file for both pub/private files"""
         if util.we_are_currently_root():
-            private_content_str = json.dumps(
+            private_content_str, public_content_str = _PROJECTION.dumps(
                 private_content, cls=util.DatetimeAwareJSONEncoder
             )
-            self.private_file.write(private_content_str)
-
-            # PublicMachineTokenData only has public fields defined and
-            # ignores all other (private) fields in from_dict
-            public_content = PublicMachineTokenData.from_dict(
-                private_content
-            ).to_dict(keep_none=False)
-            public_content_str = json.dumps(
-                public_content, cls=util.DatetimeAwareJSONEncoder
+            projection.write_views(
+                self.private_file,
+                self.public_file,
+                private_content_str,
+                public_content_str,
             )
-            self.public_file.write(public_content_str)
 
-            self._machine_token = None
-            self._entitlements = None
-            self._contract_expiry_datetime = None
+            self._forget()
         else:
             raise exceptions.NonRootUserError()
 
     def delete(self):
         """Delete both pub and private files"""
         if util.we_are_currently_root():
-            self.public_file.delete()
-            self.private_file.delete()
+            with system.write_batch():
+                self.public_file.delete()
+                self.private_file.delete()
 
-            self._machine_token = None
-            self._entitlements = None
-            self._contract_expiry_datetime = None
+            self._forget()
         else:
             raise exceptions.NonRootUserError()
 
-    def read(self) -> Optional[dict]:
+    def _forget(self):
+        self._machine_token = None
+        self._raw = None
+        self._index = None
+        self._index_token = None
+        self._contract_expiry_datetime = None
+
+    def _read_raw(self) -> Optional[str]:
         if util.we_are_currently_root():
-            file_handler = self.private_file
-        else:
-            file_handler = self.public_file
-        content = file_handler.read()
+            return self.private_file.read()
+        return self.public_file.read()
+
+    def read(self) -> Optional[dict]:
+        content = self._read_raw()
         if not content:
             return None
         try:
@@ -95,22 +135,37 @@ class MachineTokenFile:
 
     @property
     def machine_token(self):
-        """Return the machine-token if cached in the machine token response."""
-        if not self._machine_token:
-            content = self.read()
-            self._machine_token = content
+        """
+        Return the machine-token, parsed again only when the file changed.
+
+        EAFile.read keeps returning the same string while the file is
+        unchanged, so comparing identities is enough to tell.
+        """
+        raw = self._read_raw()
+        if self._machine_token is None or raw is not self._raw:
+            self._machine_token = self.read()
+            self._raw = raw
         return self._machine_token
 
+    @property
+    def entitlement_index(self) -> EntitlementIndex:
+        """The EntitlementIndex of the current machine-token."""
+        machine_token = self.machine_token
+        if self._index is None or machine_token is not self._index_token:
+            resources = None
+            if isinstance(machine_token, dict):
+                resources = machine_token.get("resources")
+            self._index = EntitlementIndex(resources)
+            self._index_token = machine_token
+        return self._index
+
     def entitlements(self, series: Optional[str] = None):
-        """Return configured entitlements keyed by entitlement named"""
-        if self._entitlements:
-            return self._entitlements
-        if not self.machine_token:
-            return {}
-        self._entitlements = self.get_entitlements_from_token(
-            self.machine_token, series
-        )
-        return self._entitlements
+        """
+        Return configured entitlements keyed by entitlement named, as a
+        read-only mapping. The entitlements of a token are the same for
+        every series; series is only kept for existing callers.
+        """
+        return self.entitlement_index.entitlements
 
     @staticmethod
     def get_entitlements_from_token(
@@ -156,13 +211,19 @@ class MachineTokenFile:
 
 
 def get_machine_token_file(cfg=None) -> MachineTokenFile:
+    """Return the MachineTokenFile for the data_dir of cfg.
+
+    Instances are shared per data_dir, so every caller working on the same
+    configuration sees the same cached machine token.
+    """
     from eaclient.config import EAConfig
 
-    global _machine_token_file
+    if not cfg:
+        cfg = EAConfig()
 
-    if not _machine_token_file:
-        if not cfg:
-            cfg = EAConfig()
-        _machine_token_file = MachineTokenFile(directory=cfg.data_dir)
+    machine_token_file = _machine_token_files.get(cfg.data_dir)
+    if machine_token_file is None:
+        machine_token_file = MachineTokenFile(directory=cfg.data_dir)
+        _machine_token_files[cfg.data_dir] = machine_token_file
 
-    return _machine_token_file
+    return machine_token_file
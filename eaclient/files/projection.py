@@ -0,0 +1,127 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Private and public copies of a state file from a single traversal.
+
+State files with secrets are written twice: the whole content under
+private/, readable by root only, and a copy everyone can read. What the
+public copy gets is declared with Field(public=...) on the DataObject
+describing the file:
+
+- True, the default: the value as is.
+- False: nothing, the field is left out.
+- a function: what it returns for the value.
+
+Fields holding a DataObject, or a list of them, are projected with that
+DataObject's own declarations. Keys that aren't declared fields are never
+public.
+"""
+
+import json
+from typing import Any, Dict, Tuple, Type
+
+from eaclient import system
+from eaclient.data_types import DataObject, _to_plain_value
+from eaclient.files import state_store
+from eaclient.files.files import EAFile
+
+
+class Projection:
+    """
+    :param data_object_cls: the DataObject whose fields declare what is
+        public.
+    :param keep_none: whether public fields without a value are kept as
+        null in the public copy.
+    """
+
+    def __init__(
+        self, data_object_cls: Type[DataObject], keep_none: bool = True
+    ):
+        self.data_object_cls = data_object_cls
+        self.keep_none = keep_none
+        self._fields = []
+        for field in data_object_cls.fields:
+            item_cls = getattr(field.data_cls, "item_cls", field.data_cls)
+            nested = None
+            if isinstance(item_cls, type) and issubclass(item_cls, DataObject):
+                nested = Projection(item_cls, keep_none)
+            self._fields.append(
+                (field.key, field.dict_key, field.public, nested)
+            )
+
+    def _public_value(self, rule: Any, nested: Any, value: Any) -> Any:
+        if value is None:
+            return None
+        if nested is not None:
+            return nested.public(value)
+        if callable(rule):
+            return rule(value)
+        return value
+
+    def public(self, content: Any) -> Any:
+        """The public copy of content, a dict or a list of them."""
+        if isinstance(content, list):
+            return [self.public(item) for item in content]
+        if not isinstance(content, dict):
+            return None
+        public = {}
+        for _, dict_key, rule, nested in self._fields:
+            if rule is False or dict_key not in content:
+                continue
+            value = self._public_value(rule, nested, content[dict_key])
+            if value is not None or self.keep_none:
+                public[dict_key] = value
+        return public
+
+    def split(self, content: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Return the private and the public dict for content, either a dict,
+        which is private as is, or an instance of data_object_cls.
+        """
+        if not isinstance(content, DataObject):
+            return content, self.public(content)
+        private = {}
+        public = {}
+        for key, dict_key, rule, nested in self._fields:
+            value = _to_plain_value(getattr(content, key, None), True)
+            private[dict_key] = value
+            if rule is False:
+                continue
+            value = self._public_value(rule, nested, value)
+            if value is not None or self.keep_none:
+                public[dict_key] = value
+        return private, public
+
+    def dumps(self, content: Any, **kwargs) -> Tuple[str, str]:
+        """Split content and serialize both dicts with json.dumps."""
+        private, public = self.split(content)
+        return json.dumps(private, **kwargs), json.dumps(public, **kwargs)
+
+
+def write_views(
+    private_file: EAFile,
+    public_file: EAFile,
+    private_content: str,
+    public_content: str,
+):
+    """
+    Write the private and public copy of a state file so that either both
+    are updated or neither is.
+    """
+    with system.write_batch(), state_store.transaction_for(
+        private_file.path
+    ):
+        private_file.write(private_content)
+        public_file.write(public_content)
@@ -0,0 +1,64 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-process cache of what was read from files, validated by stat.
+
+An entry is only used while the file still has the inode, size and
+modification time it had when the entry was stored, so files replaced or
+edited by other processes are read again. Writes through EAFile drop the
+entries for their file right away.
+"""
+
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from eaclient import system
+
+# path -> kind of content -> (stat signature, content)
+_entries = {}
+
+
+def _signature(path: str) -> Optional[Tuple]:
+    try:
+        st = system.stat_file(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_dev, st.st_size, st.st_mtime_ns)
+
+
+def cached(path: str, kind: Hashable, load: Callable[[], Any]) -> Any:
+    """
+    Return what load returned for path, calling it again only if path
+    changed since. kind tells apart different things read from the same
+    file, like its text and the objects parsed from it.
+    """
+    signature = _signature(path)
+    if signature is None:
+        return load()
+    entry = _entries.get(path, {}).get(kind)
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+    # If the file changes while it is loaded the entry is stored with the
+    # older signature, so it is read again next time
+    content = load()
+    _entries.setdefault(path, {})[kind] = (signature, content)
+    return content
+
+
+def invalidate(path: str):
+    _entries.pop(path, None)
+
+
+def clear():
+    _entries.clear()
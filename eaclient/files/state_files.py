@@ -13,16 +13,22 @@
 # limitations under the License.
 
 import datetime
+import os
+from typing import Optional
 
 from eaclient import defaults
 from eaclient.data_types import (
+    BoolDataValue,
     DataObject,
     DatetimeDataValue,
     Field,
+    FloatDataValue,
+    IntDataValue,
+    StringDataValue,
 )
 
 from eaclient.files.data_types import DataObjectFile, DataObjectFileFormat
-from eaclient.files.files import EAFile
+from eaclient.files.files import EAFile, ProJSONFile
 
 
 class AttachmentData(DataObject):
@@ -48,6 +54,71 @@ machine_id_file = EAFile(
 )
 
 
-def delete_state_files():
+class ContractTestResultData(DataObject):
+    fields = [
+        Field("tested_at", DatetimeDataValue),
+        Field("success", BoolDataValue),
+        Field("machine_id", StringDataValue),
+        Field("latency", FloatDataValue),
+        Field("exit_code", IntDataValue),
+        Field("token_hash", StringDataValue, required=False),
+        Field("machine_id_match", BoolDataValue, required=False),
+        Field("http_code", IntDataValue, required=False),
+        Field("error_code", StringDataValue, required=False),
+        Field("error_msg", StringDataValue, required=False),
+    ]
+
+    def __init__(
+        self,
+        tested_at: datetime.datetime,
+        success: bool,
+        machine_id: str,
+        latency: float,
+        exit_code: int,
+        token_hash: Optional[str] = None,
+        machine_id_match: Optional[bool] = None,
+        http_code: Optional[int] = None,
+        error_code: Optional[str] = None,
+        error_msg: Optional[str] = None,
+    ):
+        self.tested_at = tested_at
+        self.success = success
+        self.machine_id = machine_id
+        self.latency = latency
+        self.exit_code = exit_code
+        self.token_hash = token_hash
+        self.machine_id_match = machine_id_match
+        self.http_code = http_code
+        self.error_code = error_code
+        self.error_msg = error_msg
+
+
+def contract_test_result_file(
+    data_dir: str = defaults.DEFAULT_DATA_DIR,
+) -> DataObjectFile[ContractTestResultData]:
+    return DataObjectFile(
+        ContractTestResultData,
+        EAFile(
+            "contract-test.json",
+            os.path.join(data_dir, defaults.PRIVATE_SUBDIR),
+            private=True,
+        ),
+        DataObjectFileFormat.JSON,
+        optional_type_errors_become_null=True,
+    )
+
+
+def status_file(data_dir: str = defaults.DEFAULT_DATA_DIR) -> ProJSONFile:
+    return ProJSONFile(
+        EAFile(
+            "status.json",
+            os.path.join(data_dir, defaults.INTERFACE_FILES_SUBDIR),
+            private=False,
+        )
+    )
+
+
+def delete_state_files(data_dir: str = defaults.DEFAULT_DATA_DIR):
     machine_id_file.delete()
     attachment_data_file.delete()
+    contract_test_result_file(data_dir).delete()
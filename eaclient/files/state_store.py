@@ -0,0 +1,247 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Optional SQLite backend for the state files in data_dir.
+
+With `state_backend: sqlite` in eaclient.conf, the content of every EAFile
+under data_dir is kept in private/state.db. The database is the source of
+truth for root: reads are served from it and writes inside transaction()
+are committed together. After each commit the affected files are
+regenerated from it, so the JSON files stay available to non-root users
+and to anything else reading them directly.
+
+The database uses write-ahead logging, so readers in other processes never
+block a writer, nor the other way round.
+"""
+
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from eaclient import defaults, system, util
+
+LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
+
+STATE_BACKEND_FILES = "files"
+STATE_BACKEND_SQLITE = "sqlite"
+STATE_BACKENDS = (STATE_BACKEND_FILES, STATE_BACKEND_SQLITE)
+STATE_DB_FILE = "state.db"
+
+# Seconds to wait for another process holding the write lock
+BUSY_TIMEOUT = 10.0
+
+_stores = {}  # type: Dict[str, StateStore]
+
+
+class StateStore:
+    """
+    Content of the files under data_dir, keyed by their path relative to
+    data_dir. A key that was deleted is kept with no content, so it isn't
+    looked up on disk again; keys never written are.
+    """
+
+    def __init__(self, data_dir: str):
+        self.data_dir = os.path.abspath(data_dir)
+        self.path = os.path.join(
+            self.data_dir, defaults.PRIVATE_SUBDIR, STATE_DB_FILE
+        )
+        self._conn = None  # type: Optional[sqlite3.Connection]
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._rows = {}  # type: Dict[str, Optional[str]]
+        self._data_version = None  # type: Optional[int]
+
+    def key(self, path: str) -> Optional[str]:
+        """The key for path, or None if it is outside data_dir."""
+        path = os.path.abspath(path)
+        if not path.startswith(self.data_dir + os.sep):
+            return None
+        return os.path.relpath(path, self.data_dir)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+            old_umask = os.umask(0o077)
+            try:
+                conn = sqlite3.connect(
+                    self.path,
+                    timeout=BUSY_TIMEOUT,
+                    isolation_level=None,
+                    check_same_thread=False,
+                )
+            finally:
+                os.umask(old_umask)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS state_files "
+                "(name TEXT PRIMARY KEY, content TEXT)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _committed(self) -> Dict[str, Optional[str]]:
+        # data_version only changes when another connection commits, our
+        # own commits update the rows directly
+        conn = self._connect()
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._rows = dict(
+                conn.execute("SELECT name, content FROM state_files")
+            )
+            self._data_version = data_version
+        return self._rows
+
+    @property
+    def _pending(self) -> Optional[Dict[str, Tuple[Any, Optional[str]]]]:
+        return getattr(self._local, "pending", None)
+
+    def read(self, key: str) -> Tuple[bool, Optional[str]]:
+        """
+        Return whether key is known and its content, which is None if it
+        was deleted.
+        """
+        pending = self._pending
+        if pending is not None and key in pending:
+            return True, pending[key][1]
+        with self._lock:
+            rows = self._committed()
+        if key in rows:
+            return True, rows[key]
+        return False, None
+
+    def write(self, key: str, ea_file: Any, content: Optional[str]):
+        """
+        Store content for key, None deletes it. ea_file is the EAFile to
+        regenerate from it once committed.
+        """
+        pending = self._pending
+        if pending is not None:
+            pending[key] = (ea_file, content)
+        else:
+            self._commit({key: (ea_file, content)})
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Commit all writes of this thread inside the block at once, or none
+        of them if it raises. Nested blocks join the outer one.
+        """
+        if self._pending is not None:
+            yield self
+            return
+        self._local.pending = {}
+        try:
+            yield self
+            changes = self._pending
+        finally:
+            self._local.pending = None
+        if changes:
+            self._commit(changes)
+
+    def _commit(self, changes: Dict[str, Tuple[Any, Optional[str]]]):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO state_files (name, content) "
+                    "VALUES (?, ?)",
+                    [(key, content) for key, (_, content) in changes.items()],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            rows = self._committed()
+            for key, (_, content) in changes.items():
+                rows[key] = content
+        LOG.debug("Committed %s to %s", ", ".join(sorted(changes)), self.path)
+
+        with system.write_batch():
+            for ea_file, content in changes.values():
+                if content is None:
+                    ea_file.delete_file()
+                else:
+                    ea_file.write_file(content)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._data_version = None
+
+
+def configure(cfg) -> Optional[StateStore]:
+    """
+    Route the state files under cfg.data_dir through a StateStore if
+    cfg.state_backend asks for it, or back to plain files otherwise.
+    """
+    data_dir = os.path.abspath(cfg.data_dir)
+    if cfg.state_backend != STATE_BACKEND_SQLITE:
+        store = _stores.pop(data_dir, None)
+        if store is not None:
+            store.close()
+        return None
+    store = _stores.get(data_dir)
+    if store is None:
+        store = StateStore(data_dir)
+        _stores[data_dir] = store
+    return store
+
+
+def locate(path: str) -> Optional[Tuple[StateStore, str]]:
+    """
+    Return the store path belongs to and its key in it, if any. Only root
+    can read the database; everyone else uses the files.
+    """
+    if not _stores or not util.we_are_currently_root():
+        return None
+    for store in _stores.values():
+        key = store.key(path)
+        if key is not None:
+            return store, key
+    return None
+
+
+@contextlib.contextmanager
+def transaction(cfg):
+    """
+    Commit the state written inside the block at once when cfg uses the
+    sqlite backend. With plain files each write is applied as it happens.
+    """
+    store = _stores.get(os.path.abspath(cfg.data_dir))
+    if store is None or not util.we_are_currently_root():
+        yield None
+        return
+    with store.transaction():
+        yield store
+
+
+@contextlib.contextmanager
+def transaction_for(path: str):
+    """
+    Like transaction, for the store path belongs to, if it has one.
+    """
+    located = locate(path)
+    if located is None:
+        yield None
+        return
+    store, _ = located
+    with store.transaction():
+        yield store
@@ -12,16 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
 import mock
 import pytest
 
 from eaclient import exceptions
 from eaclient.data_types import (
     DataObject,
+    DatetimeDataValue,
     Field,
     IncorrectFieldTypeError,
     IntDataValue,
     StringDataValue,
+    data_list,
 )
 from eaclient.files.data_types import DataObjectFile, DataObjectFileFormat
 
@@ -55,6 +59,28 @@ class TestData(DataObject):
         self.nested = nested
 
 
+class EventData(DataObject):
+    fields = [
+        Field("name", StringDataValue),
+        Field("at", DatetimeDataValue),
+    ]
+
+    def __init__(self, name: str, at: datetime.datetime):
+        self.name = name
+        self.at = at
+
+
+class HistoryData(DataObject):
+    fields = [
+        Field("label", StringDataValue),
+        Field("events", data_list(EventData)),
+    ]
+
+    def __init__(self, label: str, events):
+        self.label = label
+        self.events = events
+
+
 class TestDataObjectFile:
     def test_write_valid_json(self):
         mock_file = MockEAFile()
@@ -136,3 +162,28 @@ class TestDataObjectFile:
         mock_file.read.return_value = """nested": {"""
         with pytest.raises(exceptions.InvalidFileFormatError):
             dof.read()
+
+    def test_read_only_parses_declared_datetimes(self):
+        mock_file = MockEAFile()
+        dof = DataObjectFile(HistoryData, mock_file)
+        mock_file.read.return_value = (
+            '{"label": "2001-02-03T04:05:06Z", "events": ['
+            '{"name": "2001-02-03T04:05:06Z", "at": "2001-02-03T04:05:06Z"}'
+            "]}"
+        )
+        do = dof.read()
+        assert "2001-02-03T04:05:06Z" == do.label
+        assert "2001-02-03T04:05:06Z" == do.events[0].name
+        assert (
+            datetime.datetime(
+                2001, 2, 3, 4, 5, 6, tzinfo=datetime.timezone.utc
+            )
+            == do.events[0].at
+        )
+
+    def test_read_invalid_datetime(self):
+        mock_file = MockEAFile()
+        dof = DataObjectFile(EventData, mock_file)
+        mock_file.read.return_value = '{"name": "a", "at": "yesterday"}'
+        with pytest.raises(IncorrectFieldTypeError):
+            dof.read()
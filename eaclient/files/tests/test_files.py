@@ -12,14 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
 import os
 import stat
 
 import mock
+import pytest
 
 from eaclient import system
-from eaclient.files.files import EAFile
+from eaclient.files.files import EAFile, ProJSONFile
 from eaclient.files.machine_token import MachineTokenFile
+from eaclient.files.state_files import AttachmentData
 
 
 class TestEAFile:
@@ -45,6 +48,31 @@ class TestEAFile:
         )
 
 
+class TestProJSONFile:
+    @pytest.mark.parametrize(
+        "schema,expected_other",
+        (
+            (
+                None,
+                datetime.datetime(2002, 1, 1, tzinfo=datetime.timezone.utc),
+            ),
+            (AttachmentData, "2002-01-01T00:00:00Z"),
+        ),
+    )
+    def test_read_datetimes(self, schema, expected_other, tmpdir):
+        json_file = ProJSONFile(EAFile("test.json", tmpdir.strpath), schema)
+        json_file.pro_file.write(
+            '{"attached_at": "2001-01-01T00:00:00Z",'
+            ' "other": "2002-01-01T00:00:00Z"}'
+        )
+        assert {
+            "attached_at": datetime.datetime(
+                2001, 1, 1, tzinfo=datetime.timezone.utc
+            ),
+            "other": expected_other,
+        } == json_file.read()
+
+
 class TestMachineTokenFile:
     def test_deleting(self, tmpdir):
         token_file = MachineTokenFile(
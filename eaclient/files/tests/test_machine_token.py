@@ -12,7 +12,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from eaclient.files.machine_token import MachineTokenFile
+import json
+
+import mock
+import pytest
+
+from eaclient.files import read_cache
+from eaclient.files.machine_token import EntitlementIndex, MachineTokenFile
+
+RESOURCES = [
+    {
+        "type": "elxr-pro",
+        "uri": "https://repo.example.com/elxr-pro",
+        "login": "user",
+        "password": "passwd",
+    },
+    {
+        "type": "elxr-pro-fips",
+        "uri": "https://repo.example.com/elxr-pro/fips/",
+    },
+    {
+        "type": "elxr-pro-esm",
+        "uri": "http://esm.example.com:8080/",
+    },
+    {"type": "no-uri"},
+]
 
 
 class TestEntitlements:
@@ -50,3 +74,53 @@ class TestEntitlements:
             },
         }
         assert expected == machine_token_file.entitlements()
+
+    @mock.patch("eaclient.util.we_are_currently_root", return_value=False)
+    def test_machine_token_read_again_only_when_file_changes(
+        self, _m_root, tmpdir
+    ):
+        read_cache.clear()
+        machine_token_file = MachineTokenFile(directory=tmpdir.strpath)
+        assert machine_token_file.machine_token is None
+        assert {} == machine_token_file.entitlements()
+
+        machine_token_file.public_file.write(
+            json.dumps({"machineId": "abcd", "resources": RESOURCES})
+        )
+        token = machine_token_file.machine_token
+        assert "abcd" == token["machineId"]
+        index = machine_token_file.entitlement_index
+        assert 4 == len(index)
+
+        with mock.patch("json.loads") as m_loads:
+            assert token is machine_token_file.machine_token
+            assert index is machine_token_file.entitlement_index
+        assert 0 == m_loads.call_count
+
+        machine_token_file.public_file.write(json.dumps({}))
+        assert {} == machine_token_file.machine_token
+        assert 0 == len(machine_token_file.entitlement_index)
+
+
+class TestEntitlementIndex:
+    def test_lookups(self):
+        index = EntitlementIndex(RESOURCES)
+
+        assert "passwd" == index.get("elxr-pro")["password"]
+        assert None is index.get("missing")
+
+    def test_is_read_only(self):
+        index = EntitlementIndex(RESOURCES)
+
+        with pytest.raises(TypeError):
+            index.by_type["new"] = {}
+        with pytest.raises(TypeError):
+            index.get("elxr-pro")["uri"] = "https://elsewhere"
+        with pytest.raises(TypeError):
+            index.entitlements["elxr-pro"]["entitlement"] = {}
+
+    def test_empty(self):
+        index = EntitlementIndex(None)
+
+        assert 0 == len(index)
+        assert {} == index.entitlements
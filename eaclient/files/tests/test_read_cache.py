@@ -0,0 +1,109 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import json
+import os
+
+import mock
+
+from eaclient import system
+from eaclient.files import read_cache
+from eaclient.files.data_types import DataObjectFile
+from eaclient.files.files import EAFile
+from eaclient.files.state_files import AttachmentData
+
+M_PATH = "eaclient.files.read_cache."
+
+
+class TestCached:
+    def test_unchanged_file_is_not_loaded_again(self, tmpdir):
+        path = tmpdir.join("file")
+        path.write("content")
+        load = mock.MagicMock(return_value="parsed")
+
+        assert "parsed" == read_cache.cached(path.strpath, "kind", load)
+        assert "parsed" == read_cache.cached(path.strpath, "kind", load)
+        assert 1 == load.call_count
+        read_cache.cached(path.strpath, "other", load)
+        assert 2 == load.call_count
+
+    def test_modified_file_is_loaded_again(self, tmpdir):
+        path = tmpdir.join("file")
+        path.write("content")
+        load = mock.MagicMock(return_value="parsed")
+        read_cache.cached(path.strpath, "kind", load)
+
+        path.write("changed")
+        read_cache.cached(path.strpath, "kind", load)
+        stat = os.stat(path.strpath)
+        os.utime(
+            path.strpath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000)
+        )
+        read_cache.cached(path.strpath, "kind", load)
+
+        assert 3 == load.call_count
+
+    def test_missing_file_is_not_cached(self, tmpdir):
+        load = mock.MagicMock(return_value=None)
+        read_cache.cached(tmpdir.join("missing").strpath, "kind", load)
+        read_cache.cached(tmpdir.join("missing").strpath, "kind", load)
+        assert 2 == load.call_count
+
+
+class TestEAFileReadCache:
+    def test_reads_unchanged_file_once(self, tmpdir):
+        ea_file = EAFile("file", tmpdir.strpath)
+        ea_file.write("content")
+
+        with mock.patch(
+            "eaclient.system.load_file", wraps=system.load_file
+        ) as m_load_file:
+            assert "content" == ea_file.read()
+            assert "content" == EAFile("file", tmpdir.strpath).read()
+
+        assert 1 == m_load_file.call_count
+
+    def test_own_writes_invalidate(self, tmpdir):
+        ea_file = EAFile("file", tmpdir.strpath)
+        ea_file.write("content")
+        assert "content" == ea_file.read()
+
+        with system.write_batch():
+            ea_file.write("changed")
+            assert "changed" == ea_file.read()
+        assert "changed" == ea_file.read()
+
+        ea_file.delete()
+        assert ea_file.read() is None
+
+
+class TestDataObjectFileReadCache:
+    def test_parses_unchanged_file_once(self, tmpdir):
+        attached_at = datetime.datetime(
+            2024, 1, 2, tzinfo=datetime.timezone.utc
+        )
+        data_file = DataObjectFile(
+            AttachmentData, EAFile("attachment.json", tmpdir.strpath)
+        )
+        data_file.write(AttachmentData(attached_at=attached_at))
+
+        with mock.patch("json.loads", wraps=json.loads) as m_loads:
+            first = data_file.read()
+            second = data_file.read()
+
+        assert 1 == m_loads.call_count
+        assert first == second
+        assert first is not second
+        assert attached_at == second.attached_at
@@ -0,0 +1,143 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sqlite3
+
+import mock
+import pytest
+
+from eaclient import system
+from eaclient.files import state_store
+from eaclient.files.files import EAFile
+
+M_PATH = "eaclient.files.state_store."
+
+
+@pytest.fixture
+def store(FakeConfig, tmpdir):
+    with mock.patch(M_PATH + "_stores", {}):
+        cfg = FakeConfig(
+            cfg_overrides={
+                "data_dir": tmpdir.strpath,
+                "state_backend": "sqlite",
+            }
+        )
+        yield state_store.configure(cfg)
+        state_store.configure(
+            FakeConfig(cfg_overrides={"data_dir": tmpdir.strpath})
+        )
+
+
+class TestStateStore:
+    def test_write_regenerates_file(self, store, tmpdir):
+        ea_file = EAFile("test.json", tmpdir.strpath, private=False)
+        ea_file.write("content")
+
+        assert (True, "content") == store.read("test.json")
+        assert "content" == system.load_file(ea_file.path)
+        # The database is the source of truth
+        system.write_file(ea_file.path, "changed")
+        assert "content" == ea_file.read()
+
+    def test_reads_files_never_written(self, store, tmpdir):
+        path = tmpdir.join("existing.json")
+        path.write("existing")
+        ea_file = EAFile("existing.json", tmpdir.strpath)
+
+        assert (False, None) == store.read("existing.json")
+        assert "existing" == ea_file.read()
+        assert ea_file.is_present
+
+    def test_delete(self, store, tmpdir):
+        ea_file = EAFile("test.json", tmpdir.strpath)
+        ea_file.write("content")
+        ea_file.delete()
+
+        assert (True, None) == store.read("test.json")
+        assert not os.path.exists(ea_file.path)
+        assert not ea_file.is_present
+        assert ea_file.read() is None
+
+    def test_transaction_commits_at_once(self, store, tmpdir):
+        first = EAFile("first", tmpdir.strpath)
+        second = EAFile("second", os.path.join(tmpdir.strpath, "private"))
+        first.write("0")
+
+        with state_store.transaction(
+            mock.MagicMock(data_dir=tmpdir.strpath)
+        ):
+            first.write("1")
+            second.write("2")
+            assert "1" == first.read()
+            assert "0" == system.load_file(first.path)
+            conn = sqlite3.connect(store.path)
+            assert [("first", "0")] == conn.execute(
+                "SELECT * FROM state_files"
+            ).fetchall()
+            conn.close()
+
+        assert (True, "1") == store.read("first")
+        assert (True, "2") == store.read("private/second")
+        assert "2" == system.load_file(second.path)
+
+    def test_transaction_rolls_back(self, store, tmpdir):
+        ea_file = EAFile("test.json", tmpdir.strpath)
+        ea_file.write("before")
+
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                ea_file.write("after")
+                raise RuntimeError()
+
+        assert "before" == ea_file.read()
+        assert "before" == system.load_file(ea_file.path)
+
+    def test_sees_commits_of_other_processes(self, store, tmpdir):
+        ea_file = EAFile("test.json", tmpdir.strpath)
+        ea_file.write("ours")
+
+        conn = sqlite3.connect(store.path, isolation_level=None)
+        conn.execute(
+            "UPDATE state_files SET content = 'theirs' "
+            "WHERE name = 'test.json'"
+        )
+        conn.close()
+
+        assert "theirs" == ea_file.read()
+
+    def test_files_outside_data_dir(self, store, tmpdir):
+        assert store.key(tmpdir.join("a", "b").strpath) == "a/b"
+        assert store.key("/etc/passwd") is None
+        assert state_store.locate("/etc/passwd") is None
+
+    @mock.patch("eaclient.util.we_are_currently_root", return_value=False)
+    def test_non_root_uses_files(self, _m_root, store, tmpdir):
+        assert state_store.locate(tmpdir.join("a").strpath) is None
+
+    def test_database_is_private(self, store, tmpdir):
+        EAFile("test.json", tmpdir.strpath).write("content")
+
+        assert 0o600 == os.stat(store.path).st_mode & 0o777
+
+
+class TestConfigure:
+    @pytest.mark.parametrize("backend", (None, "files", "invalid"))
+    def test_files_backend(self, backend, FakeConfig, tmpdir):
+        cfg_overrides = {"data_dir": tmpdir.strpath}
+        if backend:
+            cfg_overrides["state_backend"] = backend
+        with mock.patch(M_PATH + "_stores", {}):
+            assert state_store.configure(FakeConfig(cfg_overrides)) is None
+            assert state_store.locate(tmpdir.join("a").strpath) is None
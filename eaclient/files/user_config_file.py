@@ -23,6 +23,7 @@ from eaclient.data_types import (
     Field,
     StringDataValue,
 )
+from eaclient.files import projection
 from eaclient.files.data_types import DataObjectFile, DataObjectFileFormat
 from eaclient.files.files import EAFile
 
@@ -37,14 +38,48 @@ PROXY_FIELDS = [
 ]
 
 
+def redact_proxy(value: str) -> str:
+    """Hide proxy urls with credentials from the public config."""
+    # Credentials need an "@", so most urls are never parsed
+    if "@" in value:
+        parsed_url = urlparse(value)
+        if parsed_url.username or parsed_url.password:
+            return "<REDACTED>"
+    return value
+
+
 class UserConfigData(DataObject):
     fields = [
-        Field("global_apt_http_proxy", StringDataValue, required=False),
-        Field("global_apt_https_proxy", StringDataValue, required=False),
-        Field("ea_apt_http_proxy", StringDataValue, required=False),
-        Field("ea_apt_https_proxy", StringDataValue, required=False),
-        Field("http_proxy", StringDataValue, required=False),
-        Field("https_proxy", StringDataValue, required=False),
+        Field(
+            "global_apt_http_proxy",
+            StringDataValue,
+            required=False,
+            public=redact_proxy,
+        ),
+        Field(
+            "global_apt_https_proxy",
+            StringDataValue,
+            required=False,
+            public=redact_proxy,
+        ),
+        Field(
+            "ea_apt_http_proxy",
+            StringDataValue,
+            required=False,
+            public=redact_proxy,
+        ),
+        Field(
+            "ea_apt_https_proxy",
+            StringDataValue,
+            required=False,
+            public=redact_proxy,
+        ),
+        Field(
+            "http_proxy", StringDataValue, required=False, public=redact_proxy
+        ),
+        Field(
+            "https_proxy", StringDataValue, required=False, public=redact_proxy
+        ),
     ]
 
     def __init__(
@@ -64,6 +99,8 @@ class UserConfigData(DataObject):
         self.https_proxy = https_proxy
 
 
+_PROJECTION = projection.Projection(UserConfigData)
+
 event = event_logger.get_event_logger()
 LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
 
@@ -98,13 +135,7 @@ class UserConfigFileObject:
     def redact_config_data(
         self, user_config: UserConfigData
     ) -> UserConfigData:
-        redacted_data_dict = user_config.to_dict()
-        for field in PROXY_FIELDS:
-            value = redacted_data_dict.get(field)
-            if value:
-                parsed_url = urlparse(value)
-                if parsed_url.username or parsed_url.password:
-                    redacted_data_dict[field] = "<REDACTED>"
+        _, redacted_data_dict = _PROJECTION.split(user_config)
         return UserConfigData.from_dict(redacted_data_dict)
 
     def read(self) -> UserConfigData:
@@ -118,9 +149,16 @@ class UserConfigFileObject:
         return UserConfigData()
 
     def write(self, content: UserConfigData):
-        self._private.write(content)
-        redacted_content = self.redact_config_data(content)
-        self._public.write(redacted_content)
+        # The same JSON DataObjectFile.write produces, for both files
+        private_content, public_content = _PROJECTION.dumps(
+            content, sort_keys=True, cls=util.DatetimeAwareJSONEncoder
+        )
+        projection.write_views(
+            self._private.ea_file,
+            self._public.ea_file,
+            private_content,
+            public_content,
+        )
 
 
 user_config = UserConfigFileObject(defaults.DEFAULT_DATA_DIR)
@@ -18,6 +18,7 @@ import json
 import logging
 import os
 import socket
+import ssl
 from typing import Any, Dict, List, NamedTuple, Optional
 from urllib import error, request
 from urllib.parse import ParseResult, urlparse
@@ -167,10 +168,7 @@ def configure_web_proxy(
     LOG.debug("Setting no_proxy: %s", no_proxy)
     os.environ["no_proxy"] = no_proxy
     os.environ["NO_PROXY"] = no_proxy
-    if proxy_dict:
-        proxy_handler = request.ProxyHandler(proxy_dict)
-        opener = request.build_opener(proxy_handler)
-        request.install_opener(opener)
+    _install_opener(proxy_dict)
 
     LOG.debug("Setting global proxy dict", extra={"extra": proxy_dict})
     global _global_proxy_dict
@@ -181,6 +179,32 @@ def get_configured_web_proxy() -> Dict[str, str]:
     return _global_proxy_dict
 
 
+_shared_ssl_context = None  # type: Optional[ssl.SSLContext]
+
+
+def enable_shared_ssl_context() -> None:
+    """
+    Load the CA bundle once and reuse the SSL context for every request.
+
+    By default urllib builds a new SSL context, re-reading the CA bundle,
+    for each https connection. That is fine for one-shot CLI runs; long
+    running consumers such as the daemon call this once at startup.
+    """
+    global _shared_ssl_context
+    _shared_ssl_context = ssl.create_default_context()
+    _install_opener(_global_proxy_dict)
+
+
+def _install_opener(proxy_dict: Dict[str, str]) -> None:
+    handlers = []  # type: List[request.BaseHandler]
+    if proxy_dict:
+        handlers.append(request.ProxyHandler(proxy_dict))
+    if _shared_ssl_context is not None:
+        handlers.append(request.HTTPSHandler(context=_shared_ssl_context))
+    if handlers:
+        request.install_opener(request.build_opener(*handlers))
+
+
 def _headers_to_dict(headers: email.message.Message) -> Dict[str, str]:
     # convert EmailMessage header object to dict with lowercase keys
     return {k.lower(): v for k, v, in headers.items()}
@@ -12,22 +12,43 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
+import collections
+import contextlib
+import fcntl
+import gzip
 import json
 import logging
+import logging.handlers
 import os
 import pathlib
-from collections import OrderedDict
-from typing import Any, Dict, List, Union  # noqa: F401
+import queue
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union  # noqa: F401
 
-from eaclient import secret_manager, system, util
+from eaclient import defaults, secret_manager, system, util
 from eaclient.config import EAConfig
 
 
+def redact(message: str) -> str:
+    """Redact known secrets and anything looking like one from message."""
+    return secret_manager.secrets.redact_secrets(
+        util.redact_sensitive_logs(message)
+    )
+
+
 class RegexRedactionFilter(logging.Filter):
-    """A logging filter to redact confidential info"""
+    """A logging filter to redact confidential info
+
+    Handlers set up here redact with their formatter instead, which only
+    runs for the records they emit.
+    """
 
     def filter(self, record: logging.LogRecord):
-        record.msg = util.redact_sensitive_logs(str(record.msg))
+        record.msg = util.redact_sensitive_logs(record.getMessage())
+        record.args = ()
         return True
 
 
@@ -35,54 +56,84 @@ class KnownSecretRedactionFilter(logging.Filter):
     """A logging filter to redact confidential info"""
 
     def filter(self, record: logging.LogRecord):
-        record.msg = secret_manager.secrets.redact_secrets(str(record.msg))
+        record.msg = secret_manager.secrets.redact_secrets(
+            record.getMessage()
+        )
+        record.args = ()
         return True
 
 
+class RedactingFormatter(logging.Formatter):
+    """A formatter redacting confidential info from what it renders"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return redact(super().format(record))
+
+
+# Log records never contain themselves, checking for it is wasted work
+_JSON_ENCODER = json.JSONEncoder(check_circular=False)
+
+
 class JsonArrayFormatter(logging.Formatter):
     """Json Array Formatter for our logging mechanism
     Custom made for Pro logging needs
+
+    Each record is written as
+    [asctime, levelname, name, funcName, lineno, message, extra].
     """
 
     default_time_format = "%Y-%m-%dT%H:%M:%S"
     default_msec_format = "%s.%03d"
-    required_fields = (
-        "asctime",
-        "levelname",
-        "name",
-        "funcName",
-        "lineno",
-        "message",
-    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The second last formatted and its rendering
+        self._second = (None, "")  # type: Tuple[Optional[int], str]
+
+    def formatTime(self, record: logging.LogRecord, datefmt=None) -> str:
+        if datefmt is not None:
+            return super().formatTime(record, datefmt)
+        # strftime only once per second
+        second, rendered = self._second
+        if second != int(record.created):
+            second = int(record.created)
+            rendered = time.strftime(
+                self.default_time_format, self.converter(record.created)
+            )
+            self._second = (second, rendered)
+        return self.default_msec_format % (rendered, record.msecs)
 
     def format(self, record: logging.LogRecord) -> str:
-        record.message = record.getMessage()
+        # Redacted once rendered, so arguments are redacted too
+        record.message = redact(record.getMessage())
         record.asctime = self.formatTime(record)
 
         extra_message_dict = {}  # type: Dict[str, Any]
         if record.exc_info:
-            extra_message_dict["exc_info"] = self.formatException(
-                record.exc_info
+            extra_message_dict["exc_info"] = redact(
+                self.formatException(record.exc_info)
             )
         if not extra_message_dict.get("exc_info") and record.exc_text:
-            extra_message_dict["exc_info"] = record.exc_text
+            extra_message_dict["exc_info"] = redact(record.exc_text)
         if record.stack_info:
-            extra_message_dict["stack_info"] = self.formatStack(
-                record.stack_info
+            extra_message_dict["stack_info"] = redact(
+                self.formatStack(record.stack_info)
             )
         extra = record.__dict__.get("extra")
         if extra and isinstance(extra, dict):
             extra_message_dict.update(extra)
 
-        # is ordered to maintain order of fields in log output
-        local_log_record = OrderedDict()  # type: Dict[str, Any]
-        # update the required fields in the order stated
-        for field in self.required_fields:
-            value = record.__dict__.get(field)
-            local_log_record[field] = value
-
-        local_log_record["extra"] = extra_message_dict
-        return json.dumps(list(local_log_record.values()))
+        return _JSON_ENCODER.encode(
+            [
+                record.asctime,
+                record.levelname,
+                record.name,
+                record.funcName,
+                record.lineno,
+                record.message,
+                extra_message_dict,
+            ]
+        )
 
 
 def get_user_or_root_log_file_path() -> str:
@@ -101,14 +152,342 @@ def get_user_log_file() -> str:
     return os.path.join(system.get_user_cache_dir(), "elxr-pro.log")
 
 
-def setup_cli_logging(log_level: Union[str, int], log_file: str):
+class RotatingLogHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotates the log file once it reaches max_bytes, keeping backup_count
+    archives: <log file>.1, then gzip-compressed <log file>.2.gz to
+    <log file>.N.gz. With no archives the file is started over.
+
+    Several processes may append to the same file. Rotation happens while
+    holding an flock on <log file>.lock, and a process whose file was
+    rotated by another one reopens it before writing. A record can still
+    land in <log file>.1 right after it was rotated, which is why it is
+    only compressed with the next rotation, from a background thread
+    holding the same lock.
+    """
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int):
+        super().__init__(
+            filename, maxBytes=max_bytes, backupCount=backup_count
+        )
+        self.lock_path = self.baseFilename + ".lock"
+
+    def _open(self):
+        fd = os.open(
+            self.baseFilename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o640
+        )
+        return open(fd, "a", encoding=self.encoding, errors=self.errors)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o640)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _current_size(self) -> int:
+        """
+        Size of the log file, after reopening it if it was rotated since
+        we opened it.
+        """
+        try:
+            path_stat = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            path_stat = None
+        if self.stream is not None:
+            stream_stat = os.fstat(self.stream.fileno())
+            if path_stat is not None and (
+                path_stat.st_ino,
+                path_stat.st_dev,
+            ) == (stream_stat.st_ino, stream_stat.st_dev):
+                return stream_stat.st_size
+            self.stream.close()
+        self.stream = self._open()
+        return os.fstat(self.stream.fileno()).st_size
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        # Going by the size before the record saves formatting it twice
+        size = self._current_size()
+        return self.maxBytes > 0 and size >= self.maxBytes
+
+    def _backup(self, index: int, suffix: str = "") -> str:
+        return "{}.{}{}".format(self.baseFilename, index, suffix)
+
+    def doRollover(self):
+        with self._locked():
+            # Another process may have rotated it while we waited
+            if self._current_size() < self.maxBytes:
+                return
+            self.stream.close()
+            self.stream = None
+            for index in range(self.backupCount - 1, 0, -1):
+                for suffix in ("", ".gz"):
+                    if os.path.exists(self._backup(index, suffix)):
+                        os.replace(
+                            self._backup(index, suffix),
+                            self._backup(index + 1, suffix),
+                        )
+            if self.backupCount > 0:
+                os.replace(self.baseFilename, self._backup(1))
+            else:
+                os.unlink(self.baseFilename)
+            self.stream = self._open()
+        if self.backupCount > 1:
+            threading.Thread(
+                target=self.compress_backups,
+                name="log-compressor",
+                daemon=True,
+            ).start()
+
+    def compress_backups(self):
+        """
+        Compress the archives that aren't yet. Those left over when a
+        process exits first are compressed after the next rotation.
+        """
+        with self._locked():
+            for index in range(2, self.backupCount + 1):
+                backup = self._backup(index)
+                if not os.path.exists(backup):
+                    continue
+                compressed = self._backup(index, ".gz")
+                partial = compressed + ".tmp"
+                try:
+                    with open(backup, "rb") as source:
+                        with gzip.open(partial, "wb") as target:
+                            shutil.copyfileobj(source, target)
+                    os.chmod(partial, 0o640)
+                    os.replace(partial, compressed)
+                    os.unlink(backup)
+                except OSError:
+                    # Logging from here could recurse, it is retried with
+                    # the next rotation instead
+                    with contextlib.suppress(OSError):
+                        os.unlink(partial)
+
+
+# Seconds a WARNING or worse waits for room in a full queue before it is
+# dropped too
+FULL_QUEUE_TIMEOUT = 1.0
+
+_log_writer = None  # type: Optional[LogWriter]
+_atexit_registered = False
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records over to a QueueListener thread, which formats, redacts
+    and writes them.
+
+    When the queue is full, DEBUG and INFO records are dropped right away
+    and WARNING or worse wait up to FULL_QUEUE_TIMEOUT for room first.
+    Dropped records are counted and reported once the queue is drained.
+    """
+
+    def __init__(self, record_queue: queue.Queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolve the arguments, which may change once we return.
+        # Everything else is left to the formatter on the writer thread
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if record.levelno < logging.WARNING:
+                self.queue.put_nowait(record)
+            else:
+                self.queue.put(record, timeout=FULL_QUEUE_TIMEOUT)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def take_dropped(self) -> int:
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class LogWriter(logging.handlers.QueueListener):
+    """The thread writing the records queued by a BoundedQueueHandler."""
+
+    def __init__(
+        self, queue_handler: BoundedQueueHandler, *handlers: logging.Handler
+    ):
+        super().__init__(
+            queue_handler.queue, *handlers, respect_handler_level=True
+        )
+        self.queue_handler = queue_handler
+
+    def enqueue_sentinel(self):
+        # Wait for room instead of failing when the queue is full
+        self.queue.put(self._sentinel)
+
+    def stop(self):
+        # Returns once everything queued before is written
+        super().stop()
+        dropped = self.queue_handler.take_dropped()
+        if dropped:
+            self.handle(
+                logging.makeLogRecord(
+                    {
+                        "name": "elxr-pro.log",
+                        "levelno": logging.WARNING,
+                        "levelname": "WARNING",
+                        "msg": "Dropped %d log records, the queue was full",
+                        "args": (dropped,),
+                    }
+                )
+            )
+
+    def flush(self):
+        """Wait until the records queued so far are written."""
+        self.stop()
+        self.start()
+
+
+_flight_recorder = None  # type: Optional[FlightRecorderHandler]
+
+
+# In the extra of the records the flight recorder writes around the ones
+# it kept, as "start" and "end". Those are older than the records already
+# written, log_query looks for them to know where the log is out of order.
+DUMP_MARKER = "flight_recorder_dump"
+
+
+class FlightRecorderHandler(logging.Handler):
+    """
+    Passes records at or above disk_level on to target and keeps the
+    last capacity ones below it in memory, to be written only if the
+    command fails. Successful runs then write next to nothing, while a
+    failure still leaves the debug records that led to it in the log.
+    """
+
+    def __init__(
+        self, target: logging.Handler, disk_level: int, capacity: int
+    ):
+        super().__init__()
+        self.target = target
+        self.disk_level = disk_level
+        self.buffer = collections.deque(
+            maxlen=capacity
+        )  # type: collections.deque
+        self.overwritten = 0
+
+    def emit(self, record: logging.LogRecord):
+        if record.levelno >= self.disk_level:
+            self.target.handle(record)
+            return
+        # The arguments may change before the record is ever written
+        record.msg = record.getMessage()
+        record.args = None
+        if len(self.buffer) == self.buffer.maxlen:
+            self.overwritten += 1
+        self.buffer.append(record)
+
+    def dump(self):
+        """Write the records kept in memory and forget them."""
+        self.acquire()
+        try:
+            records = list(self.buffer)
+            overwritten = self.overwritten
+            self.buffer.clear()
+            self.overwritten = 0
+        finally:
+            self.release()
+        if not records:
+            return
+        self.target.handle(
+            self._marker(
+                "start",
+                "Writing %d buffered log records, %d older ones were "
+                "overwritten",
+                len(records),
+                overwritten,
+            )
+        )
+        for record in records:
+            self.target.handle(record)
+        self.target.handle(
+            self._marker("end", "Wrote %d buffered log records", len(records))
+        )
+
+    @staticmethod
+    def _marker(position: str, msg: str, *args) -> logging.LogRecord:
+        return logging.makeLogRecord(
+            {
+                "name": "elxr-pro.log",
+                "levelno": logging.INFO,
+                "levelname": "INFO",
+                "msg": msg,
+                "args": args,
+                "extra": {DUMP_MARKER: position},
+            }
+        )
+
+
+def dump_flight_recorder():
+    """
+    Write the records the flight recorder kept in memory, for when the
+    command failed.
+    """
+    if _flight_recorder is not None:
+        _flight_recorder.dump()
+
+
+def flush_logging():
+    """
+    Wait until the records logged so far are written when logging
+    asynchronously.
+    """
+    if _log_writer is not None:
+        _log_writer.flush()
+
+
+def stop_logging():
+    """Write the queued records and stop the log writer thread."""
+    global _log_writer
+    log_writer, _log_writer = _log_writer, None
+    if log_writer is not None:
+        log_writer.stop()
+
+
+def setup_cli_logging(
+    log_level: Union[str, int],
+    log_file: str,
+    log_async: bool = False,
+    queue_size: int = defaults.DEFAULT_LOG_QUEUE_SIZE,
+    max_bytes: int = 0,
+    backup_count: int = 0,
+    disk_level: Optional[Union[str, int]] = None,
+    buffer_size: int = defaults.DEFAULT_LOG_BUFFER_SIZE,
+):
     """Setup logging to log_file
 
     If run as non-root then log_file is replaced with a user-specific log file.
+
+    With log_async, records are formatted and written from a background
+    thread, through a queue of up to queue_size records.
+
+    With max_bytes, log_file is rotated once it reaches that size, keeping
+    backup_count compressed archives.
+
+    With a disk_level above log_level, only records at or above it are
+    written right away. The last buffer_size records below it are kept in
+    memory and written by dump_flight_recorder.
     """
+    global _log_writer, _atexit_registered, _flight_recorder
     # support lower-case log_level config value
     if isinstance(log_level, str):
         log_level = log_level.upper()
+    if isinstance(disk_level, str):
+        disk_level = logging.getLevelName(disk_level.upper())
 
     # if we are running as non-root, change log file
     if not util.we_are_currently_root():
@@ -119,16 +498,52 @@ def setup_cli_logging(log_level: Union[str, int], log_file: str):
 
     # Clear all handlers, so they are replaced for this logger
     logger.handlers = []
+    stop_logging()
+    _flight_recorder = None
 
     # Setup file logging
     log_file_path = pathlib.Path(log_file)
     if not log_file_path.exists():
         log_file_path.parent.mkdir(parents=True, exist_ok=True)
         log_file_path.touch(mode=0o640)
-    file_handler = logging.FileHandler(log_file)
+    if max_bytes > 0:
+        file_handler = RotatingLogHandler(
+            log_file, max_bytes, backup_count
+        )  # type: logging.FileHandler
+    else:
+        file_handler = logging.FileHandler(log_file)
+    # JsonArrayFormatter redacts each record it writes
     file_handler.setFormatter(JsonArrayFormatter())
     file_handler.setLevel(log_level)
-    file_handler.addFilter(RegexRedactionFilter())
-    file_handler.addFilter(KnownSecretRedactionFilter())
 
-    logger.addHandler(file_handler)
+    handler = file_handler  # type: logging.Handler
+    if log_async:
+        handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size))
+        handler.setLevel(log_level)
+        _log_writer = LogWriter(handler, file_handler)
+        _log_writer.start()
+        if not _atexit_registered:
+            atexit.register(stop_logging)
+            _atexit_registered = True
+
+    if isinstance(disk_level, int) and logger.level < disk_level:
+        _flight_recorder = FlightRecorderHandler(
+            handler, disk_level, buffer_size
+        )
+        _flight_recorder.setLevel(log_level)
+        handler = _flight_recorder
+    logger.addHandler(handler)
+
+
+def setup_logging(cfg: EAConfig):
+    """Setup logging as configured in cfg."""
+    setup_cli_logging(
+        cfg.log_level,
+        cfg.log_file,
+        log_async=cfg.log_async,
+        queue_size=cfg.log_queue_size,
+        max_bytes=cfg.log_max_bytes,
+        backup_count=cfg.log_backup_count,
+        disk_level=cfg.log_disk_level,
+        buffer_size=cfg.log_buffer_size,
+    )
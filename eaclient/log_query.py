@@ -0,0 +1,422 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Query the log written by log.JsonArrayFormatter, one JSON array per line.
+
+Records are streamed from the log file and its rotated archives, oldest
+first, through a pipeline of generators, so memory use doesn't depend on
+the size of the log. Time range queries start reading each file from a
+sparse index of byte offsets by timestamp instead of from its start.
+"""
+
+import bisect
+import datetime
+import glob
+import gzip
+import json
+import logging
+import os
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from eaclient import log, system, util
+
+LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
+
+LOG_INDEX_FILE = "log-index.json"
+# Bytes of log between two entries of the index
+INDEX_STEP = 1024 * 1024
+# The lines start with ["2025-03-21T10:00:00.000"
+_TIMESTAMP_SLICE = slice(2, 25)
+# How the extra of the records around flight recorder dumps is written
+_DUMP_START = json.dumps({log.DUMP_MARKER: "start"})[1:-1].encode()
+_DUMP_END = json.dumps({log.DUMP_MARKER: "end"})[1:-1].encode()
+
+LogEntry = NamedTuple(
+    "LogEntry",
+    [
+        ("time", str),
+        ("level", str),
+        ("logger", str),
+        ("function", str),
+        ("line", int),
+        ("message", str),
+        ("extra", Dict[str, Any]),
+    ],
+)
+
+
+def parse_time(value: str) -> str:
+    """
+    Render an ISO 8601 date or time the way the log does, in local time,
+    so it can be compared with the timestamps in the log as a string.
+
+    :raises ValueError: if value isn't an ISO 8601 date or time.
+    """
+    moment = datetime.datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return "{}.{:03d}".format(
+        moment.strftime("%Y-%m-%dT%H:%M:%S"), moment.microsecond // 1000
+    )
+
+
+def log_files(log_file: str) -> List[str]:
+    """log_file and its rotated archives that exist, oldest first."""
+    archives = []
+    for path in glob.glob(glob.escape(log_file) + ".*"):
+        suffix = path[len(log_file) + 1 :]
+        if suffix.endswith(".gz"):
+            suffix = suffix[: -len(".gz")]
+        if suffix.isdigit():
+            archives.append((int(suffix), path))
+    paths = [path for _, path in sorted(archives, reverse=True)]
+    if os.path.exists(log_file):
+        paths.append(log_file)
+    return paths
+
+
+def _open(path: str) -> IO[bytes]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")  # type: ignore
+    return open(path, "rb")
+
+
+def _timestamp(line: bytes) -> Optional[str]:
+    if not line.startswith(b'["') or line[25:26] != b'"':
+        return None
+    try:
+        return line[_TIMESTAMP_SLICE].decode("ascii")
+    except UnicodeDecodeError:
+        return None
+
+
+class LogIndex:
+    """
+    The offset and timestamp of a line roughly every INDEX_STEP bytes of
+    each log file, saved to path, and where the flight recorder dumped
+    records older than the lines before them.
+
+    Files are known by their device and inode, which rotating the log
+    file to <log file>.1 keeps. A file that grew is only indexed from
+    where its index stopped. One that shrank, or whose first checkpoint
+    doesn't match its content, was replaced and is indexed again.
+    Compressed archives are indexed by their uncompressed offsets.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._files = {}  # type: Dict[str, Dict[str, Any]]
+        self._changed = False
+        try:
+            with open(path) as stream:
+                files = json.load(stream)
+            if isinstance(files, dict):
+                self._files = files
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _key(file_stat: os.stat_result) -> str:
+        return "{}:{}".format(file_stat.st_dev, file_stat.st_ino)
+
+    def _entry(self, path: str, stream: IO[bytes]) -> Dict[str, Any]:
+        # The file read, even if path was rotated since it was opened
+        file_stat = os.fstat(stream.fileno())
+        key = self._key(file_stat)
+        entry = self._files.get(key)
+        if (
+            entry is None
+            or file_stat.st_size < entry["size"]
+            or "dumps" not in entry
+            or not self._same_file(entry, stream)
+        ):
+            entry = {
+                "size": 0,
+                "next": 0,
+                "next_checkpoint": 0,
+                "checkpoints": [],
+                "dumps": [],
+                "open_dumps": 0,
+            }
+            self._files[key] = entry
+        if entry["size"] != file_stat.st_size:
+            self._extend(entry, stream)
+            entry["size"] = file_stat.st_size
+            self._changed = True
+        return entry
+
+    @staticmethod
+    def _same_file(entry: Dict[str, Any], stream: IO[bytes]) -> bool:
+        """Whether stream is the file entry indexed, not a reused inode."""
+        if not entry["checkpoints"]:
+            return True
+        timestamp, offset = entry["checkpoints"][0]
+        stream.seek(offset)
+        return _timestamp(stream.readline()) == timestamp
+
+    def checkpoints(
+        self, path: str, stream: IO[bytes]
+    ) -> List[Tuple[str, int]]:
+        """The (timestamp, offset) pairs of path, opened as stream."""
+        return [
+            tuple(checkpoint)
+            for checkpoint in self._entry(path, stream)["checkpoints"]
+        ]
+
+    def ranges(
+        self,
+        path: str,
+        stream: IO[bytes],
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Tuple[int, Optional[int]]]:
+        """
+        The (start, end) offsets of the parts of path, opened as stream,
+        that can hold records between since and until, in file order. An
+        end of None is the end of the file.
+
+        Outside of flight recorder dumps the log is in time order: it is
+        read from the last checkpoint before since up to the first one
+        after until. Dumped records are only written after they were
+        logged, so the dumps past that which can hold some are read too.
+        """
+        entry = self._entry(path, stream)
+        checkpoints = entry["checkpoints"]
+        timestamps = [timestamp for timestamp, _ in checkpoints]
+        start, end = 0, None  # type: int, Optional[int]
+        if since:
+            position = bisect.bisect_left(timestamps, since) - 1
+            if position >= 0:
+                start = checkpoints[position][1]
+        if until:
+            position = bisect.bisect_right(timestamps, until)
+            if position < len(checkpoints):
+                end = checkpoints[position][1]
+
+        ranges = []  # type: List[Tuple[int, Optional[int]]]
+        if end is None or end > start:
+            ranges.append((start, end))
+        for dump_start, dump_end, oldest, newest in entry["dumps"]:
+            if since and newest is not None and newest < since:
+                continue
+            if until and oldest is not None and oldest > until:
+                continue
+            ranges.append((dump_start, dump_end))
+        ranges.sort(key=lambda part: part[0])
+
+        merged = []  # type: List[Tuple[int, Optional[int]]]
+        for part_start, part_end in ranges:
+            if merged and (
+                merged[-1][1] is None or part_start <= merged[-1][1]
+            ):
+                last_start, last_end = merged[-1]
+                if last_end is not None and part_end is not None:
+                    merged[-1] = (last_start, max(last_end, part_end))
+                else:
+                    merged[-1] = (last_start, None)
+            else:
+                merged.append((part_start, part_end))
+        return merged
+
+    def _extend(self, entry: Dict[str, Any], stream: IO[bytes]):
+        # Every new line is looked at, a dump can start anywhere
+        checkpoints = entry["checkpoints"]
+        dumps = entry["dumps"]
+        offset = entry["next"]
+        stream.seek(offset)
+        for line in stream:
+            if not line.endswith(b"\n"):
+                # A line still being written
+                break
+            line_offset = offset
+            offset += len(line)
+            timestamp = _timestamp(line)
+            if _DUMP_START in line:
+                if not entry["open_dumps"]:
+                    dumps.append([line_offset, None, None, None])
+                entry["open_dumps"] += 1
+            if entry["open_dumps"]:
+                dump = dumps[-1]
+                if timestamp is not None:
+                    dump[2] = min(dump[2] or timestamp, timestamp)
+                    dump[3] = max(dump[3] or timestamp, timestamp)
+                if _DUMP_END in line:
+                    entry["open_dumps"] -= 1
+                    if not entry["open_dumps"]:
+                        dump[1] = offset
+            elif (
+                timestamp is not None
+                and line_offset >= entry["next_checkpoint"]
+            ):
+                checkpoints.append([timestamp, line_offset])
+                entry["next_checkpoint"] = line_offset + INDEX_STEP
+        entry["next"] = offset
+
+    def save(self, log_file: Optional[str] = None):
+        """
+        Save the index to path, without the files that are no longer
+        log_file or one of its archives if given.
+        """
+        if log_file is not None:
+            keys = set()
+            for path in log_files(log_file):
+                try:
+                    keys.add(self._key(os.stat(path)))
+                except OSError:
+                    pass
+            for key in set(self._files) - keys:
+                del self._files[key]
+                self._changed = True
+        if not self._changed:
+            return
+        try:
+            system.write_file(self.path, json.dumps(self._files), mode=0o600)
+        except OSError as e:
+            LOG.warning("Unable to save the log index %s: %s", self.path, e)
+        self._changed = False
+
+
+def read_lines(
+    path: str,
+    index: Optional[LogIndex] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Iterator[bytes]:
+    """
+    The lines of path. With an index, only the parts of it that can hold
+    records between since and until.
+    """
+    with _open(path) as stream:
+        ranges = [(0, None)]  # type: List[Tuple[int, Optional[int]]]
+        if index is not None and (since or until):
+            ranges = index.ranges(path, stream, since, until)
+        for start, end in ranges:
+            stream.seek(start)
+            offset = start
+            for line in stream:
+                if end is not None and offset >= end:
+                    break
+                offset += len(line)
+                yield line
+
+
+def parse_lines(lines: Iterable[bytes]) -> Iterator[LogEntry]:
+    """The entries of lines, skipping anything that isn't one."""
+    for line in lines:
+        try:
+            fields = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(fields, list) or len(fields) != len(
+            LogEntry._fields
+        ):
+            continue
+        yield LogEntry(*fields)
+
+
+def _level_number(level: str) -> int:
+    number = logging.getLevelName(level)
+    return number if isinstance(number, int) else logging.NOTSET
+
+
+def filter_entries(
+    entries: Iterable[LogEntry],
+    level: Optional[str] = None,
+    logger: Optional[str] = None,
+    function: Optional[str] = None,
+    text: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Iterator[LogEntry]:
+    """
+    The entries at or above level, from logger or one of its children,
+    logged in function, containing text (ignoring case) and timestamped
+    between since and until, both included.
+    """
+    min_level = _level_number(level.upper()) if level else None
+    text = text.lower() if text else None
+    for entry in entries:
+        if since and entry.time < since:
+            continue
+        if until and entry.time > until:
+            continue
+        if (
+            min_level is not None
+            and _level_number(entry.level) < min_level
+        ):
+            continue
+        if (
+            logger
+            and entry.logger != logger
+            and not entry.logger.startswith(logger + ".")
+        ):
+            continue
+        if function and entry.function != function:
+            continue
+        if text and text not in entry.message.lower():
+            continue
+        yield entry
+
+
+def _prefilter(lines: Iterable[bytes], text: str) -> Iterator[bytes]:
+    # Leave out lines that can't match before parsing them, when text is
+    # written to the log as is
+    needle = text.lower().encode("utf-8")
+    for line in lines:
+        if needle in line.lower():
+            yield line
+
+
+def query(
+    log_file: str,
+    index: Optional[LogIndex] = None,
+    level: Optional[str] = None,
+    logger: Optional[str] = None,
+    function: Optional[str] = None,
+    text: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Iterator[LogEntry]:
+    """
+    The entries of log_file and its archives matching the filters of
+    filter_entries, oldest first. since and until are timestamps as
+    returned by parse_time.
+    """
+    for path in log_files(log_file):
+        try:
+            lines = read_lines(path, index, since, until)
+            if text and json.dumps(text)[1:-1] == text:
+                lines = _prefilter(lines, text)
+            yield from filter_entries(
+                parse_lines(lines),
+                level=level,
+                logger=logger,
+                function=function,
+                text=text,
+                since=since,
+                until=until,
+            )
+        except (OSError, EOFError) as e:
+            LOG.warning("Unable to read %s: %s", path, e)
@@ -174,6 +174,31 @@ CLI_MAGIC_ATTACH_INIT = t.gettext("Initiating join operation...")
 
 VALIDATE_SUCCESS = t.gettext("Connection to API server successful.")
 
+STATUS_ATTACHED = t.gettext("attached")
+STATUS_MACHINE_ID = t.gettext("machine id")
+STATUS_EXPIRES = t.gettext("expires")
+STATUS_PROXY = t.gettext("apt proxy")
+STATUS_LAST_TEST = t.gettext("last test")
+STATUS_GENERATED_AT = t.gettext("updated")
+STATUS_YES = t.gettext("yes")
+STATUS_NO = t.gettext("no")
+STATUS_NONE = t.gettext("none")
+STATUS_NEVER = t.gettext("never")
+STATUS_TEST_SUCCESS = t.gettext("success at {tested_at}")
+STATUS_TEST_FAILURE = t.gettext("failed at {tested_at}: {error}")
+STATUS_ENTITLEMENT_HEADER = t.gettext("ENTITLEMENT")
+STATUS_URI_HEADER = t.gettext("URI")
+STATUS_EXPIRES_HEADER = t.gettext("EXPIRES")
+
+COLLECT_LOGS_SUCCESS = t.gettext("Wrote {path}")
+COLLECT_LOGS_LEFT_OUT = t.gettext(
+    "Left out to stay under {max_size} MiB: {paths}"
+)
+COLLECT_LOGS_TRUNCATED = t.gettext(
+    "Only the end of these was kept to stay under {max_size} MiB: {paths}"
+)
+COLLECT_LOGS_FAILED = t.gettext("Unable to read {path}: {error}")
+
 
 ###############################################################################
 #                        CLI HELP TEXT                                        #
@@ -209,9 +234,67 @@ CLI_ROOT_DETACH = t.gettext(
     "remove this machine from an eLxr Pro subscription"
 )
 CLI_ROOT_TEST = t.gettext("validate the connection to the API server")
+CLI_TEST_MAX_AGE = t.gettext(
+    "answer from the result of a previous test if it is at most SECONDS "
+    "old. The result is refreshed in the background once it is older "
+    "than half of SECONDS. Only used when running as root."
+)
 CLI_ROOT_HELP = t.gettext(
     "show detailed information about eLxr Pro services"
 )
+CLI_ROOT_STATUS = t.gettext("current status of eLxr Pro on this machine")
+CLI_STATUS_DESC = t.gettext(
+    """\
+Report the last recorded eLxr Pro status of this machine.
+
+The status is written to {path} whenever join, leave, test or config
+set/unset change it. This command only reads that file."""
+)
+CLI_STATUS_FORMAT = t.gettext(
+    "output in the specified format (default: {default})"
+)
+
+CLI_ROOT_LOGS = t.gettext("search the eLxr Pro log")
+CLI_LOGS_DESC = t.gettext(
+    """\
+Print the records of the eLxr Pro log matching all of the filters given,
+oldest first, including those of the rotated log files.
+
+--since and --until take an ISO 8601 date or time such as 2025-03-21 or
+2025-03-21T10:00:00, in local time unless it has a UTC offset. Both are
+included in the range."""
+)
+CLI_LOGS_LEVEL = t.gettext("only records at this level or above")
+CLI_LOGS_LOGGER = t.gettext(
+    "only records of this logger or its children, e.g. elxr-pro.actions"
+)
+CLI_LOGS_FUNCTION = t.gettext("only records logged from this function")
+CLI_LOGS_GREP = t.gettext("only records whose message contains TEXT")
+CLI_LOGS_SINCE = t.gettext("only records logged at or after TIME")
+CLI_LOGS_UNTIL = t.gettext("only records logged at or before TIME")
+
+CLI_ROOT_COLLECT_LOGS = t.gettext(
+    "collect redacted logs and configuration for a support case"
+)
+CLI_COLLECT_LOGS_DESC = t.gettext(
+    """\
+Collect the eLxr Pro log files, configuration, public state files, apt
+sources and apt auth.conf into a tar.gz to attach to a support case.
+
+Tokens, passwords and other secrets are redacted from everything that
+goes in. A manifest.json in the archive lists what was collected, left
+out or truncated."""
+)
+CLI_COLLECT_LOGS_OUTPUT = t.gettext(
+    "where to write the archive (default: {default})"
+)
+CLI_COLLECT_LOGS_MAX_SIZE = t.gettext(
+    "most MiB to collect before compression, the oldest logs are left out "
+    "first (default: {default})"
+)
+CLI_COLLECT_LOGS_INVALID_MAX_SIZE = t.gettext(
+    "expected a positive number of MiB, got {value}"
+)
 
 CLI_CONFIG_SHOW_DESC = t.gettext("Show customizable configuration settings")
 CLI_CONFIG_SHOW_KEY = t.gettext(
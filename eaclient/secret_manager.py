@@ -12,29 +12,52 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
+import re
+from typing import Dict, List, Optional, Pattern  # noqa: F401
 
 
 class SecretManager:
+    """
+    The secrets to keep out of the logs. Each one is stored once, however
+    often it is added, and all of them are redacted in a single scan.
+    """
+
     def __init__(self):
-        self._secrets = []
+        # Insertion ordered and without duplicates
+        self._secrets = {}  # type: Dict[str, None]
+        self._pattern = None  # type: Optional[Pattern]
 
     def add_secret(self, secret: str) -> None:
-        if secret:  # Add only non-empty secrets
-            self._secrets.append(secret)
+        if secret and secret not in self._secrets:  # Add only new secrets
+            self._secrets[secret] = None
+            self._pattern = None
 
     @property
     def secrets(self) -> List[str]:
-        return self._secrets
+        return list(self._secrets)
 
     def clear_secrets(self) -> None:
         self._secrets.clear()
+        self._pattern = None
+
+    def _get_pattern(self) -> Pattern:
+        pattern = self._pattern
+        if pattern is None:
+            # Longest first, so a secret containing another one is
+            # redacted whole
+            pattern = re.compile(
+                "|".join(
+                    re.escape(secret)
+                    for secret in sorted(self._secrets, key=len, reverse=True)
+                )
+            )
+            self._pattern = pattern
+        return pattern
 
     def redact_secrets(self, log_record: str) -> str:
-        redacted_record = log_record
-        for secret in self._secrets:
-            redacted_record = redacted_record.replace(secret, "<REDACTED>")
-        return redacted_record
+        if not self._secrets:
+            return log_record
+        return self._get_pattern().sub("<REDACTED>", log_record)
 
 
 secrets = SecretManager()
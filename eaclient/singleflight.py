@@ -0,0 +1,207 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cross-process coalescing of identical HTTP requests.
+
+The first process to ask for a given key performs the request while
+holding a file lock. Processes asking for the same key in the meantime
+wait on that lock and reuse the response instead of making their own
+request. Only completed responses are shared: if the request raises, the
+waiting processes fall back to performing it themselves, without the lock.
+
+The waiting processes also hold a shared lock on a second file. The last
+one to read the response, or the leader if none waited, removes it.
+"""
+
+import errno
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Callable, Iterable, Optional
+
+from eaclient import http, system, util
+
+LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
+
+WAIT_TIMEOUT = 150.0
+_POLL_INTERVAL = 0.05
+
+
+def _key_digest(key_parts: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for part in key_parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _try_lock(fd: int, operation: int) -> bool:
+    try:
+        fcntl.flock(fd, operation | fcntl.LOCK_NB)
+        return True
+    except OSError as e:
+        if e.errno not in (errno.EAGAIN, errno.EACCES):
+            raise
+    return False
+
+
+def _acquire(fd: int, deadline: float):
+    """Wait for an exclusive lock on fd until deadline."""
+    while not _try_lock(fd, fcntl.LOCK_EX):
+        if time.time() >= deadline:
+            raise TimeoutError()
+        time.sleep(_POLL_INTERVAL)
+
+
+def _remove_unless_waited_for(waiters_fd: int, shared_path: str):
+    """
+    Remove the shared response unless a process still waits to read it,
+    the last of them does.
+    """
+    if _try_lock(waiters_fd, fcntl.LOCK_EX):
+        system.ensure_file_absent(shared_path)
+
+
+def _read_shared(
+    path: str, not_before: float
+) -> Optional[http.HTTPResponse]:
+    try:
+        with open(path) as f:
+            shared = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if shared.get("finished_at", 0) < not_before:
+        return None
+
+    headers = shared["headers"]
+    body = shared["body"]
+    json_dict = {}
+    json_list = []
+    if "application/json" in headers.get("content-type", ""):
+        json_body = json.loads(body, cls=util.DatetimeAwareJSONDecoder)
+        if isinstance(json_body, dict):
+            json_dict = json_body
+        elif isinstance(json_body, list):
+            json_list = json_body
+    return http.HTTPResponse(
+        code=shared["code"],
+        headers=headers,
+        body=body,
+        json_dict=json_dict,
+        json_list=json_list,
+    )
+
+
+def _write_shared(path: str, response: http.HTTPResponse):
+    content = json.dumps(
+        {
+            "finished_at": time.time(),
+            "code": response.code,
+            "headers": response.headers,
+            "body": response.body,
+        }
+    )
+    system.write_file(path, content, mode=0o600)
+
+
+def do(
+    key_parts: Iterable[str],
+    request: Callable[[], http.HTTPResponse],
+    directory: Optional[str] = None,
+    wait_timeout: float = WAIT_TIMEOUT,
+) -> http.HTTPResponse:
+    """
+    Run request, or reuse the response of a concurrent identical one.
+
+    :param key_parts: strings identifying the request. Callers only share
+        responses when all parts match, so include anything that changes
+        the answer, such as the URL, machine ID and token.
+    :param request: performs the request.
+    :param directory: where the locks and shared response live, defaults
+        to the user cache dir (EAC_RUN_PATH for root).
+    :param wait_timeout: seconds to wait for a concurrent request before
+        giving up and performing the request anyway.
+    """
+    started_at = time.time()
+    if directory is None:
+        directory = system.get_user_cache_dir()
+    name = "singleflight-{}".format(_key_digest(key_parts))
+    lock_path = os.path.join(directory, name + ".lock")
+    waiters_path = os.path.join(directory, name + ".waiters")
+    shared_path = os.path.join(directory, name + ".json")
+
+    fds = []
+    try:
+        os.makedirs(directory, exist_ok=True)
+        for path in (lock_path, waiters_path):
+            fds.append(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+    except OSError as e:
+        for fd in fds:
+            os.close(fd)
+        LOG.debug("Unable to coalesce request, running it directly: %r", e)
+        return request()
+    fd, waiters_fd = fds
+
+    try:
+        if _try_lock(fd, fcntl.LOCK_EX):
+            return _lead(fd, waiters_fd, shared_path, request)
+
+        fcntl.flock(waiters_fd, fcntl.LOCK_SH)
+        try:
+            _acquire(fd, started_at + wait_timeout)
+        except TimeoutError:
+            LOG.debug("Timed out waiting for concurrent request")
+            shared = None
+        else:
+            # Anything finished after we started is as fresh as our own
+            # request
+            shared = _read_shared(shared_path, not_before=started_at)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            if shared is None:
+                LOG.debug("Concurrent request failed")
+        _remove_unless_waited_for(waiters_fd, shared_path)
+    finally:
+        os.close(waiters_fd)
+        os.close(fd)
+
+    if shared is not None:
+        LOG.debug("Reusing response of concurrent request")
+        return shared
+    # Without the locks, so that the processes that waited for a failed
+    # request run theirs alongside each other
+    return request()
+
+
+def _lead(
+    fd: int,
+    waiters_fd: int,
+    shared_path: str,
+    request: Callable[[], http.HTTPResponse],
+) -> http.HTTPResponse:
+    # Left over by a process that was killed, older than our request
+    system.ensure_file_absent(shared_path)
+    try:
+        response = request()
+        try:
+            _write_shared(shared_path, response)
+        except OSError as e:
+            LOG.debug("Unable to share response: %r", e)
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    _remove_unless_waited_for(waiters_fd, shared_path)
+    return response
@@ -0,0 +1,161 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Precomputed machine status.
+
+The status is rendered to a world-readable json file whenever a command
+changes what it reports, so agents can poll it with a single file read.
+It never includes tokens, repository credentials or proxy URLs.
+"""
+
+import datetime
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse, urlunparse
+
+from eaclient import config, exceptions, system, util
+from eaclient.files import machine_token
+from eaclient.files.state_files import contract_test_result_file, status_file
+
+LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
+
+STATUS_SCHEMA_VERSION = "0.1"
+
+
+def _strip_credentials(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return url
+    parsed = urlparse(url)
+    if "@" not in parsed.netloc:
+        return url
+    netloc = parsed.netloc.rsplit("@", 1)[1]
+    return urlunparse(parsed._replace(netloc=netloc))
+
+
+def _parse_expires(value: Any) -> Optional[datetime.datetime]:
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return util.parse_rfc3339_date(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _get_entitlements(token: Dict[str, Any]) -> List[Dict[str, Any]]:
+    entitlements = []
+    for resource in token.get("resources") or []:
+        entitlements.append(
+            {
+                "name": resource.get("type"),
+                "uri": _strip_credentials(resource.get("uri")),
+                "suites": resource.get("suites") or [],
+                "components": resource.get("components") or [],
+                "architectures": resource.get("architectures") or [],
+                "expires": resource.get("expires"),
+            }
+        )
+    return entitlements
+
+
+def _get_proxy(cfg: config.EAConfig) -> Dict[str, Any]:
+    if cfg.global_apt_http_proxy or cfg.global_apt_https_proxy:
+        scope = "global"
+        http_proxy = cfg.global_apt_http_proxy
+        https_proxy = cfg.global_apt_https_proxy
+    elif cfg.ea_apt_http_proxy or cfg.ea_apt_https_proxy:
+        scope = "elxr-pro"
+        http_proxy = cfg.ea_apt_http_proxy
+        https_proxy = cfg.ea_apt_https_proxy
+    else:
+        scope = None
+        http_proxy = https_proxy = None
+    return {
+        "scope": scope,
+        "http": bool(http_proxy),
+        "https": bool(https_proxy),
+    }
+
+
+def _get_last_test(cfg: config.EAConfig) -> Optional[Dict[str, Any]]:
+    try:
+        result = contract_test_result_file(cfg.data_dir).read()
+    except exceptions.ELxrProError as e:
+        LOG.warning("Ignoring unreadable contract test result: %s", e)
+        return None
+    if result is None:
+        return None
+    error_msg = result.error_msg
+    if error_msg:
+        error_msg = util.redact_sensitive_logs(error_msg)
+    return {
+        "tested_at": result.tested_at,
+        "success": result.success,
+        "http_code": result.http_code,
+        "latency": result.latency,
+        "machine_id_match": result.machine_id_match,
+        "error_code": result.error_code,
+        "error_msg": error_msg,
+    }
+
+
+def get_status(cfg: config.EAConfig) -> Dict[str, Any]:
+    """Collect the current status of the machine."""
+    token_file = machine_token.get_machine_token_file(cfg)
+    token = token_file.machine_token or {}
+    entitlements = _get_entitlements(token)
+    expiry_dates = [
+        expires
+        for expires in (_parse_expires(e["expires"]) for e in entitlements)
+        if expires is not None
+    ]
+    return {
+        "_schema_version": STATUS_SCHEMA_VERSION,
+        "generated_at": datetime.datetime.now(datetime.timezone.utc),
+        "attached": bool(token),
+        "machine_id": system.get_machine_id(cfg),
+        "expires": min(expiry_dates) if expiry_dates else None,
+        "entitlements": entitlements,
+        "proxy": _get_proxy(cfg),
+        "last_test": _get_last_test(cfg),
+    }
+
+
+def update_status(cfg: config.EAConfig) -> None:
+    """Regenerate status.json. Only root can write it."""
+    if not util.we_are_currently_root():
+        return
+    try:
+        status_file(cfg.data_dir).write(get_status(cfg))
+    except OSError as e:
+        LOG.warning("Unable to update status file: %s", e)
+
+
+def read_status(cfg: config.EAConfig) -> Dict[str, Any]:
+    """Return the last written status, an unattached one if absent."""
+    status = status_file(cfg.data_dir).read()
+    if status is None:
+        return {
+            "_schema_version": STATUS_SCHEMA_VERSION,
+            "generated_at": None,
+            "attached": False,
+            "machine_id": None,
+            "expires": None,
+            "entitlements": [],
+            "proxy": {"scope": None, "http": False, "https": False},
+            "last_test": None,
+        }
+    return status
@@ -0,0 +1,356 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Collect the files support asks for into a redacted tar.gz.
+
+Every source is read in chunks of CHUNK_SIZE and redacted a line at a
+time, which is what redact_sensitive_logs works on, so nothing it would
+redact can straddle two chunks. The redacted copies are spooled to
+temporary files by a pool of threads and then added to the archive in
+order, so memory use only depends on the number of threads. No more than
+COLLECT_THREADS sources are spooled ahead, each only up to what can still
+be added, and the copies are removed once added.
+
+The archive holds at most max_size bytes before compression. Sources are
+added most important first, and the log files newest first, keeping the
+end of the one that doesn't fit whole.
+"""
+
+import codecs
+import glob
+import gzip
+import io
+import json
+import logging
+import os
+import tarfile
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, Dict, List, NamedTuple, Optional, Tuple
+
+from eaclient import apt, config, log, log_query, secret_manager, util
+from eaclient.defaults import PRIVATE_SUBDIR
+from eaclient.files import machine_token
+
+LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
+
+ARCHIVE_ROOT = "elxr-pro-logs"
+MANIFEST_FILE = "manifest.json"
+CHUNK_SIZE = 64 * 1024
+# Longer lines are truncated, the rest of them is left out
+MAX_LINE = 1024 * 1024
+TRUNCATED = "<TRUNCATED>"
+COLLECT_THREADS = 4
+APT_SOURCES = ["/etc/apt/sources.list", "/etc/apt/sources.list.d/*"]
+
+# On top of the log redaction: credentials in URLs, as in proxy settings,
+# and the logins and passwords of apt's auth.conf
+REDACT_CREDENTIALS = [
+    r"(://[^:/@\s]+:)[^@\s]+(?=@)",
+    r"(\blogin[ \t]+)\S+",
+    r"(\bpassword[ \t]+)\S+",
+]
+# The secrets of the machine token, redacted wherever they show up
+MACHINE_TOKEN_SECRETS = ("token", "machineToken", "contractToken")
+RESOURCE_SECRETS = ("login", "password")
+
+Source = NamedTuple(
+    "Source",
+    [
+        ("path", str),
+        # Whether to keep the end of the file rather than its start
+        ("tail", bool),
+    ],
+)
+
+
+def _redact(text: str) -> str:
+    return util.redact_sensitive_logs(log.redact(text), REDACT_CREDENTIALS)
+
+
+def add_known_secrets(cfg: config.EAConfig):
+    """
+    Add the tokens and repository credentials of the machine token to the
+    secrets redacted from everything collected. Only root can read them.
+    """
+    if not util.we_are_currently_root():
+        return
+    try:
+        token = machine_token.get_machine_token_file(cfg).machine_token
+    except Exception as e:
+        LOG.warning("Unable to read the machine token: %s", e)
+        return
+    if not isinstance(token, dict):
+        return
+    values = [token.get(key) for key in MACHINE_TOKEN_SECRETS]
+    for resource in token.get("resources") or []:
+        if isinstance(resource, dict):
+            values.extend(resource.get(key) for key in RESOURCE_SECRETS)
+    for value in values:
+        if isinstance(value, str):
+            secret_manager.secrets.add_secret(value)
+
+
+def redact_stream(
+    source: IO[bytes],
+    target: IO[bytes],
+    skip_first_line: bool = False,
+    limit: Optional[int] = None,
+) -> int:
+    """
+    Write source to target redacted, a chunk at a time. Return the number
+    of bytes written.
+
+    :param skip_first_line: leave out everything up to the first newline,
+        for a source that starts in the middle of a line.
+    :param limit: stop once more than limit bytes were written.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    # A secret at the end of a truncated line may be cut short, keep its
+    # start out as well
+    longest_secret = max(
+        [len(secret) for secret in secret_manager.secrets.secrets] + [0]
+    )
+    keep = max(0, MAX_LINE - longest_secret)
+    written = 0
+    pending = ""
+    dropping = skip_first_line
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        text = pending + decoder.decode(chunk, final=not chunk)
+        pending = ""
+        if dropping:
+            newline = text.find("\n")
+            if newline >= 0:
+                text = text[newline + 1 :]
+                dropping = False
+            else:
+                text = ""
+        if chunk:
+            # Only whole lines, the rest waits for the next chunk
+            cut = text.rfind("\n") + 1
+            text, pending = text[:cut], text[cut:]
+            if len(pending) > MAX_LINE:
+                text += pending[:keep] + TRUNCATED + "\n"
+                pending = ""
+                dropping = True
+        if text:
+            written += target.write(_redact(text).encode("utf-8"))
+        if not chunk or (limit is not None and written > limit):
+            return written
+
+
+class _TailFile:
+    """
+    Keeps the last size bytes written to stream, from the first whole line
+    on. stream grows to twice that before its start is dropped.
+    """
+
+    def __init__(self, stream: IO[bytes], size: int):
+        self.stream = stream
+        self.size = size
+        self.trimmed = False
+
+    def write(self, data: bytes) -> int:
+        written = self.stream.write(data)
+        if self.stream.tell() > 2 * self.size:
+            self.trim()
+        return written
+
+    def trim(self):
+        end = self.stream.tell()
+        if end <= self.size:
+            return
+        self.stream.seek(end - self.size)
+        self.stream.readline()
+        read_at = self.stream.tell()
+        write_at = 0
+        while True:
+            self.stream.seek(read_at)
+            chunk = self.stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            self.stream.seek(write_at)
+            self.stream.write(chunk)
+            read_at += len(chunk)
+            write_at += len(chunk)
+        self.stream.truncate(write_at)
+        self.stream.seek(write_at)
+        self.trimmed = True
+
+
+def default_sources(cfg: config.EAConfig) -> List[Source]:
+    """What support asks for, most important first."""
+    paths = [cfg.cfg_path or config.get_config_path()]
+    for root, dirs, files in os.walk(cfg.data_dir):
+        # Unredacted copies of the state files, for root only
+        dirs[:] = sorted(d for d in dirs if d != PRIVATE_SUBDIR)
+        paths.extend(os.path.join(root, name) for name in sorted(files))
+    for pattern in APT_SOURCES:
+        paths.extend(sorted(glob.glob(pattern)))
+    try:
+        paths.append(apt.get_apt_auth_file_from_apt_config())
+    except Exception as e:
+        LOG.warning("Unable to find the apt auth file: %s", e)
+    sources = [Source(path, False) for path in paths]
+
+    if util.we_are_currently_root():
+        log_file = cfg.log_file
+    else:
+        log_file = log.get_user_log_file()
+    sources.extend(
+        Source(path, True)
+        for path in reversed(log_query.log_files(log_file))
+    )
+    return sources
+
+
+def archive_name(path: str) -> str:
+    if path.endswith(".gz"):
+        path = path[: -len(".gz")]
+    return os.path.join(ARCHIVE_ROOT, path.lstrip(os.sep))
+
+
+def _spool(
+    source: Source, tmpdir: str, number: int, max_size: int
+) -> Tuple[str, bool]:
+    """
+    Write the redacted source to a file in tmpdir. Return its path and
+    whether part of the source was left out, no more than about max_size
+    bytes are kept: its end if source.tail and otherwise its start.
+    """
+    spooled = os.path.join(tmpdir, str(number))
+    compressed = source.path.endswith(".gz")
+    if compressed:
+        stream = gzip.open(source.path, "rb")  # type: IO[bytes]
+    else:
+        stream = open(source.path, "rb")
+    try:
+        with stream, open(spooled, "w+b") as target:
+            if not source.tail:
+                # It is left out if it doesn't fit whole
+                cut = redact_stream(stream, target, limit=max_size) > max_size
+            elif compressed:
+                tail = _TailFile(target, max_size)
+                redact_stream(stream, tail)  # type: ignore
+                tail.trim()
+                cut = tail.trimmed
+            else:
+                start = max(0, os.fstat(stream.fileno()).st_size - max_size)
+                stream.seek(start)
+                redact_stream(stream, target, skip_first_line=start > 0)
+                cut = start > 0
+    except Exception:
+        if os.path.exists(spooled):
+            os.unlink(spooled)
+        raise
+    return spooled, cut
+
+
+def _discard(job: Future):
+    """Cancel job, or remove what it spooled."""
+    if job.cancel():
+        return
+    try:
+        os.unlink(job.result()[0])
+    except (OSError, EOFError):
+        pass
+
+
+def _add(
+    tar: tarfile.TarFile, name: str, spooled: str, size: int, tail: bool
+) -> int:
+    """
+    Add spooled to tar if it has at most size bytes. Otherwise add its
+    last size bytes from the first whole line on if tail, or nothing.
+    Return how many bytes were added.
+    """
+    with open(spooled, "rb") as stream:
+        total = os.fstat(stream.fileno()).st_size
+        if total > size:
+            if not tail:
+                return 0
+            stream.seek(total - size)
+            stream.readline()
+        info = tarfile.TarInfo(name)
+        info.size = total - stream.tell()
+        if total and not info.size:
+            return 0
+        info.mode = 0o600
+        tar.addfile(info, stream)
+    return info.size
+
+
+def collect(
+    sources: List[Source], output: str, max_size: int
+) -> List[Dict[str, Any]]:
+    """
+    Write the redacted sources to the tar.gz output and return what was
+    done with each of them, which is also added to it as MANIFEST_FILE.
+    """
+    manifest = []  # type: List[Dict[str, Any]]
+    remaining = max_size
+    fd = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with open(fd, "wb") as out, tarfile.open(
+        fileobj=out, mode="w:gz"
+    ) as tar, tempfile.TemporaryDirectory() as tmpdir, ThreadPoolExecutor(
+        max_workers=COLLECT_THREADS
+    ) as pool:
+        jobs = {}  # type: Dict[int, Future]
+        for number, source in enumerate(sources):
+            # Spool the next sources while this one is added, as much of
+            # them as can still be
+            for ahead in range(
+                number, min(number + COLLECT_THREADS, len(sources))
+            ):
+                if ahead not in jobs and remaining > 0:
+                    jobs[ahead] = pool.submit(
+                        _spool, sources[ahead], tmpdir, ahead, remaining
+                    )
+            job = jobs.pop(number, None)
+            entry = {"path": source.path}  # type: Dict[str, Any]
+            manifest.append(entry)
+            if job is None or remaining <= 0:
+                if job is not None:
+                    _discard(job)
+                entry["skipped"] = True
+                continue
+            try:
+                spooled, cut = job.result()
+            except (OSError, EOFError) as e:
+                LOG.warning("Unable to collect %s: %s", source.path, e)
+                entry["error"] = str(e)
+                continue
+            size = os.path.getsize(spooled)
+            name = archive_name(source.path)
+            added = _add(tar, name, spooled, remaining, source.tail)
+            os.unlink(spooled)
+            if size and not added:
+                entry["skipped"] = True
+                continue
+            remaining -= added
+            entry["name"] = name
+            entry["size"] = added
+            if added < size or cut:
+                entry["truncated"] = True
+                # What is left is less than a line
+                remaining = 0
+
+        content = json.dumps(manifest, indent=2, sort_keys=True).encode()
+        info = tarfile.TarInfo(os.path.join(ARCHIVE_ROOT, MANIFEST_FILE))
+        info.size = len(content)
+        info.mode = 0o600
+        tar.addfile(info, io.BytesIO(content))
+    return manifest
@@ -12,19 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
 import datetime
+import errno
 import logging
 import os
 import pathlib
 import re
+import shutil
 import stat
 import subprocess  # nosec B404
 import tempfile
+import threading
 import time
 import uuid
 from functools import lru_cache
 from typing import (
     Dict,
+    Iterator,
     List,
     NamedTuple,
     Optional,
@@ -94,6 +99,14 @@ CpuInfo = NamedTuple(
 
 RE_KERNEL_EXTRACT_BUILD_DATE = r"(Mon|Tue|Wed|Thu|Fri|Sat|Sun).*"
 
+_write_batches = threading.local()
+
+# Set LANG to avoid non-utf8 when we pipe the handlers
+_SET_LANG = {"LANG": "C.UTF-8", "LC_ALL": "C.UTF-8"}
+# A copy of what os.environ was built from, and the environments of the
+# commands without and with _SET_LANG
+_env_cache = None  # type: Optional[Tuple[Dict, Dict[bool, Dict[str, str]]]]
+
 
 def _get_kernel_changelog_timestamp(
     uname: os.uname_result,
@@ -234,7 +247,7 @@ def get_machine_id(cfg) -> str:
     """
     from eaclient.files import machine_token
 
-    machine_token_file = machine_token.get_machine_token_file()
+    machine_token_file = machine_token.get_machine_token_file(cfg)
     if machine_token_file.machine_token:
         machine_id = machine_token_file.machine_token.get("machineId")
         if machine_id:
@@ -328,9 +341,38 @@ def is_exe(path: str) -> bool:
     return os.path.isfile(path) and os.access(path, os.X_OK)
 
 
+def _staged_path(filename: str) -> str:
+    """The file holding what filename will contain once the batch commits."""
+    batch = getattr(_write_batches, "current", None)
+    if batch is None:
+        return filename
+    path = os.path.abspath(filename)
+    if path not in batch.staged:
+        return filename
+    staged = batch.staged[path]
+    if staged is None:
+        raise FileNotFoundError(
+            errno.ENOENT, os.strerror(errno.ENOENT), filename
+        )
+    return staged
+
+
+def stat_file(filename: str) -> os.stat_result:
+    """os.stat of filename, or of its staged content in the current batch."""
+    return os.stat(_staged_path(filename))
+
+
+def file_exists(filename: str) -> bool:
+    """Like os.path.exists, but also sees writes of the current batch."""
+    try:
+        return os.path.exists(_staged_path(filename))
+    except FileNotFoundError:
+        return False
+
+
 def load_file(filename: str) -> str:
     """Read filename and decode content."""
-    with open(filename, "rb") as stream:
+    with open(_staged_path(filename), "rb") as stream:
         LOG.debug("Reading file: %s", filename)
         content = stream.read()
     try:
@@ -348,13 +390,107 @@ def create_file(filename: str, mode: int = 0o644) -> None:
     os.chmod(filename, mode)
 
 
+class _WriteBatch:
+    """
+    Writes staged by write_file and ensure_file_absent, keyed by absolute
+    destination path. The value is the temporary file holding the new
+    content, or None if the file is to be removed.
+    """
+
+    def __init__(self):
+        self.staged = {}  # type: Dict[str, Optional[str]]
+
+    def stage(self, filename: str, tmp_name: Optional[str]):
+        previous = self.staged.pop(filename, None)
+        if previous is not None:
+            os.unlink(previous)
+        self.staged[filename] = tmp_name
+
+    def commit(self):
+        # Make all the new content durable before any of it replaces the
+        # old, then make the renames durable once per directory
+        for tmp_name in self.staged.values():
+            if tmp_name is not None:
+                _fsync(tmp_name, os.O_RDONLY)
+        directories = []  # type: List[str]
+        for filename, tmp_name in list(self.staged.items()):
+            if tmp_name is None:
+                try:
+                    os.unlink(filename)
+                    LOG.debug("Removed file: %s", filename)
+                except FileNotFoundError:
+                    LOG.debug(
+                        "Tried to remove %s but file does not exist",
+                        filename,
+                    )
+            else:
+                os.rename(tmp_name, filename)
+            del self.staged[filename]
+            directory = os.path.dirname(filename)
+            if directory not in directories:
+                directories.append(directory)
+        for directory in directories:
+            try:
+                _fsync(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+            except OSError as e:
+                # Not every filesystem supports syncing directories
+                LOG.debug("Could not fsync %s: %s", directory, e)
+
+    def discard(self):
+        for tmp_name in self.staged.values():
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except FileNotFoundError:
+                    pass
+        self.staged.clear()
+
+
+def _fsync(path: str, flags: int) -> None:
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def write_batch():
+    """
+    Apply all write_file and ensure_file_absent calls inside the block
+    durably and together when it exits.
+
+    Files are written to temporary files first. On exit their data is
+    fsynced, they are renamed into place and each affected directory is
+    fsynced once, so a crash never leaves a partially written file and
+    the batch pays for one directory fsync per directory instead of one
+    per file. Reads through load_file see the staged content. If the block
+    raises, nothing is applied. Nested blocks join the outer one.
+    """
+    batch = getattr(_write_batches, "current", None)
+    if batch is not None:
+        yield batch
+        return
+    batch = _WriteBatch()
+    _write_batches.current = batch
+    try:
+        yield batch
+        batch.commit()
+    except BaseException:
+        batch.discard()
+        raise
+    finally:
+        _write_batches.current = None
+
+
 def write_file(
     filename: str, content: str, mode: Optional[int] = None
 ) -> None:
     """Write content to the provided filename encoding it if necessary.
 
     We preserve the file ownership and permissions if the file is present
-    and no mode argument is provided.
+    and no mode argument is provided. The file is replaced atomically and
+    durably, as part of the current write_batch if there is one.
 
     @param filename: The full path of the file to write.
     @param content: The content to write to the file.
@@ -370,29 +506,36 @@ def write_file(
 
     elif mode is None:
         mode = 0o644
-    try:
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        tmpf = tempfile.NamedTemporaryFile(
-            mode="wb", delete=False, dir=os.path.dirname(filename)
-        )
-        LOG.debug(
-            "Writing file %s atomically via tempfile %s", filename, tmpf.name
-        )
-        tmpf.write(content.encode("utf-8"))
-        tmpf.flush()
-        tmpf.close()
-        os.chmod(tmpf.name, mode)
-        if is_file_present:
-            os.chown(tmpf.name, file_stat.st_uid, file_stat.st_gid)
-        os.rename(tmpf.name, filename)
-    except Exception as e:
-        if tmpf is not None:
-            os.unlink(tmpf.name)
-        raise e
+    with write_batch() as batch:
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            tmpf = tempfile.NamedTemporaryFile(
+                mode="wb", delete=False, dir=os.path.dirname(filename)
+            )
+            LOG.debug(
+                "Writing file %s atomically via tempfile %s",
+                filename,
+                tmpf.name,
+            )
+            tmpf.write(content.encode("utf-8"))
+            tmpf.flush()
+            tmpf.close()
+            os.chmod(tmpf.name, mode)
+            if is_file_present:
+                os.chown(tmpf.name, file_stat.st_uid, file_stat.st_gid)
+        except Exception as e:
+            if tmpf is not None:
+                os.unlink(tmpf.name)
+            raise e
+        batch.stage(os.path.abspath(filename), tmpf.name)
 
 
 def ensure_file_absent(file_path: str) -> None:
     """Remove a file if it exists, logging a message about removal."""
+    batch = getattr(_write_batches, "current", None)
+    if batch is not None:
+        batch.stage(os.path.abspath(file_path), None)
+        return
     try:
         os.unlink(file_path)
         LOG.debug("Removed file: %s", file_path)
@@ -400,6 +543,65 @@ def ensure_file_absent(file_path: str) -> None:
         LOG.debug("Tried to remove %s but file does not exist", file_path)
 
 
+def _get_env(
+    set_lang: bool, override_env_vars: Optional[Dict[str, str]]
+) -> Dict[str, str]:
+    """
+    Return the environment of a command: os.environ, with _SET_LANG if
+    set_lang, and override_env_vars. Copying os.environ decodes all of it,
+    so that is only done again once it changed.
+    """
+    global _env_cache
+    # The plain dict of bytes os.environ is a view of
+    source = getattr(os.environ, "_data", os.environ)
+    cache = _env_cache
+    if cache is None or cache[0] != source:
+        base = dict(os.environ)
+        cache = (dict(source), {False: base, True: {**base, **_SET_LANG}})
+        _env_cache = cache
+    env = cache[1][set_lang]
+    if override_env_vars:
+        env = {**env, **override_env_vars}
+    return env
+
+
+@lru_cache(maxsize=None)
+def _which(command: bytes, path: str) -> Optional[bytes]:
+    return shutil.which(command, path=path)
+
+
+def _executable(command: bytes, env: Dict[str, str]) -> Optional[bytes]:
+    """
+    Return the path of command, with which subprocess starts it with
+    posix_spawn rather than fork and exec, or None to leave the lookup to
+    subprocess.
+    """
+    if b"/" in command:
+        return None
+    return _which(command, env.get("PATH", os.defpath))
+
+
+def _popen(
+    args: Sequence[str], env: Dict[str, str], **kwargs
+) -> subprocess.Popen:
+    bytes_args = [
+        x if isinstance(x, bytes) else x.encode("utf-8") for x in args
+    ]
+    # posix_spawn also needs close_fds=False. The file descriptors Python
+    # opens are not inherited anyway, unless made inheritable on purpose.
+    return subprocess.Popen(  # nosec B603
+        bytes_args,
+        executable=_executable(bytes_args[0], env),
+        env=env,
+        close_fds=False,
+        **kwargs,
+    )
+
+
+def _redacted_cmd(args: Sequence[str]) -> str:
+    return util.redact_sensitive_logs(" ".join(args))
+
+
 def _subp(
     args: Sequence[str],
     rcs: Optional[List[int]] = None,
@@ -427,67 +629,111 @@ def _subp(
     @raises subprocess.TimeoutError when timeout specified and the command
         exceeds that number of seconds.
     """
-    bytes_args = [
-        x if isinstance(x, bytes) else x.encode("utf-8") for x in args
-    ]
-
     stdout = None
     stderr = None
-    set_lang = {}
-
     if pipe_stdouterr:
         stdout = subprocess.PIPE
         stderr = subprocess.PIPE
-        # Set LANG to avoid non-utf8 when we pipe the handlers
-        set_lang = {"LANG": "C.UTF-8", "LC_ALL": "C.UTF-8"}
-
-    if override_env_vars is None:
-        override_env_vars = {}
-    merged_env = {**os.environ, **set_lang, **override_env_vars}
+    env = _get_env(pipe_stdouterr, override_env_vars)
 
     if rcs is None:
         rcs = [0]
-    redacted_cmd = util.redact_sensitive_logs(" ".join(args))
     try:
-        proc = subprocess.Popen(  # nosec B603
-            bytes_args,
-            stdout=stdout,
-            stderr=stderr,
-            env=merged_env,
-        )
+        proc = _popen(args, env, stdout=stdout, stderr=stderr)
         (out, err) = proc.communicate(timeout=timeout)
     except OSError:
         try:
             out_result = out.decode("utf-8", errors="ignore") if out else ""
             err_result = err.decode("utf-8", errors="ignore") if err else ""
             raise exceptions.ProcessExecutionError(
-                cmd=redacted_cmd,
+                cmd=_redacted_cmd(args),
                 exit_code=proc.returncode,
                 stdout=out_result,
                 stderr=err_result,
             )
         except UnboundLocalError:
-            raise exceptions.ProcessExecutionError(cmd=redacted_cmd)
+            raise exceptions.ProcessExecutionError(cmd=_redacted_cmd(args))
 
     out_result = out.decode("utf-8", errors="ignore") if out else ""
     err_result = err.decode("utf-8", errors="ignore") if err else ""
     if proc.returncode not in rcs:
         raise exceptions.ProcessExecutionError(
-            cmd=redacted_cmd,
+            cmd=_redacted_cmd(args),
             exit_code=proc.returncode,
             stdout=out_result,
             stderr=err_result,
         )
-    if capture:
+    if capture and LOG.isEnabledFor(logging.DEBUG):
         LOG.debug(
             "Ran cmd: %s, rc: %s stderr: %s",
-            redacted_cmd,
+            _redacted_cmd(args),
             proc.returncode,
             err,
         )
     return out_result, err_result
 
 
+def subp_stream(
+    args: Sequence[str],
+    rcs: Optional[List[int]] = None,
+    capture: bool = False,
+    override_env_vars: Optional[Dict[str, str]] = None,
+) -> Iterator[str]:
+    """Run a command and yield the lines of its stdout as they come.
+
+    For long running commands, whose output is not kept in memory. Stderr
+    is spooled to a temporary file for the ProcessExecutionError. The
+    command is killed if the caller stops iterating before its output ends.
+
+    @param args: A list of arguments to feed to subprocess.Popen
+    @param rcs: A list of allowed return_codes. If returncode not in rcs
+        raise a ProcessExecutionError once the output ends.
+    @param capture: Boolean set True to log the command and its stderr.
+    @param override_env_vars: Optional dictionary of environment variables
+        merged with os.environ, as for subp.
+
+    @return: Iterator of utf-8 decoded lines, without their line ending
+    @raises ProcessExecutionError on invalid command or returncode not in rcs.
+    """
+    if rcs is None:
+        rcs = [0]
+    with tempfile.TemporaryFile() as err_file:
+        try:
+            proc = _popen(
+                args,
+                _get_env(True, override_env_vars),
+                stdout=subprocess.PIPE,
+                stderr=err_file,
+            )
+        except OSError:
+            raise exceptions.ProcessExecutionError(cmd=_redacted_cmd(args))
+        with proc.stdout:
+            try:
+                for line in proc.stdout:
+                    yield line.decode("utf-8", errors="ignore").rstrip("\n")
+                proc.wait()
+            finally:
+                if proc.returncode is None:
+                    proc.kill()
+                    proc.wait()
+        err_file.seek(0)
+        err = err_file.read().decode("utf-8", errors="ignore")
+
+    if proc.returncode not in rcs:
+        raise exceptions.ProcessExecutionError(
+            cmd=_redacted_cmd(args),
+            exit_code=proc.returncode,
+            stderr=err,
+        )
+    if capture and LOG.isEnabledFor(logging.DEBUG):
+        LOG.debug(
+            "Ran cmd: %s, rc: %s stderr: %s",
+            _redacted_cmd(args),
+            proc.returncode,
+            err,
+        )
+
+
 def subp(
     args: Sequence[str],
     rcs: Optional[List[int]] = None,
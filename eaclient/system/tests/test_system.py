@@ -545,6 +545,54 @@ class TestWriteFile:
 
         assert [mock.call("test_tmpfile")] == m_unlink.call_args_list
 
+    def test_write_batch_applies_writes_on_exit(self, tmpdir):
+        first = tmpdir.join("first").strpath
+        second = tmpdir.join("sub", "second").strpath
+        removed = tmpdir.join("removed")
+        removed.write("old")
+
+        with system.write_batch():
+            system.write_file(first, "1")
+            system.write_file(second, "2")
+            system.ensure_file_absent(removed.strpath)
+
+            assert not os.path.exists(first)
+            assert "1" == system.load_file(first)
+            assert system.file_exists(second)
+            assert removed.check()
+            assert not system.file_exists(removed.strpath)
+            with pytest.raises(FileNotFoundError):
+                system.load_file(removed.strpath)
+
+        assert "1" == system.load_file(first)
+        assert "2" == system.load_file(second)
+        assert not removed.check()
+
+    def test_write_batch_discards_writes_on_error(self, tmpdir):
+        path = tmpdir.join("file")
+        path.write("old")
+
+        with pytest.raises(RuntimeError):
+            with system.write_batch():
+                system.write_file(path.strpath, "new")
+                system.write_file(path.strpath, "newer")
+                raise RuntimeError()
+
+        assert "old" == path.read()
+        assert ["file"] == os.listdir(tmpdir.strpath)
+
+    @mock.patch("eaclient.system._fsync")
+    def test_write_batch_fsyncs_each_directory_once(self, m_fsync, tmpdir):
+        with system.write_batch():
+            for name in ("a", "b", "c"):
+                system.write_file(tmpdir.join(name).strpath, name)
+
+        synced = [c[0][0] for c in m_fsync.call_args_list]
+        assert 4 == len(synced)
+        assert tmpdir.strpath == synced[-1]
+        # The temporary files are synced before they are renamed
+        assert not {"a", "b", "c"} & {os.path.basename(p) for p in synced}
+
 
 class TestSubp:
     def test_raise_error_on_timeout(self, _subp):
@@ -685,10 +733,12 @@ class TestSubp:
             ),
         ),
     )
+    @mock.patch("eaclient.system._which", return_value=b"/usr/bin/apt")
     @mock.patch("subprocess.Popen")
     def test_subp_uses_environment_variables(
         self,
         m_popen,
+        _m_which,
         override_env_vars,
         os_environ,
         expected_env_arg,
@@ -704,9 +754,11 @@ class TestSubp:
         assert [
             mock.call(
                 [b"apt", b"nothing"],
+                executable=b"/usr/bin/apt",
+                env=expected_env_arg,
+                close_fds=False,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                env=expected_env_arg,
             )
         ] == m_popen.call_args_list
 
@@ -726,9 +778,11 @@ class TestSubp:
         assert [
             mock.call(
                 [b"fake"],
+                executable=None,
+                env={},
+                close_fds=False,
                 stdout=None,
                 stderr=None,
-                env={},
             )
         ] == m_popen.call_args_list
 
@@ -746,6 +800,58 @@ class TestSubp:
 
         assert "TEST!" == out
 
+    def test_env_follows_os_environ_changes(self):
+        os_environ = {"test": "val"}
+        with mock.patch("os.environ", os_environ):
+            first = system._get_env(False, None)
+            assert first is system._get_env(False, None)
+            os_environ["test"] = "newval"
+            assert {"test": "newval"} == system._get_env(False, None)
+
+    @mock.patch("eaclient.system._which", return_value=b"/usr/bin/ls")
+    def test_executable(self, m_which):
+        assert b"/usr/bin/ls" == system._executable(b"ls", {"PATH": "/bin"})
+        assert None is system._executable(b"./ls", {"PATH": "/bin"})
+        assert [mock.call(b"ls", "/bin")] == m_which.call_args_list
+
+
+class TestSubpStream:
+    def test_yields_lines(self):
+        assert ["one", "two", "three"] == list(
+            system.subp_stream(["printf", "one\\ntwo\\nthree"])
+        )
+
+    def test_raise_error_on_return_code(self):
+        with pytest.raises(exceptions.ProcessExecutionError) as excinfo:
+            list(
+                system.subp_stream(
+                    ["sh", "-c", "echo out; echo err >&2; exit 3"]
+                )
+            )
+
+        assert 3 == excinfo.value.exit_code
+        assert "err\n" == excinfo.value.stderr
+
+    def test_no_error_on_accepted_return_codes(self):
+        assert [] == list(system.subp_stream(["ls", "--bogus"], rcs=[2]))
+
+    def test_raise_error_on_invalid_command(self):
+        with pytest.raises(exceptions.ProcessExecutionError):
+            list(system.subp_stream(["/nonexistent/command"]))
+
+    def test_kills_command_when_closed(self):
+        lines = system.subp_stream(["yes"])
+
+        assert "y" == next(lines)
+        with mock.patch(
+            "subprocess.Popen.kill",
+            autospec=True,
+            side_effect=subprocess.Popen.kill,
+        ) as m_kill:
+            lines.close()
+
+        assert 1 == m_kill.call_count
+
 
 class TestGetCpuInfo:
     @pytest.mark.parametrize(
@@ -0,0 +1,294 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Local stand-in for the eLxr Pro contract service.
+
+Implements the join, leave and test actions with configurable latency,
+error rates and response size, so the client can be exercised against a
+slow or flaky backend without touching production.
+
+Run standalone with:
+
+    python3 -m eaclient.testing.contract_server --port 8080 --latency 0.2
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from eaclient import contract
+
+ERROR_DETAILS = {
+    401: "Invalid token.",
+    403: "Product is full",
+    503: "Service temporarily unavailable.",
+}
+
+
+class ContractServerHandler(BaseHTTPRequestHandler):
+    server_version = "eLxrProStandIn/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Keep load runs quiet; request counts are tracked on the server
+        pass
+
+    def _send_json(self, code: int, content: Dict):
+        body = json.dumps(content).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError:
+            return {}
+
+    def _bearer_token(self) -> Optional[str]:
+        auth = self.headers.get("Authorization", "")
+        if not auth.startswith("Bearer "):
+            return None
+        token = auth[len("Bearer ") :]
+        if token in ("", "None"):
+            return None
+        return token
+
+    def do_POST(self):
+        server = self.server  # type: StandInContractServer
+        data = self._read_json()
+        server.record_request(self.path)
+
+        if server.latency or server.jitter:
+            time.sleep(
+                server.latency + server.rng.uniform(0, server.jitter)
+            )
+
+        action = server.actions.get(self.path.rstrip("/"))
+        if action is None:
+            self._send_json(404, {"detail": "Not Found"})
+            return
+
+        code = server.pick_error()
+        token = data.get("token") or self._bearer_token()
+        if code is None and not token:
+            code = 401
+        if code is not None:
+            server.record_response(code)
+            self._send_json(code, {"detail": ERROR_DETAILS[code]})
+            return
+
+        response = {
+            "machineId": data.get("machineId", ""),
+        }  # type: Dict
+        if action == "join":
+            response["token"] = "standin-product-{}".format(token)
+            response["resources"] = server.resources
+        elif action == "leave":
+            response["message"] = "Leave successful"
+        elif action == "test":
+            response["token"] = token
+        if server.response_size:
+            size = server.response_size - len(json.dumps(response))
+            if size > 0:
+                response["padding"] = "x" * size
+        server.record_response(200)
+        self._send_json(200, response)
+
+
+class StandInContractServer(ThreadingHTTPServer):
+    """
+    A threaded HTTP server answering the contract endpoints used by the
+    client.
+
+    :param host: address to bind to.
+    :param port: port to bind to, 0 picks a free one.
+    :param latency: seconds to wait before answering each request.
+    :param jitter: extra random latency, uniformly distributed in
+        [0, jitter] seconds.
+    :param error_rates: probability of answering with each HTTP error
+        code, e.g. {401: 0.01, 503: 0.05}. Supported codes are 401, 403
+        and 503.
+    :param response_size: pad successful responses to roughly this many
+        bytes.
+    :param seed: optional seed to make error injection reproducible.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rates: Optional[Dict[int, float]] = None,
+        response_size: int = 0,
+        seed: Optional[int] = None,
+    ):
+        super().__init__((host, port), ContractServerHandler)
+        error_rates = error_rates or {}
+        unsupported = set(error_rates).difference(ERROR_DETAILS)
+        if unsupported:
+            raise ValueError(
+                "Unsupported error codes: {}".format(
+                    ", ".join(str(c) for c in sorted(unsupported))
+                )
+            )
+        if sum(error_rates.values()) > 1:
+            raise ValueError("Error rates must add up to at most 1")
+
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rates = error_rates
+        self.response_size = response_size
+        self.rng = random.Random(seed)
+        self.actions = {
+            contract.API_V1_JOIN_CONTRACT_MACHINE: "join",
+            contract.API_V1_LEAVE_CONTRACT_MACHINE: "leave",
+            contract.API_V1_TEST_CONTRACT_MACHINE: "test",
+        }
+        self.resources = [
+            {
+                "type": "elxr-pro",
+                "uri": "https://{}/elxr-pro".format(host),
+                "login": "standin",
+                "password": "standin",
+                "suites": ["aria"],
+                "components": ["main"],
+                "architectures": ["amd64", "arm64"],
+            }
+        ]
+        self.requests = Counter()  # type: Counter
+        self.responses = Counter()  # type: Counter
+        self._stats_lock = threading.Lock()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def pick_error(self) -> Optional[int]:
+        with self._stats_lock:
+            roll = self.rng.random()
+        for code, rate in sorted(self.error_rates.items()):
+            if roll < rate:
+                return code
+            roll -= rate
+        return None
+
+    def record_request(self, path: str):
+        with self._stats_lock:
+            self.requests[path] += 1
+
+    def record_response(self, code: int):
+        with self._stats_lock:
+            self.responses[code] += 1
+
+    def start(self) -> "StandInContractServer":
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="contract-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, _exc_type, _exc_value, _traceback):
+        self.stop()
+
+
+def parse_error_rates(value: str) -> Dict[int, float]:
+    """Parse "401=0.01,503=0.05" into {401: 0.01, 503: 0.05}."""
+    error_rates = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        code, rate = item.split("=", 1)
+        error_rates[int(code)] = float(rate)
+    return error_rates
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Stand-in eLxr Pro contract server"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per request"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="extra random latency"
+    )
+    parser.add_argument(
+        "--error-rates",
+        type=parse_error_rates,
+        default={},
+        help="comma separated code=rate pairs, e.g. 401=0.01,503=0.05",
+    )
+    parser.add_argument(
+        "--response-size",
+        type=int,
+        default=0,
+        help="pad successful responses to this many bytes",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def main(sys_argv=None):
+    args = get_parser().parse_args(sys_argv)
+    server = StandInContractServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rates=args.error_rates,
+        response_size=args.response_size,
+        seed=args.seed,
+    )
+    print("Serving contract API on {}".format(server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
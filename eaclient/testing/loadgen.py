@@ -0,0 +1,258 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Load generator for the contract API.
+
+Drives N simulated machines, each with its own machine ID and data_dir,
+through the real actions.action_to_request concurrently and reports
+throughput and latency percentiles.
+
+Only the "test" action is driven: join and leave rewrite the host's APT
+configuration, so they are not safe to run in bulk from one host.
+
+Against a local stand-in server:
+
+    python3 -m eaclient.testing.loadgen --machines 200 --latency 0.1 \\
+        --error-rates 503=0.05
+
+Against an existing server:
+
+    python3 -m eaclient.testing.loadgen --url http://staging:8080
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from eaclient import actions, defaults
+from eaclient.config import EAConfig
+from eaclient.files.machine_token import MachineTokenFile
+from eaclient.files.user_config_file import UserConfigData
+from eaclient.testing.contract_server import (
+    StandInContractServer,
+    parse_error_rates,
+)
+
+
+class SimulatedMachine:
+    def __init__(self, index: int, contract_url: str, workdir: str):
+        self.index = index
+        self.machine_id = "loadgen-{}-{}".format(index, uuid.uuid4().hex)
+        self.token = "loadgen-token-{}".format(index)
+        data_dir = os.path.join(workdir, "machine-{}".format(index))
+        self.cfg = EAConfig(
+            cfg={
+                "contract_url": contract_url,
+                "data_dir": data_dir,
+                "log_file": os.path.join(data_dir, "elxr-advantage.log"),
+            },
+            user_config=UserConfigData(),
+        )
+        self._write_machine_token()
+
+    def _write_machine_token(self):
+        # Seed both views directly: MachineTokenFile.write requires root
+        token_file = MachineTokenFile(directory=self.cfg.data_dir)
+        content = json.dumps(
+            {"machineId": self.machine_id, "token": self.token}
+        )
+        token_file.private_file.write(content)
+        token_file.public_file.write(content)
+
+    def run(self, cmd: str = "test"):
+        actions.action_to_request(self.cfg, cmd=cmd, token=self.token)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100.0 * len(sorted_values)) - 1
+    rank = min(max(rank, 0), len(sorted_values) - 1)
+    return sorted_values[rank]
+
+
+class LoadReport:
+    def __init__(
+        self, latencies: List[float], errors: Counter, elapsed: float
+    ):
+        self.latencies = sorted(latencies)
+        self.errors = errors
+        self.elapsed = elapsed
+
+    @property
+    def total(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def failed(self) -> int:
+        return sum(self.errors.values())
+
+    @property
+    def throughput(self) -> float:
+        if not self.elapsed:
+            return 0.0
+        return self.total / self.elapsed
+
+    def to_dict(self) -> Dict:
+        return {
+            "requests": self.total,
+            "failed": self.failed,
+            "errors": dict(self.errors),
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput, 2),
+            "p50": round(percentile(self.latencies, 50), 4),
+            "p95": round(percentile(self.latencies, 95), 4),
+            "p99": round(percentile(self.latencies, 99), 4),
+        }
+
+    def __str__(self):
+        report = self.to_dict()
+        lines = [
+            "requests:   {requests} ({failed} failed)".format(**report),
+            "elapsed:    {elapsed}s".format(**report),
+            "throughput: {throughput} req/s".format(**report),
+            "latency:    p50={p50}s p95={p95}s p99={p99}s".format(**report),
+        ]
+        for name, count in sorted(self.errors.items()):
+            lines.append("  {}: {}".format(name, count))
+        return "\n".join(lines)
+
+
+def run_load(
+    contract_url: str,
+    machines: int = 10,
+    iterations: int = 1,
+    concurrency: Optional[int] = None,
+    workdir: Optional[str] = None,
+) -> LoadReport:
+    """
+    Run iterations rounds of "test" for each simulated machine.
+
+    :param contract_url: base url of the contract server.
+    :param machines: number of simulated machines.
+    :param iterations: how many requests each machine performs.
+    :param concurrency: number of worker threads, defaults to machines.
+    :param workdir: where to create the per-machine data_dirs, defaults
+        to a temporary directory removed once done.
+    """
+    if workdir is None:
+        with tempfile.TemporaryDirectory(prefix="elxr-pro-loadgen-") as tmp:
+            return run_load(
+                contract_url, machines, iterations, concurrency, tmp
+            )
+    fleet = [
+        SimulatedMachine(i, contract_url, workdir) for i in range(machines)
+    ]
+
+    def _timed(machine: SimulatedMachine):
+        start = time.monotonic()
+        error = None
+        try:
+            machine.run()
+        except Exception as e:
+            error = type(e).__name__
+        return time.monotonic() - start, error
+
+    latencies = []  # type: List[float]
+    errors = Counter()  # type: Counter
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency or machines) as pool:
+        jobs = [
+            pool.submit(_timed, machine)
+            for _ in range(iterations)
+            for machine in fleet
+        ]
+        for job in jobs:
+            latency, error = job.result()
+            latencies.append(latency)
+            if error:
+                errors[error] += 1
+    return LoadReport(latencies, errors, time.monotonic() - started)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Drive simulated machines against a contract server"
+    )
+    parser.add_argument(
+        "--url",
+        help=(
+            "contract server to use, a local stand-in server is started "
+            "when omitted (never point this at {})".format(
+                defaults.BASE_CONTRACT_URL
+            )
+        ),
+    )
+    parser.add_argument("--machines", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--workdir", default=None)
+    parser.add_argument("--json", action="store_true")
+    stand_in = parser.add_argument_group("stand-in server")
+    stand_in.add_argument("--latency", type=float, default=0.0)
+    stand_in.add_argument("--jitter", type=float, default=0.0)
+    stand_in.add_argument(
+        "--error-rates", type=parse_error_rates, default={}
+    )
+    stand_in.add_argument("--response-size", type=int, default=0)
+    stand_in.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def main(sys_argv=None):
+    args = get_parser().parse_args(sys_argv)
+    # The client warns about host facts on every simulated machine
+    logging.getLogger("elxr-pro").addHandler(logging.NullHandler())
+    server = None
+    url = args.url
+    if not url:
+        server = StandInContractServer(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rates=args.error_rates,
+            response_size=args.response_size,
+            seed=args.seed,
+        ).start()
+        url = server.url
+    try:
+        report = run_load(
+            url,
+            machines=args.machines,
+            iterations=args.iterations,
+            concurrency=args.concurrency,
+            workdir=args.workdir,
+        )
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.json:
+        print(json.dumps(report.to_dict(), sort_keys=True))
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
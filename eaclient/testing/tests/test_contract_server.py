@@ -0,0 +1,101 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import http.client
+import json
+
+import pytest
+
+from eaclient.testing.contract_server import (
+    StandInContractServer,
+    parse_error_rates,
+)
+
+
+def _post(server, path, data, token="tok"):
+    host, port = server.server_address[:2]
+    conn = http.client.HTTPConnection(host, port, timeout=5)
+    try:
+        conn.request(
+            "POST",
+            path,
+            body=json.dumps(data),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": "Bearer {}".format(token),
+            },
+        )
+        resp = conn.getresponse()
+        return resp.status, resp.read()
+    finally:
+        conn.close()
+
+
+class TestStandInContractServer:
+    def test_answers_contract_actions(self):
+        with StandInContractServer() as server:
+            code, body = _post(
+                server, "/api/v1/actions/test", {"machineId": "m1"}
+            )
+            assert 200 == code
+            assert {"machineId": "m1", "token": "tok"} == json.loads(body)
+
+            code, body = _post(
+                server, "/api/v1/actions/join", {"machineId": "m1"}
+            )
+            assert 200 == code
+            assert "elxr-pro" == json.loads(body)["resources"][0]["type"]
+
+            code, body = _post(
+                server, "/api/v1/actions/leave", {"machineId": "m1"}
+            )
+            assert "Leave successful" == json.loads(body)["message"]
+
+        assert 3 == sum(server.requests.values())
+        assert {200: 3} == server.responses
+
+    def test_missing_token_is_unauthorized(self):
+        with StandInContractServer() as server:
+            code, _ = _post(
+                server, "/api/v1/actions/test", {"machineId": "m1"}, "None"
+            )
+        assert 401 == code
+
+    def test_unknown_path_not_found(self):
+        with StandInContractServer() as server:
+            code, _ = _post(server, "/api/v1/actions/other", {})
+        assert 404 == code
+
+    def test_error_rates_and_response_size(self):
+        with StandInContractServer(
+            error_rates={503: 1.0}, response_size=2048
+        ) as server:
+            code, body = _post(server, "/api/v1/actions/test", {})
+        assert 503 == code
+        assert "detail" in json.loads(body)
+
+        with StandInContractServer(response_size=2048) as server:
+            code, body = _post(server, "/api/v1/actions/test", {})
+        assert 200 == code
+        assert len(body) >= 2048
+
+    @pytest.mark.parametrize(
+        "error_rates", ({404: 0.1}, {401: 0.6, 503: 0.6})
+    )
+    def test_rejects_invalid_error_rates(self, error_rates):
+        with pytest.raises(ValueError):
+            StandInContractServer(error_rates=error_rates)
+
+    def test_parse_error_rates(self):
+        assert {401: 0.01, 503: 0.5} == parse_error_rates("401=0.01,503=0.5")
@@ -0,0 +1,81 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+
+import mock
+import pytest
+
+from eaclient import exceptions
+from eaclient.testing.loadgen import percentile, run_load
+
+
+class TestPercentile:
+    @pytest.mark.parametrize(
+        "values,pct,expected",
+        (
+            ([], 50, 0.0),
+            ([1.0], 99, 1.0),
+            ([1.0, 2.0, 3.0, 4.0], 50, 2.0),
+            ([float(i) for i in range(1, 101)], 95, 95.0),
+            ([float(i) for i in range(1, 101)], 99, 99.0),
+        ),
+    )
+    def test_nearest_rank(self, values, pct, expected):
+        assert expected == percentile(values, pct)
+
+
+class TestRunLoad:
+    @mock.patch("eaclient.actions.action_to_request")
+    def test_drives_distinct_machines(self, m_action_to_request, tmpdir):
+        failures = iter([exceptions.ServiceUnavailable()])
+
+        def _request(cfg, cmd, token):
+            try:
+                raise next(failures)
+            except StopIteration:
+                pass
+
+        m_action_to_request.side_effect = _request
+
+        report = run_load(
+            "http://127.0.0.1:1",
+            machines=4,
+            iterations=2,
+            workdir=tmpdir.strpath,
+        )
+
+        assert 8 == report.total
+        assert {"ServiceUnavailable": 1} == report.errors
+        cfgs = {c[0][0] for c in m_action_to_request.call_args_list}
+        assert 4 == len({cfg.data_dir for cfg in cfgs})
+        assert {"test"} == {
+            c[1]["cmd"] for c in m_action_to_request.call_args_list
+        }
+        assert 8 == report.to_dict()["requests"]
+
+    @mock.patch("eaclient.actions.action_to_request")
+    def test_temporary_workdir_removed(self, m_action_to_request, tmpdir):
+        with mock.patch.object(tempfile, "tempdir", tmpdir.strpath):
+            run_load("http://127.0.0.1:1", machines=2)
+
+        data_dirs = {
+            c[0][0].data_dir for c in m_action_to_request.call_args_list
+        }
+        assert 2 == len(data_dirs)
+        assert all(
+            data_dir.startswith(tmpdir.strpath) for data_dir in data_dirs
+        )
+        assert [] == os.listdir(tmpdir.strpath)
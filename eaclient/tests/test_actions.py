@@ -18,6 +18,7 @@ import pytest
 
 from eaclient import exceptions
 from eaclient.actions import action_to_request, enable_entitlements
+from eaclient.files.machine_token import EntitlementIndex
 
 
 class TestActionToRequest:
@@ -112,12 +113,9 @@ class TestActionToRequest:
             "token": "test-product-token",
             "machineId": machine_id,
         }
-        entitlements = {
-            "test-entitlement": {
-                "entitlement": {"uri": "https://repo.example.com"}
-            }
-        }
-        machine_token_file.entitlements.return_value = entitlements
+        machine_token_file.entitlement_index = EntitlementIndex(
+            [{"type": "test-entitlement", "uri": "https://repo.example.com"}]
+        )
 
         with mock.patch(
             "eaclient.system.ensure_file_absent"
@@ -133,7 +131,7 @@ class TestActionToRequest:
         m_ensure_file_absent.assert_called_once()
         m_remove_repo.assert_called_once_with("https://repo.example.com")
         machine_token_file.delete.assert_called_once()
-        m_delete_state.assert_called_once()
+        m_delete_state.assert_called_once_with(cfg.data_dir)
 
     @mock.patch("eaclient.system.get_machine_id")
     @mock.patch("eaclient.files.machine_token.get_machine_token_file")
@@ -0,0 +1,150 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+import mock
+import pytest
+
+from eaclient import config, defaults
+from eaclient.files.user_config_file import UserConfigData
+
+M_PATH = "eaclient.config."
+
+
+class TestLoadConfig:
+    def test_memoized_while_unchanged(self, tmpdir):
+        config_file = tmpdir.join("eaclient.conf")
+        config_file.write("log_level: info\n")
+
+        def _log_level():
+            return config.load_config(config_file.strpath)[0]["log_level"]
+
+        with mock.patch(
+            M_PATH + "parse_config", wraps=config.parse_config
+        ) as m_parse_config:
+            first = config.load_config(config_file.strpath)
+            assert first is config.load_config(config_file.strpath)
+            assert "info" == _log_level()
+            assert 1 == m_parse_config.call_count
+
+            config_file.write("log_level: warning\n")
+            assert "warning" == _log_level()
+            with mock.patch.dict("os.environ", {"EA_LOG_LEVEL": "error"}):
+                assert "error" == _log_level()
+            assert 3 == m_parse_config.call_count
+
+    def test_read_only(self, tmpdir):
+        config_file = tmpdir.join("eaclient.conf")
+        config_file.write("log_level: info\n")
+
+        cfg, _invalid_keys = config.load_config(config_file.strpath)
+        with pytest.raises(TypeError):
+            cfg["log_level"] = "debug"
+
+
+@mock.patch(M_PATH + "user_config_file.user_config.write")
+class TestEAConfig:
+    def test_update_user_config_writes_once(self, m_write, FakeConfig):
+        cfg = FakeConfig()
+        before = cfg.snapshot
+
+        cfg.update_user_config(
+            global_apt_http_proxy="http://proxy", ea_apt_http_proxy=None
+        )
+
+        assert [mock.call(cfg.user_config)] == m_write.call_args_list
+        assert "http://proxy" == cfg.global_apt_http_proxy
+        assert before.user_config.global_apt_http_proxy is None
+        assert before.cfg is cfg.cfg
+
+    def test_global_proxies_are_per_instance(self, _m_write, FakeConfig):
+        first = FakeConfig()
+        second = FakeConfig()
+
+        first.global_apt_https_proxy = "https://first"
+        second.user_config = UserConfigData(
+            global_apt_https_proxy="https://second"
+        )
+
+        assert "https://first" == first.global_apt_https_proxy
+        assert "https://second" == second.global_apt_https_proxy
+        second.global_apt_https_proxy = ""
+        assert second.global_apt_https_proxy is None
+
+    @pytest.mark.parametrize(
+        "cfg_overrides,log_async,queue_size",
+        (
+            ({}, False, defaults.DEFAULT_LOG_QUEUE_SIZE),
+            ({"log_async": True, "log_queue_size": 50}, True, 50),
+            ({"log_async": "yes", "log_queue_size": 0}, False, 10000),
+            ({"log_queue_size": True}, False, 10000),
+            ({"log_queue_size": "big"}, False, 10000),
+        ),
+    )
+    def test_async_logging_settings(
+        self, _m_write, cfg_overrides, log_async, queue_size, FakeConfig
+    ):
+        cfg = FakeConfig(cfg_overrides=cfg_overrides)
+
+        assert log_async is cfg.log_async
+        assert queue_size == cfg.log_queue_size
+
+    @pytest.mark.parametrize(
+        "cfg_overrides,max_bytes,backup_count",
+        (
+            (
+                {},
+                defaults.DEFAULT_LOG_MAX_BYTES,
+                defaults.DEFAULT_LOG_BACKUP_COUNT,
+            ),
+            ({"log_max_bytes": 0, "log_backup_count": 0}, 0, 0),
+            (
+                {"log_max_bytes": -1, "log_backup_count": "2"},
+                defaults.DEFAULT_LOG_MAX_BYTES,
+                defaults.DEFAULT_LOG_BACKUP_COUNT,
+            ),
+        ),
+    )
+    def test_log_rotation_settings(
+        self, _m_write, cfg_overrides, max_bytes, backup_count, FakeConfig
+    ):
+        cfg = FakeConfig(cfg_overrides=cfg_overrides)
+
+        assert max_bytes == cfg.log_max_bytes
+        assert backup_count == cfg.log_backup_count
+
+    @pytest.mark.parametrize(
+        "cfg_overrides,disk_level,buffer_size",
+        (
+            ({}, None, defaults.DEFAULT_LOG_BUFFER_SIZE),
+            (
+                {"log_disk_level": "warning", "log_buffer_size": 100},
+                logging.WARNING,
+                100,
+            ),
+            (
+                {"log_disk_level": "loud", "log_buffer_size": 0},
+                None,
+                defaults.DEFAULT_LOG_BUFFER_SIZE,
+            ),
+        ),
+    )
+    def test_flight_recorder_settings(
+        self, _m_write, cfg_overrides, disk_level, buffer_size, FakeConfig
+    ):
+        cfg = FakeConfig(cfg_overrides=cfg_overrides)
+
+        assert disk_level == cfg.log_disk_level
+        assert buffer_size == cfg.log_buffer_size
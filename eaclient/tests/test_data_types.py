@@ -32,6 +32,8 @@ from eaclient.data_types import (
     IntDataValue,
     StringDataValue,
     data_list,
+    datetime_decode_plan,
+    decode_datetimes,
 )
 
 M_PATH = "eaclient.data_types"
@@ -846,3 +848,132 @@ class TestDataObject:
     )
     def test_to_json(self, d, j):
         assert ExampleDataObject.from_dict(d).to_json() == j
+
+
+class TestDatetimeDecodePlan:
+    def test_plan(self):
+        class Inner(DataObject):
+            fields = [
+                Field("when", DatetimeDataValue, dict_key="When"),
+                Field("what", StringDataValue),
+            ]
+
+        class Outer(DataObject):
+            fields = [
+                Field("inner", Inner, required=False),
+                Field("inners", data_list(Inner)),
+                Field("dates", data_list(DatetimeDataValue)),
+                Field("names", data_list(StringDataValue)),
+                Field("count", IntDataValue),
+            ]
+
+        assert {
+            "inner": {"When": DatetimeDataValue},
+            "inners": [{"When": DatetimeDataValue}],
+            "dates": [DatetimeDataValue],
+        } == datetime_decode_plan(Outer)
+        assert datetime_decode_plan(StringDataValue) is None
+
+    def test_decode_datetimes(self):
+        dt = datetime.datetime(2001, 2, 3, tzinfo=datetime.timezone.utc)
+        plan = {"a": DatetimeDataValue, "b": [{"c": DatetimeDataValue}]}
+        value = {
+            "a": "2001-02-03T00:00:00Z",
+            "b": [{"c": "2001-02-03T00:00:00Z", "d": "2001-02-03T00:00:00Z"}],
+            "e": "2001-02-03T00:00:00Z",
+        }
+        assert {
+            "a": dt,
+            "b": [{"c": dt, "d": "2001-02-03T00:00:00Z"}],
+            "e": "2001-02-03T00:00:00Z",
+        } == decode_datetimes(value, plan)
+
+    @pytest.mark.parametrize("value", ("not a date", 1, None, [], {}))
+    def test_decode_datetimes_keeps_other_values(self, value):
+        assert value == decode_datetimes(value, DatetimeDataValue)
+
+
+class TestCompiledCodecs:
+    @pytest.mark.parametrize(
+        "d",
+        (
+            example_data_object_dict_no_optionals,
+            example_data_object_dict_with_optionals,
+        ),
+    )
+    def test_matches_reference_implementation(self, d):
+        reference_from_dict = DataObject.__dict__["from_dict"].__func__
+        expected = reference_from_dict(ExampleDataObject, d)
+        result = ExampleDataObject.from_dict(d)
+        assert expected == result
+        for keep_none in (True, False):
+            assert DataObject.to_dict(
+                expected, keep_none
+            ) == result.to_dict(keep_none)
+
+    def test_instances_use_slots(self):
+        class Extended(ExampleNestedObject):
+            fields = ExampleNestedObject.fields + [
+                Field("extra", StringDataValue, required=False)
+            ]
+
+            def __init__(self, *, string, integer, extra=None):
+                super().__init__(string=string, integer=integer)
+                self.extra = extra
+
+        assert ("string", "integer") == ExampleNestedObject.__slots__
+        assert ("extra",) == Extended.__slots__
+        obj = Extended.from_dict({"string": "a", "integer": 1, "extra": "b"})
+        assert {"string": "a", "integer": 1, "extra": "b"} == obj.to_dict()
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.other = 1
+
+    def test_hand_written_methods_are_kept(self):
+        class Custom(DataObject):
+            fields = [Field("string", StringDataValue)]
+
+            def __init__(self, *, string):
+                self.string = string
+
+            def to_dict(self, keep_none: bool = True) -> dict:
+                return {"custom": self.string}
+
+        class Child(Custom):
+            pass
+
+        assert {"custom": "a"} == Child.from_dict({"string": "a"}).to_dict()
+
+    def test_field_keys_that_are_not_identifiers(self):
+        class WithKeyword(DataObject):
+            fields = [
+                Field("from", StringDataValue),
+                Field("to", StringDataValue, required=False),
+            ]
+
+            def __init__(self, **kwargs):
+                setattr(self, "from", kwargs["from"])
+                self.to = kwargs["to"]
+
+        obj = WithKeyword.from_dict({"from": "a"})
+        assert {"from": "a", "to": None} == obj.to_dict()
+        assert obj == WithKeyword.from_dict({"from": "a", "to": None})
+        assert obj != WithKeyword.from_dict({"from": "b"})
+
+    @pytest.mark.parametrize(
+        "data_cls, val, expected",
+        (
+            (FloatDataValue, [1, 2.5], [1.0, 2.5]),
+            (FloatDataValue, [1.5, 2.5], [1.5, 2.5]),
+            (IntDataValue, [1, 2], [1, 2]),
+        ),
+    )
+    def test_data_list_converts_items(self, data_cls, val, expected):
+        result = data_list(data_cls).from_value(val)
+        assert expected == result
+        assert [type(v) for v in expected] == [type(v) for v in result]
+        assert val is not result
+
+    def test_data_list_rejects_bools_as_ints(self):
+        with pytest.raises(IncorrectListElementTypeError):
+            data_list(IntDataValue).from_value([1, True])
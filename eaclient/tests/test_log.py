@@ -12,9 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gzip
 import json
 import logging
+import os
+import queue
 import sys
+import time
 from io import StringIO
 
 import mock
@@ -26,6 +30,9 @@ LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
 LOG_FMT = "%(asctime)s%(name)s%(funcName)s%(lineno)s\
 %(levelname)s%(message)s%(extra)s"
 DATE_FMT = "%Y-%m-%dT%H:%M:%S%z"
+# Not under LOG, to only see what the handlers of each test emit
+REDACTION_LOG = logging.getLogger("redaction-test")
+REDACTION_LOG.propagate = False
 
 
 class TestLogger:
@@ -149,6 +156,367 @@ class TestLoggerFormatter:
             assert 7 == len(val)
 
 
+class TestJsonArrayFormatter:
+    def _record(self, created, **kwargs):
+        record = logging.LogRecord(
+            "elxr-pro.http",
+            logging.DEBUG,
+            "/usr/lib/python3/dist-packages/eaclient/http/__init__.py",
+            42,
+            "response: %s",
+            ({"é": [1, 2.5, None, True]},),
+            None,
+            func="readurl",
+        )
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        record.__dict__.update(kwargs)
+        return record
+
+    def test_output_matches_json_dumps(self):
+        record = self._record(1700000000.25, extra={"key": "value"})
+
+        formatted = log.JsonArrayFormatter().format(record)
+
+        assert (
+            json.dumps(
+                [
+                    record.asctime,
+                    "DEBUG",
+                    "elxr-pro.http",
+                    "readurl",
+                    42,
+                    "response: {'é': [1, 2.5, None, True]}",
+                    {"key": "value"},
+                ]
+            )
+            == formatted
+        )
+        assert record.asctime.endswith(".250")
+
+    @mock.patch("time.strftime", wraps=time.strftime)
+    def test_timestamp_rendered_once_per_second(self, m_strftime):
+        formatter = log.JsonArrayFormatter()
+        first = self._record(1700000000.125)
+        second = self._record(1700000000.875)
+        third = self._record(1700000001.0)
+
+        for record in (first, second, third):
+            formatter.format(record)
+
+        assert 2 == m_strftime.call_count
+        assert first.asctime[:-4] == second.asctime[:-4]
+        assert first.asctime.endswith(".125")
+        assert second.asctime.endswith(".875")
+        assert third.asctime.endswith(".000")
+        assert logging.Formatter().formatTime(
+            third, log.JsonArrayFormatter.default_time_format
+        ) == third.asctime[:-4]
+
+
+class TestRedaction:
+    @pytest.fixture
+    def json_handler(self):
+        buffer = StringIO()
+        handler = logging.StreamHandler(buffer)
+        handler.setFormatter(log.JsonArrayFormatter())
+        handler.setLevel(logging.INFO)
+        REDACTION_LOG.setLevel(logging.DEBUG)
+        REDACTION_LOG.addHandler(handler)
+        yield buffer
+        REDACTION_LOG.removeHandler(handler)
+
+    def test_arguments_are_redacted(self, json_handler):
+        REDACTION_LOG.info("Response %s", {"machineToken": "SEKRET"})
+
+        assert "SEKRET" not in json_handler.getvalue()
+        assert "<REDACTED>" in json.loads(json_handler.getvalue())[5]
+
+    @mock.patch("eaclient.secret_manager.secrets.redact_secrets")
+    def test_known_secrets_are_redacted(
+        self, m_redact_secrets, json_handler
+    ):
+        m_redact_secrets.side_effect = lambda m: m.replace("s3kr3t", "***")
+        REDACTION_LOG.info("password is %s", "s3kr3t")
+
+        assert "password is ***" == json.loads(json_handler.getvalue())[5]
+
+    @mock.patch("eaclient.log.redact")
+    def test_only_emitted_records_are_redacted(self, m_redact, json_handler):
+        m_redact.side_effect = lambda m: m
+        REDACTION_LOG.debug("'token': '%s'", "SEKRET")
+
+        assert "" == json_handler.getvalue()
+        assert 0 == m_redact.call_count
+
+        REDACTION_LOG.info("'token': '%s'", "SEKRET")
+        assert [mock.call("'token': 'SEKRET'")] == m_redact.call_args_list
+
+    def test_redacting_formatter(self):
+        buffer = StringIO()
+        handler = logging.StreamHandler(buffer)
+        handler.setFormatter(log.RedactingFormatter())
+        REDACTION_LOG.setLevel(logging.DEBUG)
+        REDACTION_LOG.addHandler(handler)
+        try:
+            REDACTION_LOG.warning("Authorization: %s'", "Bearer SEKRET")
+        finally:
+            REDACTION_LOG.removeHandler(handler)
+
+        assert "Authorization: Bearer <REDACTED>'\n" == buffer.getvalue()
+
+
+class TestAsyncLogging:
+    @pytest.fixture
+    def async_logging(self, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log")
+        logger = logging.getLogger("elxr-pro")
+        handlers = logger.handlers
+        log.setup_cli_logging(
+            logging.DEBUG, log_file.strpath, log_async=True, queue_size=10
+        )
+        yield log_file
+        log.stop_logging()
+        logger.handlers = handlers
+
+    def test_records_written_once_flushed(self, async_logging):
+        handler = logging.getLogger("elxr-pro").handlers[0]
+        assert isinstance(handler, log.BoundedQueueHandler)
+
+        token = {"token": "SEKRET"}
+        LOG.debug("data: %s", token)
+        token["token"] = "changed"
+        log.flush_logging()
+
+        lines = async_logging.read().splitlines()
+        assert 1 == len(lines)
+        assert "data: {'token': '<REDACTED>'}" == json.loads(lines[0])[5]
+
+        LOG.info("after flush")
+        log.stop_logging()
+        assert "after flush" in async_logging.read()
+
+    def test_setup_again_stops_previous_writer(self, async_logging):
+        LOG.info("first")
+        log.setup_cli_logging(logging.DEBUG, async_logging.strpath)
+
+        assert None is log._log_writer
+        assert "first" in async_logging.read()
+
+    @mock.patch("eaclient.log.FULL_QUEUE_TIMEOUT", 0.01)
+    def test_full_queue_drops_records(self):
+        handler = log.BoundedQueueHandler(queue.Queue(maxsize=1))
+        record = logging.makeLogRecord(
+            {"msg": "info", "levelno": logging.INFO}
+        )
+
+        handler.handle(record)
+        handler.handle(record)
+        handler.handle(
+            logging.makeLogRecord(
+                {"msg": "warning", "levelno": logging.WARNING}
+            )
+        )
+
+        assert 1 == handler.queue.qsize()
+        assert 2 == handler.take_dropped()
+        assert 0 == handler.dropped
+
+    def test_dropped_records_are_reported(self):
+        handler = log.BoundedQueueHandler(queue.Queue(maxsize=1))
+        target = mock.MagicMock(level=logging.DEBUG)
+        writer = log.LogWriter(handler, target)
+        handler.dropped = 3
+
+        writer.start()
+        writer.stop()
+
+        (record,) = [c[0][0] for c in target.handle.call_args_list]
+        assert logging.WARNING == record.levelno
+        assert "Dropped 3 log records" in record.getMessage()
+
+
+class TestFlightRecorder:
+    @pytest.fixture
+    def flight_recorder(self, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log")
+        logger = logging.getLogger("elxr-pro")
+        handlers = logger.handlers
+        log.setup_cli_logging(
+            logging.DEBUG,
+            log_file.strpath,
+            disk_level="warning",
+            buffer_size=2,
+        )
+        yield log_file
+        log._flight_recorder = None
+        logger.handlers = handlers
+
+    def _messages(self, log_file):
+        return [json.loads(line)[5] for line in log_file.readlines()]
+
+    def test_debug_records_written_on_dump(self, flight_recorder):
+        handler = logging.getLogger("elxr-pro").handlers[0]
+        assert isinstance(handler, log.FlightRecorderHandler)
+
+        token = {"token": "SEKRET"}
+        LOG.debug("first")
+        LOG.debug("data: %s", token)
+        token["token"] = "changed"
+        LOG.info("last")
+        LOG.warning("warning")
+
+        assert ["warning"] == self._messages(flight_recorder)
+
+        log.dump_flight_recorder()
+
+        assert [
+            "warning",
+            "Writing 2 buffered log records, 1 older ones were overwritten",
+            "data: {'token': '<REDACTED>'}",
+            "last",
+            "Wrote 2 buffered log records",
+        ] == self._messages(flight_recorder)
+        extras = [json.loads(line)[6] for line in flight_recorder.readlines()]
+        assert {log.DUMP_MARKER: "start"} == extras[1]
+        assert {log.DUMP_MARKER: "end"} == extras[4]
+        log.dump_flight_recorder()
+        assert 5 == len(self._messages(flight_recorder))
+
+    @pytest.mark.parametrize("disk_level", (None, "debug", "bogus"))
+    def test_off_unless_above_log_level(self, disk_level, tmpdir):
+        logger = logging.getLogger("elxr-pro")
+        handlers = logger.handlers
+        try:
+            log.setup_cli_logging(
+                logging.DEBUG,
+                tmpdir.join("elxr-pro.log").strpath,
+                disk_level=disk_level,
+            )
+            assert None is log._flight_recorder
+            assert isinstance(logger.handlers[0], logging.FileHandler)
+        finally:
+            logger.handlers = handlers
+
+
+class TestRotatingLogHandler:
+    def _handler(self, log_file, max_bytes=100, backup_count=2):
+        handler = log.RotatingLogHandler(
+            log_file.strpath, max_bytes, backup_count
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        return handler
+
+    def _emit(self, handler, message):
+        handler.handle(
+            logging.makeLogRecord({"msg": message, "levelno": logging.INFO})
+        )
+
+    @mock.patch("threading.Thread")
+    def test_rotates_and_compresses(self, m_thread, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log")
+        handler = self._handler(log_file, backup_count=3)
+
+        for i in range(5):
+            self._emit(handler, "{}".format(i) * 99)
+            if m_thread.call_args:
+                handler.compress_backups()
+        handler.close()
+
+        assert "4" * 99 + "\n" == log_file.read()
+        assert "3" * 99 + "\n" == tmpdir.join("elxr-pro.log.1").read()
+        with gzip.open(log_file.strpath + ".2.gz", "rt") as f:
+            assert "2" * 99 + "\n" == f.read()
+        with gzip.open(log_file.strpath + ".3.gz", "rt") as f:
+            assert "1" * 99 + "\n" == f.read()
+        assert not tmpdir.join("elxr-pro.log.2").exists()
+        assert not tmpdir.join("elxr-pro.log.4.gz").exists()
+        assert 0o640 == os.stat(log_file.strpath).st_mode & 0o777
+
+    def test_set_up_with_max_bytes(self, tmpdir):
+        logger = logging.getLogger("elxr-pro")
+        handlers = logger.handlers
+        try:
+            log.setup_cli_logging(
+                logging.INFO,
+                tmpdir.join("elxr-pro.log").strpath,
+                max_bytes=1024,
+                backup_count=3,
+            )
+            (handler,) = logger.handlers
+        finally:
+            logger.handlers = handlers
+        handler.close()
+
+        assert isinstance(handler, log.RotatingLogHandler)
+        assert (1024, 3) == (handler.maxBytes, handler.backupCount)
+
+    def test_without_backups_starts_over(self, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log")
+        handler = self._handler(log_file, backup_count=0)
+
+        self._emit(handler, "a" * 100)
+        self._emit(handler, "b")
+        handler.close()
+
+        assert "b\n" == log_file.read()
+        assert ["elxr-pro.log", "elxr-pro.log.lock"] == sorted(
+            p.basename for p in tmpdir.listdir()
+        )
+
+    @mock.patch("threading.Thread")
+    def test_follows_rotation_by_other_process(self, _m_thread, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log")
+        first = self._handler(log_file)
+        second = self._handler(log_file)
+
+        self._emit(second, "x" * 100)
+        self._emit(first, "rotates")
+        # second sees the file was rotated and doesn't rotate it again
+        self._emit(second, "reopened")
+        first.close()
+        second.close()
+
+        assert "rotates\nreopened\n" == log_file.read()
+        assert "x" * 100 + "\n" == tmpdir.join("elxr-pro.log.1").read()
+        assert not tmpdir.join("elxr-pro.log.2").exists()
+
+    @mock.patch("threading.Thread")
+    def test_concurrent_processes_lose_nothing(self, _m_thread, tmpdir):
+        """
+        Archives are compressed once all processes are done here: records
+        written right at a rotation go to <log file>.1, which is only left
+        alone for one rotation, and rotating every few records is far
+        faster than the real thing.
+        """
+        log_file = tmpdir.join("elxr-pro.log")
+
+        def write(name):
+            handler = self._handler(log_file, max_bytes=2000, backup_count=50)
+            for i in range(200):
+                self._emit(handler, "{}-{:03d}".format(name, i) + "." * 20)
+            handler.close()
+            os._exit(0)
+
+        pids = []
+        for name in ("a", "b", "c"):
+            pid = os.fork()
+            if pid == 0:
+                write(name)
+            pids.append(pid)
+        for pid in pids:
+            os.waitpid(pid, 0)
+        self._handler(log_file, backup_count=50).compress_backups()
+
+        lines = log_file.read().splitlines()
+        lines.extend(tmpdir.join("elxr-pro.log.1").read().splitlines())
+        for backup in tmpdir.listdir("elxr-pro.log.*.gz"):
+            with gzip.open(backup.strpath, "rt") as f:
+                lines.extend(f.read().splitlines())
+        assert 600 == len(lines)
+        assert 600 == len(set(lines))
+
+
 class TestLogHelpers:
     @pytest.mark.parametrize(
         [
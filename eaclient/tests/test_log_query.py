@@ -0,0 +1,292 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import gzip
+import json
+import os
+
+import mock
+import pytest
+
+from eaclient import log, log_query
+
+
+def _line(
+    second, level="DEBUG", logger="elxr-pro.actions", message="", extra=None
+):
+    return json.dumps(
+        [
+            "2025-03-21T10:{:02d}:{:02d}.000".format(*divmod(second, 60)),
+            level,
+            logger,
+            "action_to_request",
+            42,
+            message or "record {}".format(second),
+            extra or {},
+        ]
+    )
+
+
+def _write(path, seconds, **kwargs):
+    lines = "".join(_line(second, **kwargs) + "\n" for second in seconds)
+    if path.endswith(".gz"):
+        with gzip.open(path, "wt") as stream:
+            stream.write(lines)
+    else:
+        with open(path, "a") as stream:
+            stream.write(lines)
+
+
+class TestParseTime:
+    @pytest.mark.parametrize(
+        "value,expected",
+        (
+            ("2025-03-21", "2025-03-21T00:00:00.000"),
+            ("2025-03-21T10:00:01.5", "2025-03-21T10:00:01.500"),
+            ("2025-03-21 10:00:01", "2025-03-21T10:00:01.000"),
+        ),
+    )
+    def test_local_time(self, value, expected):
+        assert expected == log_query.parse_time(value)
+
+    def test_utc_offset_converted_to_local_time(self):
+        moment = datetime.datetime(
+            2025, 3, 21, 10, tzinfo=datetime.timezone.utc
+        )
+        expected = moment.astimezone().strftime("%Y-%m-%dT%H:%M:%S.000")
+
+        assert expected == log_query.parse_time("2025-03-21T10:00:00+00:00")
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            log_query.parse_time("yesterday")
+
+
+class TestQuery:
+    @pytest.fixture
+    def log_file(self, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log").strpath
+        _write(log_file + ".2.gz", range(0, 10))
+        _write(log_file + ".1", range(10, 20))
+        _write(log_file, range(20, 25), level="INFO", logger="elxr-pro.cli")
+        _write(log_file, [25], level="ERROR", message="Failed: Bad Token")
+        tmpdir.join("elxr-pro.log.lock").write("")
+        return log_file
+
+    def test_log_files_oldest_first(self, log_file):
+        assert [
+            log_file + ".2.gz",
+            log_file + ".1",
+            log_file,
+        ] == log_query.log_files(log_file)
+
+    def test_all_entries_oldest_first(self, log_file):
+        entries = list(log_query.query(log_file))
+
+        assert 26 == len(entries)
+        assert "record 0" == entries[0].message
+        assert "Failed: Bad Token" == entries[-1].message
+        assert 42 == entries[0].line
+
+    @pytest.mark.parametrize(
+        "filters,seconds",
+        (
+            ({"level": "info"}, list(range(20, 26))),
+            ({"level": "error"}, [25]),
+            ({"logger": "elxr-pro"}, list(range(0, 26))),
+            ({"logger": "elxr-pro.cli"}, list(range(20, 25))),
+            ({"logger": "elxr-pro.cl"}, []),
+            ({"function": "main"}, []),
+            ({"text": "bad token"}, [25]),
+            ({"text": "RECORD 1"}, [1] + list(range(10, 20))),
+            (
+                {
+                    "since": "2025-03-21T10:00:08.000",
+                    "until": "2025-03-21T10:00:12.000",
+                },
+                list(range(8, 13)),
+            ),
+        ),
+    )
+    def test_filters(self, filters, seconds, log_file):
+        entries = log_query.query(log_file, **filters)
+
+        assert seconds == [int(entry.time[-6:-4]) for entry in entries]
+
+    def test_malformed_lines_skipped(self, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log")
+        log_file.write("not json\n[1, 2]\n" + _line(1) + "\n" + _line(2)[:10])
+
+        assert ["record 1"] == [
+            entry.message for entry in log_query.query(log_file.strpath)
+        ]
+
+
+@mock.patch("eaclient.log_query.INDEX_STEP", 500)
+class TestLogIndex:
+    def _query(self, log_file, index, since, until=None):
+        return [
+            entry.time
+            for entry in log_query.query(
+                log_file, index=index, since=since, until=until
+            )
+        ]
+
+    def test_time_range_seeks(self, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log").strpath
+        _write(log_file + ".1.gz", range(0, 100))
+        _write(log_file, range(100, 200))
+        index = log_query.LogIndex(tmpdir.join("index.json").strpath)
+        since = "2025-03-21T10:02:30.000"
+        until = "2025-03-21T10:02:40.000"
+
+        read = {}
+        read_lines = log_query.read_lines
+
+        def counting_read_lines(path, *args):
+            read[path] = 0
+            for line in read_lines(path, *args):
+                read[path] += 1
+                yield line
+
+        with mock.patch.object(log_query, "read_lines", counting_read_lines):
+            times = self._query(log_file, index, since, until)
+
+        assert self._query(log_file, None, since, until) == times
+        assert 11 == len(times)
+        # Only the lines after the last index entry of the archive and
+        # around the range in the current log are read
+        assert read[log_file + ".1.gz"] < 10
+        assert 11 < read[log_file] < 30
+
+    def test_saved_and_extended(self, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log").strpath
+        index_file = tmpdir.join("index.json").strpath
+        _write(log_file, range(0, 50))
+        index = log_query.LogIndex(index_file)
+        self._query(log_file, index, "2025-03-21T10:00:30.000")
+        index.save()
+
+        _write(log_file, range(50, 100))
+        index = log_query.LogIndex(index_file)
+        with open(log_file, "rb") as stream:
+            with mock.patch.object(
+                stream, "seek", side_effect=stream.seek
+            ) as m_seek:
+                checkpoints = index.checkpoints(log_file, stream)
+
+        offsets = [offset for _, offset in checkpoints]
+        assert offsets == sorted(set(offsets))
+        assert 0 == offsets[0]
+        # Indexing resumes where the previous index stopped
+        assert m_seek.call_args_list[-1][0][0] > 0
+        assert "2025-03-21T10:01:30.000" == self._query(
+            log_file, index, "2025-03-21T10:01:30.000"
+        )[0]
+
+    def test_replaced_file_indexed_again(self, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log").strpath
+        index = log_query.LogIndex(tmpdir.join("index.json").strpath)
+        _write(log_file, range(0, 50))
+        self._query(log_file, index, "2025-03-21T10:00:30.000")
+
+        with open(log_file, "w"):
+            pass
+        _write(log_file, range(100, 110))
+
+        assert 10 == len(self._query(log_file, index, "2025-03-21"))
+
+    def test_reused_inode_indexed_again(self, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log").strpath
+        index = log_query.LogIndex(tmpdir.join("index.json").strpath)
+        _write(log_file, range(100, 150))
+        self._query(log_file, index, "2025-03-21T10:01:50.000")
+
+        # Larger than the file indexed, but with older records
+        with open(log_file, "w"):
+            pass
+        _write(log_file, range(0, 100))
+
+        assert 11 == len(
+            self._query(
+                log_file,
+                index,
+                "2025-03-21T10:00:10.000",
+                "2025-03-21T10:00:20.000",
+            )
+        )
+
+    def test_file_read_is_indexed(self, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log").strpath
+        index = log_query.LogIndex(tmpdir.join("index.json").strpath)
+        _write(log_file, range(0, 50))
+        with open(log_file, "rb") as stream:
+            # Rotated after it was opened
+            os.rename(log_file, log_file + ".1")
+            _write(log_file, range(50, 60))
+            index.checkpoints(log_file, stream)
+        index.save()
+
+        # Not taken for the index of the new log file
+        index = log_query.LogIndex(tmpdir.join("index.json").strpath)
+        with open(log_file, "rb") as stream:
+            checkpoints = index.checkpoints(log_file, stream)
+        assert ("2025-03-21T10:00:50.000", 0) == checkpoints[0]
+
+    def test_save_drops_files_gone(self, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log").strpath
+        index_file = tmpdir.join("index.json").strpath
+        _write(log_file + ".1", range(0, 50))
+        _write(log_file, range(50, 100))
+        index = log_query.LogIndex(index_file)
+        self._query(log_file, index, "2025-03-21T10:00:30.000")
+        index.save(log_file)
+        with open(index_file) as stream:
+            assert 2 == len(json.load(stream))
+
+        os.remove(log_file + ".1")
+        index = log_query.LogIndex(index_file)
+        index.save(log_file)
+
+        with open(index_file) as stream:
+            assert 1 == len(json.load(stream))
+
+    def test_flight_recorder_dumps_found(self, tmpdir):
+        log_file = tmpdir.join("elxr-pro.log").strpath
+        index = log_query.LogIndex(tmpdir.join("index.json").strpath)
+        _write(log_file, range(0, 100))
+        # Records kept since 10:00:20 dumped after 10:01:40 was written
+        _write(log_file, [100], extra={log.DUMP_MARKER: "start"})
+        _write(log_file, range(20, 26))
+        _write(log_file, [100], extra={log.DUMP_MARKER: "end"})
+        _write(log_file, range(101, 200))
+        since = "2025-03-21T10:00:22.000"
+        until = "2025-03-21T10:00:24.000"
+
+        times = self._query(log_file, index, since, until)
+
+        assert self._query(log_file, None, since, until) == times
+        # Once in order and once from the dump
+        assert [since] * 2 == [time for time in times if time == since]
+        assert 6 == len(times)
+        with open(log_file, "rb") as stream:
+            timestamps = [t for t, _ in index.checkpoints(log_file, stream)]
+            dump_start = stream.read().index(log.DUMP_MARKER.encode())
+            later = index.ranges(
+                log_file, stream, "2025-03-21T10:02:30.000"
+            )
+        # The dump is not indexed, nor read for records logged later
+        assert timestamps == sorted(timestamps)
+        assert all(start > dump_start for start, _ in later)
@@ -0,0 +1,160 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import fcntl
+import json
+import os
+import stat
+import threading
+import time
+
+import mock
+import pytest
+
+from eaclient import http, singleflight
+
+KEY = ["test", "https://contracts", "machine-id", "token"]
+
+
+def _response(body='{"machineId": "machine-id"}', code=200):
+    return http.HTTPResponse(
+        code=code,
+        headers={"content-type": "application/json"},
+        body=body,
+        json_dict=json.loads(body),
+        json_list=[],
+    )
+
+
+def _paths(tmpdir):
+    name = "singleflight-{}".format(singleflight._key_digest(KEY))
+    return (
+        tmpdir.join(name + ".lock").strpath,
+        tmpdir.join(name + ".json").strpath,
+    )
+
+
+def _in_threads(target, count):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(target()))
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+class TestSingleFlight:
+    def test_leader_removes_response_nobody_waits_for(self, tmpdir):
+        request = mock.Mock(return_value=_response())
+
+        assert _response() == singleflight.do(
+            KEY, request, directory=tmpdir.strpath
+        )
+
+        assert 1 == request.call_count
+        _, shared_path = _paths(tmpdir)
+        assert not os.path.exists(shared_path)
+
+    def test_shared_response_is_private(self, tmpdir):
+        _, shared_path = _paths(tmpdir)
+        singleflight._write_shared(shared_path, _response())
+        assert 0o600 == stat.S_IMODE(os.stat(shared_path).st_mode)
+
+    def test_followers_reuse_concurrent_response(self, tmpdir):
+        lock_path, shared_path = _paths(tmpdir)
+        request = mock.Mock(return_value=_response(code=503))
+
+        with open(lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            threads, results = _in_threads(
+                lambda: singleflight.do(
+                    KEY, request, directory=tmpdir.strpath
+                ),
+                3,
+            )
+            time.sleep(0.1)
+            singleflight._write_shared(shared_path, _response())
+        for thread in threads:
+            thread.join()
+
+        assert [_response()] * 3 == results
+        assert 0 == request.call_count
+        # The last follower to read it removed it
+        assert not os.path.exists(shared_path)
+
+    def test_followers_of_failed_leader_run_alongside(self, tmpdir):
+        lock_path, _ = _paths(tmpdir)
+
+        def request():
+            time.sleep(0.3)
+            raise OSError("timed out")
+
+        def follow():
+            try:
+                singleflight.do(KEY, request, directory=tmpdir.strpath)
+            except OSError as e:
+                return str(e)
+
+        with open(lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            threads, results = _in_threads(follow, 3)
+            time.sleep(0.1)
+        failed_at = time.time()
+        for thread in threads:
+            thread.join()
+
+        assert ["timed out"] * 3 == results
+        # Not one after the other while holding the lock
+        assert time.time() - failed_at < 0.6
+
+    def test_stale_response_is_not_reused(self, tmpdir):
+        _, shared_path = _paths(tmpdir)
+        singleflight._write_shared(shared_path, _response(code=503))
+        request = mock.Mock(return_value=_response())
+
+        assert _response() == singleflight.do(
+            KEY, request, directory=tmpdir.strpath
+        )
+        assert 1 == request.call_count
+
+    def test_failures_are_not_shared(self, tmpdir):
+        request = mock.Mock(side_effect=[OSError("boom"), _response()])
+
+        with pytest.raises(OSError):
+            singleflight.do(KEY, request, directory=tmpdir.strpath)
+        assert _response() == singleflight.do(
+            KEY, request, directory=tmpdir.strpath
+        )
+        assert 2 == request.call_count
+
+    def test_gives_up_waiting(self, tmpdir):
+        lock_path, _ = _paths(tmpdir)
+        request = mock.Mock(return_value=_response())
+
+        with open(lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            assert _response() == singleflight.do(
+                KEY, request, directory=tmpdir.strpath, wait_timeout=0.1
+            )
+        assert 1 == request.call_count
+
+    def test_keys_are_independent(self, tmpdir):
+        request = mock.Mock(return_value=_response())
+        singleflight.do(KEY, request, directory=tmpdir.strpath)
+        singleflight.do(
+            KEY[:-1] + ["other-token"], request, directory=tmpdir.strpath
+        )
+        assert 2 == request.call_count
@@ -69,6 +69,36 @@ class TestDatetimeAwareJSONDecoder:
     def test_encode(self, input, out):
         assert out == json.loads(input, cls=util.DatetimeAwareJSONDecoder)
 
+    @pytest.mark.parametrize(
+        "value",
+        (
+            "aria",
+            "https://packages.elxr.pro/elxr-pro",
+            "2024-password",
+            "2001-02-03",
+            "2001-02-03T04:05:06",
+            "2001-02-03T04:05:06.123456789Z",
+            "2001-02-03T04:05:06+0900",
+            "2001-02-03T04:05:06-04:30",
+            "2001-02-03T04:05:06+09:60",
+            "2001-02-03T04:05:06+09:00:30",
+            "2001-2-3T4:5:6Z",
+            "2001-02-03t04:05:06Z",
+            "2001-13-03T04:05:06Z",
+            "2001-02-03T04:05:06Z ",
+        ),
+    )
+    def test_matches_parse_rfc3339_date(self, value):
+        try:
+            expected = util.parse_rfc3339_date(value)
+        except ValueError:
+            expected = value
+        decoded = json.loads(
+            json.dumps({"value": value}), cls=util.DatetimeAwareJSONDecoder
+        )["value"]
+        assert type(expected) is type(decoded)
+        assert expected == decoded
+
 
 @mock.patch("builtins.input")
 class TestPromptForConfirmation:
@@ -180,6 +210,57 @@ class TestRedactSensitiveLogs:
         """Redact all sensitive matches from log messages."""
         assert expected == util.redact_sensitive_logs(raw_log)
 
+    @pytest.mark.parametrize(
+        "raw_log",
+        (
+            "Super valuable",
+            "['/usr/bin/elxr-pro', 'test', 'SEKRET']",
+            "headers: {'Authorization': 'Bearer SEKRET'}, data: "
+            "{'machineToken': 'SEKRET', 'productToken': 'SEKRET'}",
+            "[PUT] response: http://169.254.169.254/latest/api/token, "
+            "headers: {'X-aws-ec2-metadata-token': 'SEKRET'}, data: SEKRET",
+            "first line 'token': 'SEKRET'\n"
+            "[PUT] response: http://x/api/token, data: SEKRET\n"
+            "Contract value for 'resourceToken' changed to SEKRET",
+            "'magic_token=SEKRET' 'userCode': 'SEKRET'",
+            "run --registration-key SEKRET -p SEKRET",
+            "--registration-key SEKRET --registration-key=SEKRET",
+            "--registration-key abc'token': 'SEKRET'",
+            "-p Contract value for 'resourceToken' changed to SEKRET",
+            "-p pa'SEKRET",
+            "-p 'token': 'SEKRET",
+        ),
+    )
+    def test_merged_regexs_match_applying_them_in_turn(self, raw_log):
+        in_turn = util.redact_sensitive_logs(
+            raw_log, list(util.REDACT_SENSITIVE_LOGS)
+        )
+        assert in_turn == util.redact_sensitive_logs(raw_log)
+        assert "SEKRET" not in in_turn
+
+    def test_quoted_arguments_keep_their_quotes(self):
+        """The unquoted regexs stop at quotes."""
+        assert (
+            "run --registration-key='<REDACTED>' -p \"<REDACTED>\""
+            == util.redact_sensitive_logs(
+                "run --registration-key='SEKRET' -p \"SEKRET\""
+            )
+        )
+
+    def test_every_regex_needs_a_prefilter_literal(self):
+        for regex in util.REDACT_SENSITIVE_LOGS:
+            unescaped = regex.replace("\\", "")
+            assert any(
+                literal in unescaped
+                for literal in util.REDACT_SENSITIVE_LITERALS
+            ), regex
+
+    def test_clean_content_is_returned_as_is(self):
+        log = "Nothing to see here"
+        with mock.patch("re.sub") as m_sub:
+            assert log is util.redact_sensitive_logs(log)
+        assert 0 == m_sub.call_count
+
     @pytest.mark.parametrize(
         "raw_log,expected",
         (
@@ -254,6 +335,43 @@ class TestRedactSensitiveLogs:
         assert expected == secret_manager_fixture.redact_secrets(raw_log)
 
 
+class TestSecretManager:
+    def test_secrets_are_stored_once(self):
+        manager = secret_manager.SecretManager()
+        for secret in ("SEKRET", "", "other", "SEKRET", None, "other"):
+            manager.add_secret(secret)
+
+        assert ["SEKRET", "other"] == manager.secrets
+        manager.clear_secrets()
+        assert [] == manager.secrets
+        assert "SEKRET" == manager.redact_secrets("SEKRET")
+
+    def test_longest_secret_wins(self):
+        manager = secret_manager.SecretManager()
+        manager.add_secret("key")
+        manager.add_secret("reg-key-123")
+
+        assert "<REDACTED> and <REDACTED>" == manager.redact_secrets(
+            "reg-key-123 and key"
+        )
+
+    def test_secrets_are_matched_literally(self):
+        manager = secret_manager.SecretManager()
+        manager.add_secret("a.c")
+
+        assert "abc <REDACTED>" == manager.redact_secrets("abc a.c")
+
+    def test_secrets_added_later_are_redacted(self):
+        manager = secret_manager.SecretManager()
+        manager.add_secret("first")
+        assert "<REDACTED> second" == manager.redact_secrets("first second")
+
+        manager.add_secret("second")
+        assert "<REDACTED> <REDACTED>" == manager.redact_secrets(
+            "first second"
+        )
+
+
 class TestParseRFC3339Date:
     @pytest.mark.parametrize(
         "datestring,expected",
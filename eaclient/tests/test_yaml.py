@@ -0,0 +1,73 @@
+# Copyright (c) 2025 Wind River Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import pytest
+import yaml as pyyaml
+
+from eaclient import yaml
+
+M_PATH = "eaclient.yaml."
+
+
+class TestSafeLoadConfig:
+    @pytest.mark.parametrize(
+        "content",
+        (
+            "log_level: debug\ncontract_url: https://api.elxr.pro\n",
+            "# comment\n\nlog_level: debug  # trailing comment\n",
+            "data_dir: /var/lib/elxr-pro\nlog_file: /var/log/pro.log",
+            "key: value\nkey: other\n",
+        ),
+    )
+    @mock.patch(M_PATH + "_get_yaml")
+    def test_flat_content_without_pyyaml(self, m_get_yaml, content):
+        assert pyyaml.safe_load(content) == yaml.safe_load_config(content)
+        assert 0 == m_get_yaml.call_count
+
+    @pytest.mark.parametrize(
+        "content",
+        (
+            "",
+            "# only a comment\n",
+            "log_level: 10\n",
+            "log_level: yes\n",
+            "log_level: Off\n",
+            "log_level: null\n",
+            "log_level: ~\n",
+            "log_level:\n",
+            "log_level: 'debug'\n",
+            "log_level: debug info\n",
+            "log_level: [debug]\n",
+            "nested:\n  key: value\n",
+            "---\nlog_level: debug\n",
+            "log_level: debug\n...\n",
+            "log_level: &anchor debug\n",
+            "log_level: debug\r\n",
+        ),
+    )
+    def test_other_content_uses_pyyaml(self, content):
+        assert yaml._parse_flat_mapping(content) is None
+        assert pyyaml.safe_load(content) == yaml.safe_load_config(content)
+
+
+class TestSafeDump:
+    def test_matches_pyyaml(self):
+        data = {"b": [1, "two", None], "a": {"nested": True}}
+        assert pyyaml.safe_dump(
+            data, default_flow_style=False
+        ) == yaml.safe_dump(data, default_flow_style=False)
+
+    def test_parser_is_pyyaml_parser(self):
+        assert pyyaml.parser is yaml.parser
@@ -19,7 +19,7 @@ import os
 import re
 import time
 from functools import wraps
-from typing import Any, Dict, List, Optional, Union  # noqa: F401
+from typing import Any, Dict, List, Optional, Tuple, Union  # noqa: F401
 
 from eaclient import messages
 
@@ -68,17 +68,59 @@ class DatetimeAwareJSONDecoder(json.JSONDecoder):
     def object_hook(o):
         for key, value in o.items():
             if isinstance(value, str):
-                try:
-                    new_value = parse_rfc3339_date(
-                        value
-                    )  # type: Union[str, datetime.datetime]
-                except ValueError:
-                    # This isn't a string containing a valid ISO 8601 datetime
-                    new_value = value
-                o[key] = new_value
+                o[key] = _parse_datetime_value(value)
         return o
 
 
+# The canonical RFC 3339 shape, as produced by golang and isoformat()
+_RFC3339_RE = re.compile(
+    r"(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.\d+)?"
+    r"(?:Z|([+-]\d{2}):?(\d{2}))?",
+    re.ASCII,
+)
+# Shortest string parse_rfc3339_date accepts, e.g. "2001-2-3T4:5:6Z"
+_RFC3339_MIN_LENGTH = 15
+
+
+def _datetime_from_match(match) -> datetime.datetime:
+    date_time, offset_hours, offset_minutes = match.groups()
+    if not offset_hours:
+        offset_hours, offset_minutes = "+00", "00"
+    elif int(offset_minutes) > 59:
+        raise ValueError("invalid utc offset")
+    return datetime.datetime.fromisoformat(
+        "{}{}:{}".format(date_time, offset_hours, offset_minutes)
+    )
+
+
+def _parse_datetime_value(value: str) -> Union[str, datetime.datetime]:
+    """
+    Return value as a datetime if parse_rfc3339_date accepts it, else value.
+
+    Ordinary strings are rejected by a few cheap checks on their shape
+    before any parsing is attempted.
+    """
+    if (
+        len(value) < _RFC3339_MIN_LENGTH
+        or value[4] != "-"
+        or not value[:4].isdigit()
+        or not value[5].isdigit()
+        or not (value[-1] == "Z" or value[-1].isdigit())
+    ):
+        return value
+    match = _RFC3339_RE.fullmatch(value)
+    if match:
+        try:
+            return _datetime_from_match(match)
+        except ValueError:
+            pass
+    # Unusual but possibly valid forms, e.g. single digit fields
+    try:
+        return parse_rfc3339_date(value)
+    except ValueError:
+        return value
+
+
 def retry(exception, retry_sleeps):
     """Decorator to retry on exception for retry_sleeps.
 
@@ -167,13 +209,159 @@ REDACT_SENSITIVE_LOGS = [
 ]
 
 
+# Every regex in REDACT_SENSITIVE_LOGS needs one of these to match, so
+# content with none of them is returned as is
+REDACT_SENSITIVE_LITERALS = (
+    "Bearer ",
+    "bearer:",
+    "join",
+    "test",
+    "oken",
+    "userCode",
+    "--registration-key",
+    "-p ",
+)
+
+_merged_redact_regexs = None  # type: Optional[List[Tuple[Any, Dict]]]
+_any_redact_regex = None  # type: Optional[Any]
+
+
+def _split_redact_regexs(
+    redact_regexs: List[str],
+) -> Tuple[List[str], List[str]]:
+    """
+    The regexes that take the rest of the line after a match, and the
+    others. Those starting with .* can only match from the start of the
+    line, anchoring them saves retrying them at every position.
+    """
+    line_regexs = []
+    other_regexs = []
+    for regex in redact_regexs:
+        if regex.startswith("(.*"):
+            line_regexs.append("^" + regex)
+        elif regex.endswith(".*"):
+            line_regexs.append(regex)
+        else:
+            other_regexs.append(regex)
+    return line_regexs, other_regexs
+
+
+def _merge_redact_regexs(redact_regexs: List[str]) -> List[Tuple[Any, Dict]]:
+    """
+    Merge redact_regexs into alternations that are each applied in a
+    single scan. Each regex is a named group, mapped to the index of its
+    own first group, which is kept in front of <REDACTED>.
+
+    Regexes that take the rest of the line after a match are applied in a
+    first pass. They keep what comes before their secret, where the others
+    still find theirs, and no value matched by the others can swallow the
+    start of them.
+    """
+    line_regexs, other_regexs = _split_redact_regexs(redact_regexs)
+    merged = []
+    for regexs in (line_regexs, other_regexs):
+        alternatives = []
+        first_groups = {}
+        group = 0
+        for i, regex in enumerate(regexs):
+            name = "r{}".format(i)
+            alternatives.append("(?P<{}>{})".format(name, regex))
+            first_groups[name] = group + 2
+            group += 1 + re.compile(regex).groups
+        merged.append(
+            (
+                re.compile(
+                    "{}(?:{})".format(
+                        _first_chars_lookahead(regexs), "|".join(alternatives)
+                    )
+                ),
+                first_groups,
+            )
+        )
+    return merged
+
+
+def _any_of_redact_regexs(redact_regexs: List[str]) -> Any:
+    """
+    A regex finding where the first of redact_regexs matches, to check
+    that a match of the merged regexes didn't swallow the start of
+    another one.
+    """
+    line_regexs, other_regexs = _split_redact_regexs(redact_regexs)
+    return re.compile(
+        "|".join(
+            "(?:{})".format(regex) for regex in line_regexs + other_regexs
+        )
+    )
+
+
+def _first_chars_lookahead(regexs: List[str]) -> str:
+    """
+    A lookahead for the characters the regexes can start with, which lets
+    the merged regex skip every other position at once instead of trying
+    each alternative there. Empty unless all start with a literal.
+    """
+    first_chars = set()
+    for regex in regexs:
+        literal = regex[1:] if regex.startswith("(") else regex
+        if literal.startswith("\\") and not literal[1:2].isalnum():
+            literal = literal[1:]
+        if not literal or literal[0] in ".^$*+?{}[]()|\\":
+            return ""
+        first_chars.add(literal[0])
+    if not first_chars:
+        return ""
+    return "(?=[{}])".format(
+        "".join(re.escape(char) for char in sorted(first_chars))
+    )
+
+
 def redact_sensitive_logs(
     log, redact_regexs: List[str] = REDACT_SENSITIVE_LOGS
 ) -> str:
-    """Redact known sensitive information from log content."""
+    """
+    Redact known sensitive information from log content.
+
+    The default regexes are merged and applied line by line, to the lines
+    that have one of REDACT_SENSITIVE_LITERALS. They are applied in turn
+    to lines where one match overlaps another. Other redact_regexs are
+    applied in turn to the whole content.
+    """
+    if redact_regexs is not REDACT_SENSITIVE_LOGS:
+        redacted_log = log
+        for redact_regex in redact_regexs:
+            redacted_log = re.sub(
+                redact_regex, r"\g<1><REDACTED>", redacted_log
+            )
+        return redacted_log
+
+    if not any(literal in log for literal in REDACT_SENSITIVE_LITERALS):
+        return log
+    if "\n" in log:
+        # Most lines of a whole log are clean, skipping them beats
+        # scanning them for any of the regexes
+        return "\n".join(map(redact_sensitive_logs, log.split("\n")))
+    global _merged_redact_regexs, _any_redact_regex
+    if _merged_redact_regexs is None:
+        _merged_redact_regexs = _merge_redact_regexs(REDACT_SENSITIVE_LOGS)
+        _any_redact_regex = _any_of_redact_regexs(REDACT_SENSITIVE_LOGS)
+    overlapping = []
+
+    def replace(match, first_groups):
+        # Another regex matching from inside this match may have a secret
+        # past its end, which the scan, resuming at the end, can't find
+        other = _any_redact_regex.search(match.string, match.start() + 1)
+        if other is not None and other.start() < match.end():
+            overlapping.append(other)
+        return match.group(first_groups[match.lastgroup]) + "<REDACTED>"
+
     redacted_log = log
-    for redact_regex in redact_regexs:
-        redacted_log = re.sub(redact_regex, r"\g<1><REDACTED>", redacted_log)
+    for merged_regex, first_groups in _merged_redact_regexs:
+        redacted_log = merged_regex.sub(
+            lambda match: replace(match, first_groups), redacted_log
+        )
+        if overlapping:
+            return redact_sensitive_logs(log, list(REDACT_SENSITIVE_LOGS))
     return redacted_log
 
 
@@ -12,25 +12,68 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+"""
+Thin wrapper around PyYAML.
+
+PyYAML is only imported on first use, and its libyaml based CSafeLoader
+and CSafeDumper are used when available. safe_load_config reads the flat
+`key: value` files like eaclient.conf without importing PyYAML at all.
+"""
+
 import logging
+import re
 import sys
+from typing import Any, Dict, Optional
 
 from eaclient import util
 from eaclient.messages import BROKEN_YAML_MODULE, MISSING_YAML_MODULE
 
 LOG = logging.getLogger(util.replace_top_level_logger_name(__name__))
 
-try:
-    import yaml
-except ImportError as e:
-    LOG.exception(e)
-    print(MISSING_YAML_MODULE, file=sys.stderr)
-    sys.exit(1)
+_yaml = None
+
+# A line of a flat config: an identifier key and a plain string value,
+# optionally followed by a comment
+_FLAT_LINE_RE = re.compile(
+    r"(?P<key>[A-Za-z_][A-Za-z0-9_]*): +"
+    r"(?P<value>[A-Za-z_/][^\s#]*)"
+    r"(?: +#.*)? *"
+)
+_BLANK_OR_COMMENT_RE = re.compile(r" *(?:#.*)?")
+# Plain scalars that YAML 1.1 resolves to something else than a string
+_NON_STRING_WORDS = frozenset(
+    ("y", "yes", "n", "no", "true", "false", "on", "off", "null")
+)
+
+
+def _get_yaml():
+    global _yaml
+    if _yaml is None:
+        try:
+            import yaml
+        except ImportError as e:
+            LOG.exception(e)
+            print(MISSING_YAML_MODULE, file=sys.stderr)
+            sys.exit(1)
+        _yaml = yaml
+    return _yaml
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `eaclient.yaml.parser` working without importing PyYAML early
+    if name == "parser":
+        return _get_yaml().parser
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name)
+    )
 
 
 def safe_load(stream):
+    yaml = _get_yaml()
     try:
-        return yaml.safe_load(stream)
+        return yaml.load(
+            stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        )
     except AttributeError as e:
         LOG.exception(e)
         print(BROKEN_YAML_MODULE.format(path=yaml.__path__), file=sys.stderr)
@@ -38,12 +81,46 @@ def safe_load(stream):
 
 
 def safe_dump(data, stream=None, **kwargs):
+    yaml = _get_yaml()
     try:
-        return yaml.safe_dump(data, stream, **kwargs)
+        return yaml.dump_all(
+            [data],
+            stream,
+            Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+            **kwargs
+        )
     except AttributeError as e:
         LOG.exception(e)
         print(BROKEN_YAML_MODULE.format(path=yaml.__path__), file=sys.stderr)
         sys.exit(1)
 
 
-parser = yaml.parser
+def _parse_flat_mapping(content: str) -> Optional[Dict[str, str]]:
+    """
+    Parse content made only of `key: value` lines with plain string
+    values, comments and blank lines. Return None for anything else,
+    including content without any key.
+    """
+    result = {}
+    for line in content.split("\n"):
+        match = _FLAT_LINE_RE.fullmatch(line)
+        if match is None:
+            if _BLANK_OR_COMMENT_RE.fullmatch(line):
+                continue
+            return None
+        value = match.group("value")
+        if value.lower() in _NON_STRING_WORDS or value.endswith(":"):
+            return None
+        result[match.group("key")] = value
+    return result or None
+
+
+def safe_load_config(content: str):
+    """
+    safe_load for config files. The usual flat `key: value` content is
+    parsed directly, anything else is handed to PyYAML.
+    """
+    parsed = _parse_flat_mapping(content)
+    if parsed is not None:
+        return parsed
+    return safe_load(content)
@@ -68,7 +68,7 @@ setuptools.setup(
     url="https://elxr.pro",
     entry_points={
         "console_scripts": [
-            "elxr-pro=eaclient.cli:main",
+            "elxr-pro=eaclient.daemon.client:main",
         ]
     },
 )